@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:28
+
+from django.db import migrations, models
+from django.db.models.functions import Trim, Upper
+
+
+def normalize_choice_keys(apps, schema_editor):
+    # List filters match these exactly, so rows saved before the choices must use the keys' case
+    Course = apps.get_model("academics", "Course")
+    Course.objects.update(
+        course_semester=Upper(Trim("course_semester")),
+        course_year_level=Upper(Trim("course_year_level")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0012_alter_memo_file_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_choice_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['course_semester', 'course_year_level'], name='course_semester_level_idx'),
+        ),
+    ]
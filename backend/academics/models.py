@@ -91,6 +91,12 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True) 
 
+    class Meta:
+        indexes = [
+            # list filters match the stored (uppercase) choice keys exactly
+            models.Index(fields=["course_semester", "course_year_level"], name="course_semester_level_idx"),
+        ]
+
     def __str__(self):
         return f"{self.course_code} - {self.course_title}"
         
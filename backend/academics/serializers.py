@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import College, Department, Program, Curriculum, Course, PEO, ProgramOutcome, Memo
-from users.models import UserRole, User
+from users.access import get_access
+from users.models import User
 from django.contrib.auth import get_user_model
 from storages.backends.s3boto3 import S3Boto3Storage
 
@@ -179,13 +180,11 @@ class DepartmentSerializer(serializers.ModelSerializer):
 
         # Dean: assign based on entity_id from UserRole
         elif role_param == "DEAN" and user.has_role("DEAN"):
-            dean_role = UserRole.objects.filter(
-                user=user, role__name="DEAN", entity_type="College"
-            ).first()
-            if not dean_role or not dean_role.entity_id:
+            dean_college_id = get_access(user).entity_id("DEAN", "College")
+            if dean_college_id is None:
                 raise serializers.ValidationError("Dean has no assigned college.")
 
-            validated_data["college_id"] = dean_role.entity_id
+            validated_data["college_id"] = dean_college_id
             return super().create(validated_data)
 
         raise serializers.ValidationError("You must specify a valid role to create a department.")
@@ -251,13 +250,11 @@ class ProgramSerializer(serializers.ModelSerializer):
 
         # Dean: assign based on entity_id from UserRole
         elif role_param == "DEAN" and user.has_role("DEAN"):
-            dean_role = UserRole.objects.filter(
-                user=user, role__name="DEAN", entity_type="College"
-            ).first()
-            if not dean_role or not dean_role.entity_id:
+            dean_college_id = get_access(user).entity_id("DEAN", "College")
+            if dean_college_id is None:
                 raise serializers.ValidationError("Dean has no assigned college.")
 
-            validated_data["college_id"] = dean_role.entity_id
+            validated_data["college_id"] = dean_college_id
             return super().create(validated_data)
 
         raise serializers.ValidationError("You must specify a valid role to create a program.")
@@ -6,7 +6,8 @@ from .serializers import MemoSerializer, CollegeSerializer, DepartmentSerializer
 from .pagination import AcademicsPagination  # ⬅️ import this at the top
 
 from users.permissions import RolePermission
-from users.models import UserRole
+from users.access import get_access
+from search.indexing import matching_ids
 
 from django.db.models import F, OuterRef, Subquery, Q, Count
 from django.http import FileResponse
@@ -107,10 +108,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a dean.") 
 
                 # Look up user roles with entity_type="College"
-                dean_roles = UserRole.objects.filter(
-                    user=user, role__name="DEAN", entity_type="College"
-                )
-                college_ids = [ur.entity_id for ur in dean_roles if ur.entity_id]
+                college_ids = get_access(user).entity_ids("DEAN", "College")
 
                 if not college_ids:
                     raise PermissionDenied("This dean is not assigned to any college.")
@@ -125,10 +123,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a chairperson.") 
 
                 # Look up user roles with entity_type="Department"
-                chair_roles = UserRole.objects.filter(
-                    user=user, role__name="CHAIRPERSON", entity_type="Department"
-                )
-                department_ids = [ur.entity_id for ur in chair_roles if ur.entity_id]
+                department_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
 
                 if not department_ids:
                     raise PermissionDenied("This chairperson is not assigned to any department.")
@@ -182,10 +177,7 @@ class ProgramViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a chairperson.")
 
                 # Look up user roles with entity_type="Department"
-                chair_roles = UserRole.objects.filter(
-                    user=user, role__name="CHAIRPERSON", entity_type="Department"
-                )
-                department_ids = [ur.entity_id for ur in chair_roles if ur.entity_id]
+                department_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
 
                 if not department_ids:
                     raise PermissionDenied("This Chairperson is not assigned to any department.")
@@ -198,10 +190,7 @@ class ProgramViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a dean.") 
 
                 # Look up user roles with entity_type="College"
-                dean_roles = UserRole.objects.filter(
-                    user=user, role__name="DEAN", entity_type="College"
-                )
-                college_ids = [ur.entity_id for ur in dean_roles if ur.entity_id]
+                college_ids = get_access(user).entity_ids("DEAN", "College")
 
                 if not college_ids:
                     raise PermissionDenied("This Dean is not assigned to any college.")
@@ -243,10 +232,7 @@ class CurriculumViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a chairperson.")
 
                 # Look up user roles with entity_type="Department"
-                chair_roles = UserRole.objects.filter(
-                    user=user, role__name="CHAIRPERSON", entity_type="Department"
-                )
-                department_ids = [ur.entity_id for ur in chair_roles if ur.entity_id]
+                department_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
 
                 if not department_ids:
                     raise PermissionDenied("This chairperson is not assigned to any department.")
@@ -261,10 +247,7 @@ class CurriculumViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied("You are not a dean.") 
 
                 # Look up user roles with entity_type="College"
-                dean_roles = UserRole.objects.filter(
-                    user=user, role__name="DEAN", entity_type="College"
-                )
-                college_ids = [ur.entity_id for ur in dean_roles if ur.entity_id]
+                college_ids = get_access(user).entity_ids("DEAN", "College")
 
                 if not college_ids:
                     raise PermissionDenied("This dean is not assigned to any college.")
@@ -300,10 +283,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                 if not user.has_role("CHAIRPERSON"):
                     raise PermissionDenied("You are not a chairperson.")
  
-                chair_roles = UserRole.objects.filter(
-                    user=user, role__name="CHAIRPERSON", entity_type="Department"
-                )
-                department_ids = [ur.entity_id for ur in chair_roles if ur.entity_id]
+                department_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
 
                 if not department_ids:
                     raise PermissionDenied("This chairperson is not assigned to any department.")
@@ -316,10 +296,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                 if not user.has_role("DEAN"):
                     raise PermissionDenied("You are not a dean.") 
  
-                dean_roles = UserRole.objects.filter(
-                    user=user, role__name="DEAN", entity_type="College"
-                )
-                college_ids = [ur.entity_id for ur in dean_roles if ur.entity_id]
+                college_ids = get_access(user).entity_ids("DEAN", "College")
 
                 if not college_ids:
                     raise PermissionDenied("This dean is not assigned to any college.")
@@ -341,10 +318,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         semester = self.request.GET.get("semester") 
 
         if search:
-            qs = qs.filter(
-                Q(course_code__icontains=search)
-                | Q(course_title__icontains=search)
-            )
+            qs = qs.filter(pk__in=matching_ids("course", search))
         if college:
             qs = qs.filter(curriculum__program__department__college_id=college) 
         if department:
@@ -352,9 +326,9 @@ class CourseViewSet(viewsets.ModelViewSet):
         if program:
             qs = qs.filter(curriculum__program_id=program)
         if year_level:
-            qs = qs.filter(course_year_level__iexact=year_level) 
+            qs = qs.filter(course_year_level=year_level.upper()) 
         if semester:
-            qs = qs.filter(course_semester__iexact=semester) 
+            qs = qs.filter(course_semester=semester.upper()) 
 
         # === Optional: return all if ?all=true (for dropdowns) ===
         if self.request.GET.get("all") == "true":
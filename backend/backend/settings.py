@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path 
 from dotenv import load_dotenv
 
@@ -55,6 +56,8 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     'notifications.apps.NotificationsConfig', 
+    'exports.apps.ExportsConfig',
+    'search.apps.SearchConfig',
 ]
 
 MIDDLEWARE = [
@@ -135,6 +138,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ), 
+    "DEFAULT_THROTTLE_RATES": {
+        # Per-user limit on the export_docx/export_pdf actions
+        "exports": os.environ.get("EXPORT_RATE_LIMIT", "20/min"),
+    },
 }
 
 SIMPLE_JWT = {
@@ -142,6 +149,9 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Seconds the total of a ?cursor= list page is cached (shared.pagination)
+LIST_COUNT_CACHE_TIMEOUT = 60
+
 CORS_ALLOWED_ORIGINS = [ 
     "http://localhost:5173",  
     "http://127.0.0.1:5173", 
@@ -191,4 +201,63 @@ EMAIL_HOST_PASSWORD="ksfp rezn zpkt emtg"
 DEFAULT_FROM_EMAIL=EMAIL_HOST_USER
  
  
- 
\ No newline at end of file
+ 
+
+# Document exports (syllabus / TOS / review form)
+# --------------------------
+# Threads per web worker that render queued (?mode=async) exports
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", 2))
+# Processes that build DOCX files off the request thread; 0 (default) = in-thread.
+# Opt-in: every web worker starts its own pool of this many full Django processes,
+# so resident memory grows by (web workers x EXPORT_RENDER_PROCESSES) Django processes.
+EXPORT_RENDER_PROCESSES = int(os.environ.get("EXPORT_RENDER_PROCESSES", 0))
+# Threads a single bulk ZIP export renders documents with
+BULK_EXPORT_WORKERS = int(os.environ.get("BULK_EXPORT_WORKERS", 4))
+# Documents per worker task; PDFs of a batch share one LibreOffice session
+BULK_EXPORT_BATCH_SIZE = 8
+# In-memory LRU of normalized signature images shared by all exports
+SIGNATURE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Converted rich-text fields (course requirements) memoized per worker
+HTML_DOCX_CACHE_SIZE = 256
+# HTML previews live in the default cache (keyed by render fingerprint) this long
+EXPORT_PREVIEW_CACHE_TIMEOUT = 60 * 60
+# Retention of stored export files (manage.py sweep_exports)
+EXPORT_ARTIFACT_RETENTION_DAYS = 30   # delete files no export was served from for this long
+EXPORT_SUPERSEDED_GRACE_HOURS = 24    # keep replaced files this long for links already handed out
+EXPORT_SWEEP_BATCH_SIZE = 200
+EXPORT_BULK_RETENTION_DAYS = 7         # delete bulk export ZIPs this long after they finished
+# Untracked files stored before this (ISO datetime) are never swept as orphans;
+# None = when the exports.0002_rendereddocument migration was applied
+EXPORT_ORPHANS_TRACKED_SINCE = os.environ.get("EXPORT_ORPHANS_TRACKED_SINCE") or None
+
+# Headless LibreOffice used for DOCX → PDF conversion (Linux/macOS)
+LIBREOFFICE_BINARY = os.environ.get("LIBREOFFICE_BINARY", "libreoffice")
+# 0 (default): one soffice per conversion, at most EXPORT_MAX_CONVERSIONS at once on the node.
+# > 0 opts into long-lived instances: every web worker keeps this many soffice processes
+# resident (web workers x LIBREOFFICE_POOL_SIZE per node) whether or not it exports.
+LIBREOFFICE_POOL_SIZE = int(os.environ.get("LIBREOFFICE_POOL_SIZE", 0))
+LIBREOFFICE_MAX_CONVERSIONS = 50      # recycle a pooled instance after this many conversions
+LIBREOFFICE_CONVERSION_TIMEOUT = 120  # seconds per conversion before the instance is killed
+LIBREOFFICE_STARTUP_TIMEOUT = 30      # seconds to wait for a new instance to accept UNO connections
+LIBREOFFICE_ACQUIRE_TIMEOUT = 120     # seconds an export waits for a free instance
+# Node-wide cap on concurrent PDF conversions, shared by every worker process
+EXPORT_MAX_CONVERSIONS = int(os.environ.get("EXPORT_MAX_CONVERSIONS", 2))
+EXPORT_CONVERSION_QUEUE_SIZE = 8      # interactive exports allowed to wait for a slot
+EXPORT_CONVERSION_QUEUE_TIMEOUT = 30  # seconds an interactive export waits before a 429
+EXPORT_CONVERSION_RETRY_AFTER = 15    # Retry-After (seconds) sent with the 429
+EXPORT_LOCK_DIR = os.environ.get("EXPORT_LOCK_DIR", os.path.join(tempfile.gettempdir(), "syllabease-locks"))
+# Identical concurrent exports render once; the others wait this long (seconds) for its result
+EXPORT_SINGLE_FLIGHT_TIMEOUT = 120
+
+# Named PDF export profiles (?profile=<name>), see exports/pdf_profiles.py
+EXPORT_PDF_PROFILES = {
+    # Signatures and logos stay sharp in print; downsampled from scanner resolution
+    "standard": {"jpeg_quality": 85, "max_dpi": 300, "linearize": True},
+    # Smallest files for viewing in the browser
+    "web": {"jpeg_quality": 75, "max_dpi": 150, "linearize": True},
+    # PDF/A-2b with lossless images for accreditation archives
+    "archive": {"lossless": True, "pdfa": "2b", "linearize": False},
+}
+EXPORT_PDF_DEFAULT_PROFILE = os.environ.get("EXPORT_PDF_DEFAULT_PROFILE", "standard")
+# qpdf linearizes PDFs for fast web view when installed
+QPDF_BINARY = os.environ.get("QPDF_BINARY", "qpdf")
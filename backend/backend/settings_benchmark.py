@@ -0,0 +1,43 @@
+"""
+Settings for ``manage.py benchmark_exports``.
+
+    python manage.py benchmark_exports --settings=backend.settings_benchmark
+
+Everything from ``settings.py`` except that the database is a throwaway
+SQLite file and uploads go to a temporary MEDIA_ROOT, so a benchmark run
+never touches MySQL, Spaces or any other network service. Tables are created
+straight from the models (no migrations) by the command itself.
+"""
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+
+BENCHMARK_DIR = Path(tempfile.mkdtemp(prefix="syllabease-bench-"))
+atexit.register(shutil.rmtree, BENCHMARK_DIR, ignore_errors=True)
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BENCHMARK_DIR / "db.sqlite3",
+    }
+}
+
+MEDIA_ROOT = BENCHMARK_DIR / "media"
+
+
+class DisableMigrations(dict):
+    """Build every app's tables directly from its models."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
+
+EXPORT_BENCHMARK = True
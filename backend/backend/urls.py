@@ -31,6 +31,8 @@ urlpatterns = [
     path("api/", include("tos.urls")),  
     path("api/", include("shared.urls")), # Deadline naa dini
     path('api/', include('notifications.urls')),
+    path("api/", include("exports.urls")),
+    path("api/", include("search.urls")),
 
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
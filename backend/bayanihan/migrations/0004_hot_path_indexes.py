@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_hot_path_indexes'),
+        ('bayanihan', '0003_alter_bayanihangroup_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bayanihangroup',
+            index=models.Index(fields=['school_year', 'course'], name='group_school_year_idx'),
+        ),
+    ]
@@ -11,6 +11,11 @@ class BayanihanGroup(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True) 
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["school_year", "course"], name="group_school_year_idx"),
+        ]
+
     def __str__(self):
         return f"{self.course.course_code} - {self.school_year} - {self.course.course_semester}"
 
@@ -6,6 +6,7 @@ from .models import BayanihanGroup, BayanihanGroupUser
 from .signals import notify_user_added_to_group
 from academics.models import Course
 from academics.serializers import CourseSerializer   
+from users.access import invalidate_access
 from users.models import User, Role, UserRole
 from users.serializers import UserRoleSerializer
 
@@ -197,6 +198,8 @@ class BayanihanGroupSerializer(serializers.ModelSerializer):
         # Ensure UserRoles are created
         self._ensure_user_roles(leader_ids, "BAYANIHAN_LEADER") 
         self._ensure_user_roles(teacher_ids, "BAYANIHAN_TEACHER")
+        # bulk_create skipped the signals
+        invalidate_access(*leaders, *teachers)
 
         return group
 
@@ -228,6 +231,8 @@ class BayanihanGroupSerializer(serializers.ModelSerializer):
             self._ensure_user_roles(teacher_ids, "BAYANIHAN_TEACHER")
             self._cleanup_user_roles(teacher_ids, "BAYANIHAN_TEACHER")
 
+        # bulk_create skipped the signals
+        invalidate_access(*(leaders or ()), *(teachers or ()))
         return instance
     
     
@@ -4,6 +4,7 @@ from django.utils.timezone import now
 
 from bayanihan.models import BayanihanGroupUser
 from notifications.models import Notification
+from users.access import invalidate_access
 from users.models import UserRole
 
 def get_admin_users():
@@ -41,6 +42,13 @@ def map_group_role_to_user_role(role):
     return None
 
 
+@receiver([post_save, post_delete], sender=BayanihanGroupUser)
+def membership_changed(sender, instance, **kwargs):
+    # Only a user already loaded on the row can hold its access
+    if BayanihanGroupUser.user.is_cached(instance):
+        invalidate_access(instance.user)
+
+
 @receiver(post_save, sender=BayanihanGroupUser)
 def notify_user_added_to_group(sender, instance, created, **kwargs):
     if not created:
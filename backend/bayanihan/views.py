@@ -3,13 +3,13 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action 
 from rest_framework.response import Response
 
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Exists, OuterRef
 from django.db.models.deletion import ProtectedError
 
 from .models import BayanihanGroup
-from users.models import UserRole
+from users.access import get_access
+from search.indexing import matching_ids
 from syllabi.models import Syllabus
-from bayanihan.models import BayanihanGroupUser 
 from tos.models import TOS
 
 from .serializers import BayanihanGroupSerializer, BayanihanGroupReadSerializer 
@@ -52,18 +52,15 @@ class BayanihanGroupViewSet(viewsets.ModelViewSet):
         # Only enforce role filtering for list
         if self.action in ["list"]:
             if role == "ADMIN":
-                if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+                if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an admin.") 
                 pass
     
             elif role == "CHAIRPERSON":
-                if not UserRole.objects.filter(user=user, role__name="CHAIRPERSON").exists():
+                if not user.has_role("CHAIRPERSON"):
                     raise PermissionDenied("You are not a chairperson.")
     
-                chair_roles = UserRole.objects.filter(
-                    user=user, role__name="CHAIRPERSON", entity_type="Department"
-                )
-                department_ids = [ur.entity_id for ur in chair_roles if ur.entity_id]
+                department_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
 
                 if not department_ids:
                     raise PermissionDenied("No department assigned for this chairperson.")
@@ -71,12 +68,10 @@ class BayanihanGroupViewSet(viewsets.ModelViewSet):
                 qs = qs.filter(course__curriculum__program__department_id__in=department_ids)
             
             elif role == "BAYANIHAN_LEADER":
-                if not UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
+                if not user.has_role("BAYANIHAN_LEADER"):
                     raise PermissionDenied("You are not a bayanihan leader.")
                 
-                leader_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="LEADER"
-                ).values_list("group_id", flat=True)
+                leader_groups = get_access(user).group_ids("LEADER")
 
                 if not leader_groups:
                     raise PermissionDenied("You are not a part of any Bayanihan Team.")
@@ -84,12 +79,10 @@ class BayanihanGroupViewSet(viewsets.ModelViewSet):
                 qs = qs.filter(id__in=leader_groups)
             
             elif role == "BAYANIHAN_TEACHER":
-                if not UserRole.objects.filter(user=user, role__name="BAYANIHAN_TEACHER").exists():
+                if not user.has_role("BAYANIHAN_TEACHER"):
                     raise PermissionDenied("You are not a bayanihan teacher.")
                 
-                teacher_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="TEACHER"
-                ).values_list("group_id", flat=True)
+                teacher_groups = get_access(user).group_ids("TEACHER")
 
                 if not teacher_groups:
                     raise PermissionDenied("You are not a part of any Bayanihan Team.")
@@ -107,22 +100,19 @@ class BayanihanGroupViewSet(viewsets.ModelViewSet):
         search = self.request.GET.get("search")
 
         if year_level:
-            qs = qs.filter(course__course_year_level__iexact=year_level)
+            qs = qs.filter(course__course_year_level=year_level.upper())
             
         if program:
             qs = qs.filter(course__curriculum__program=program)
             
         if school_year:
-            qs = qs.filter(school_year__iexact=school_year)
+            qs = qs.filter(school_year=school_year.strip())
 
         if semester:
-            qs = qs.filter(course__course_semester__iexact=semester)
+            qs = qs.filter(course__course_semester=semester.upper())
 
         if search:
-            qs = qs.filter(
-                Q(course__course_code__icontains=search)
-                | Q(course__course_title__icontains=search)
-            )
+            qs = qs.filter(course_id__in=matching_ids("course", search))
 
         return qs 
     
@@ -144,13 +134,11 @@ class BayanihanGroupViewSet(viewsets.ModelViewSet):
         # Build base queryset
         qs = BayanihanGroup.objects.select_related("course")
 
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             pass  # Admins can see all
          
-        elif role == "BAYANIHAN_LEADER" and UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
-            leader_groups = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+        elif role == "BAYANIHAN_LEADER" and user.has_role("BAYANIHAN_LEADER"):
+            leader_groups = get_access(user).group_ids("LEADER")
 
             if not leader_groups:
                 return Response(
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from .models import ExportJob, BulkExport, RenderedDocument
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("user", "kind", "object_id", "format", "status", "created_at", "finished_at")
+    list_filter = ("kind", "format", "status", "created_at")
+    search_fields = ("user__username", "user__email")
+    ordering = ("-created_at",)
+
+
+@admin.register(BulkExport)
+class BulkExportAdmin(admin.ModelAdmin):
+    list_display = ("user", "format", "status", "total_items", "completed_items", "failed_items", "created_at")
+    list_filter = ("format", "status", "created_at")
+    search_fields = ("user__username", "user__email")
+    ordering = ("-created_at",)
+
+
+@admin.register(RenderedDocument)
+class RenderedDocumentAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "format", "file_path", "size", "superseded_at", "last_used_at", "created_at")
+    list_filter = ("kind", "format", "superseded_at", "created_at")
+    search_fields = ("file_path", "content_hash")
+    ordering = ("-created_at",)
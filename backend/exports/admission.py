@@ -0,0 +1,158 @@
+"""
+Node-wide admission control for DOCX → PDF conversion.
+
+Every web and worker process on a host shares ``EXPORT_LOCK_DIR``. Holding an
+OS file lock on one of its ``conversion-N.lock`` files is holding one of the
+``EXPORT_MAX_CONVERSIONS`` conversion slots, so the cap covers all workers
+on the node and a slot is released automatically if its process dies.
+
+Interactive exports first take an admission ticket (``admit_export``): at
+most ``EXPORT_MAX_CONVERSIONS + EXPORT_CONVERSION_QUEUE_SIZE`` requests may
+be converting or waiting. A request that gets no ticket, or that waits longer
+than ``EXPORT_CONVERSION_QUEUE_TIMEOUT`` for a slot, raises ``ConversionBusy``
+(answered with 429 + Retry-After). Background exports skip the ticket and
+wait for a slot up to ``LIBREOFFICE_ACQUIRE_TIMEOUT``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Deadline (time.monotonic()) of the interactive export running in this context
+_deadline = ContextVar("export_admission_deadline", default=None)
+
+
+class ConversionBusy(RuntimeError):
+    """No conversion capacity; the client should retry after ``retry_after`` seconds."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _try_lock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        f.close()
+
+
+class FileSlots:
+    """``count`` interchangeable slots backed by lock files shared by every process on the host."""
+
+    def __init__(self, name, count, directory=None):
+        self.name = name
+        self.count = max(int(count), 1)
+        self.directory = directory or _setting(
+            "EXPORT_LOCK_DIR", os.path.join(tempfile.gettempdir(), "syllabease-locks")
+        )
+
+    def try_acquire(self):
+        """An open, locked slot file, or None when every slot is taken; see ``index``."""
+        os.makedirs(self.directory, exist_ok=True)
+        for index in range(self.count):
+            f = open(os.path.join(self.directory, f"{self.name}-{index}.lock"), "a+b")
+            if _try_lock(f):
+                return f
+            f.close()
+        return None
+
+    def acquire(self, timeout, poll_interval=0.1):
+        deadline = time.monotonic() + timeout
+        while True:
+            slot = self.try_acquire()
+            if slot is not None or time.monotonic() >= deadline:
+                return slot
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+    @staticmethod
+    def index(slot):
+        """Number (0 .. count - 1) of a held slot, the same in every process."""
+        return int(os.path.splitext(os.path.basename(slot.name))[0].rsplit("-", 1)[1])
+
+    @staticmethod
+    def release(slot):
+        _unlock(slot)
+
+
+def conversion_slots():
+    return FileSlots("conversion", _setting("EXPORT_MAX_CONVERSIONS", 2))
+
+
+def retry_after():
+    return _setting("EXPORT_CONVERSION_RETRY_AFTER", 15)
+
+
+@contextmanager
+def admit_export():
+    """
+    Admission ticket for an interactive (request/response) PDF export.
+    Raises ``ConversionBusy`` at once when the node's queue is full.
+    """
+    tickets = FileSlots(
+        "admission",
+        _setting("EXPORT_MAX_CONVERSIONS", 2) + _setting("EXPORT_CONVERSION_QUEUE_SIZE", 8),
+    )
+    ticket = tickets.try_acquire()
+    if ticket is None:
+        raise ConversionBusy("Too many PDF exports are in progress. Please try again shortly.", retry_after())
+
+    token = _deadline.set(time.monotonic() + _setting("EXPORT_CONVERSION_QUEUE_TIMEOUT", 30))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+        tickets.release(ticket)
+
+
+def wait_budget(default):
+    """Seconds the current export may still block: what is left until its admission deadline, or ``default``."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return max(deadline - time.monotonic(), 0)
+
+
+@contextmanager
+def conversion_slot():
+    """
+    Hold one of the node's conversion slots for the duration of a conversion.
+    Yields the slot's number; no other process on the node holds it meanwhile.
+    """
+    slots = conversion_slots()
+    slot = slots.acquire(wait_budget(_setting("LIBREOFFICE_ACQUIRE_TIMEOUT", 120)))
+    if slot is None:
+        raise ConversionBusy("No PDF converter became available in time.", retry_after())
+    try:
+        yield slots.index(slot)
+    finally:
+        slots.release(slot)
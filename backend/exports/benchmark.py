@@ -0,0 +1,221 @@
+"""
+Synthetic data and timing helpers for ``manage.py benchmark_exports``.
+
+``create_fixture`` builds one complete syllabus (and a TOS for it) of a given
+size in the current database; ``time_export`` runs the export path on it once
+and returns the seconds spent in each stage. ``percentile`` summarizes timings
+the same way for every benchmark command.
+"""
+from io import BytesIO
+import math
+import os
+import tempfile
+import time
+import uuid
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image, ImageDraw
+
+from academics.models import College, Course, Curriculum, Department, PEO, Program, ProgramOutcome
+from bayanihan.models import BayanihanGroup, BayanihanGroupUser
+from syllabi.models import (
+    SyllCoPo,
+    Syllabus,
+    SyllabusCotCo,
+    SyllabusCourseOutcome,
+    SyllabusCourseOutline,
+    SyllabusInstructor,
+    SyllabusTemplate,
+)
+from tos.models import TOS, TOSRow, TOSTemplate
+from users.models import User
+
+from . import html_docx, signatures, template_registry
+from .converter import convert_docx_to_pdf
+from .profiling import record_stages
+from .renderers import RENDERERS, get_export_object
+
+# Stages reported for every run, in pipeline order. "context" is whatever the
+# renderer spends outside the instrumented stages (mostly ORM queries).
+STAGES = ["context", "signatures", "html", "copo_table", "render", "save", "pdf"]
+
+COURSE_REQUIREMENTS_HTML = (
+    "<p><strong>Course requirements</strong> for <em>every</em> student:</p>"
+    "<ol><li>Quizzes <u>(30%)</u></li><li>Major exams (40%)</li>"
+    "<li>Projects and laboratory work (30%)</li></ol>"
+    "<ul><li style='padding-left: 40px'>Late submissions lose 10% per day</li></ul>"
+    "<table style='border: 1px solid #000'>"
+    "<tr><td style='background-color:#d9d9d9'><strong>Component</strong></td>"
+    "<td style='background-color:#d9d9d9'><strong>Weight</strong></td></tr>"
+    "<tr><td>Quizzes</td><td>30%</td></tr><tr><td>Exams</td><td>40%</td></tr>"
+    "<tr><td>Projects</td><td>30%</td></tr></table>"
+)
+
+
+def signature_png(label):
+    image = Image.new("RGB", (400, 160), "white")
+    ImageDraw.Draw(image).text((20, 60), label, fill="black")
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def create_fixture(outlines=12, cos=5, pos=10, signatories=3):
+    """
+    One syllabus with ``outlines`` course outline rows, ``cos`` course outcomes
+    mapped to every other of ``pos`` program outcomes and ``signatories``
+    Bayanihan leaders with signature images, plus a TOS for its midterm.
+    Returns ``(syllabus, tos)``.
+    """
+    tag = uuid.uuid4().hex[:8]
+    college = College.objects.create(college_code=f"C{tag}", college_description="College of Benchmarks")
+    department = Department.objects.create(college=college, department_code=f"D{tag}", department_name="Department of Benchmarks")
+    program = Program.objects.create(department=department, program_code=f"P{tag}", program_name="BS Benchmarking")
+    curriculum = Curriculum.objects.create(program=program, curr_code=f"CUR{tag}", effectivity="2024")
+    course = Course.objects.create(
+        curriculum=curriculum,
+        course_title="Benchmark Course",
+        course_code=f"BM{tag[:4]}",
+        course_year_level="1",
+        course_semester="1ST",
+    )
+    group = BayanihanGroup.objects.create(school_year="2024-2025", course=course)
+
+    leaders = []
+    for i in range(max(signatories, 1)):
+        user = User.objects.create(
+            username=f"bench-{tag}-{i}",
+            faculty_id=f"{tag}-{i}",
+            first_name=f"Leader{i}",
+            last_name="Benchmark",
+            email=f"leader{i}-{tag}@example.com",
+        )
+        if i < signatories:
+            user.signature.save(f"bench-{tag}-{i}.png", ContentFile(signature_png(user.first_name)))
+        BayanihanGroupUser.objects.create(user=user, group=group, role="LEADER")
+        leaders.append(user)
+
+    chair_signature = leaders[0].signature.url if leaders[0].signature else None
+    syllabus = Syllabus.objects.create(
+        syllabus_template=SyllabusTemplate.objects.create(revision_no=3),
+        bayanihan_group=group,
+        course=course,
+        college=college,
+        program=program,
+        curriculum=curriculum,
+        version=1,
+        status="Approved by Dean",
+        course_description="Synthetic syllabus generated by benchmark_exports.",
+        course_requirements=COURSE_REQUIREMENTS_HTML,
+        chair={"name": "Chair Benchmark", "signature": chair_signature},
+        dean={"name": "Dean Benchmark", "signature": chair_signature},
+    )
+    for user in leaders:
+        SyllabusInstructor.objects.create(syllabus=syllabus, user=user)
+
+    program_outcomes = [
+        ProgramOutcome.objects.create(program=program, po_letter=chr(97 + i % 26), po_description=f"Program outcome {i + 1}")
+        for i in range(pos)
+    ]
+    syllabus.program_outcomes.set(program_outcomes)
+    syllabus.peos.set([PEO.objects.create(program=program, peo_code="PEO1", peo_description="Educational objective")])
+
+    course_outcomes = [
+        SyllabusCourseOutcome.objects.create(syllabus=syllabus, co_code=f"CO{i + 1}", co_description=f"Course outcome {i + 1}")
+        for i in range(cos)
+    ]
+    SyllCoPo.objects.bulk_create(
+        SyllCoPo(syllabus=syllabus, course_outcome=co, program_outcome=po, syllabus_co_po_code="I")
+        for co in course_outcomes
+        for po in program_outcomes[::2]
+    )
+
+    for i in range(outlines):
+        outline = SyllabusCourseOutline.objects.create(
+            syllabus=syllabus,
+            syllabus_term="MIDTERM" if i < (outlines + 1) // 2 else "FINALS",
+            row_no=i,
+            allotted_hour=3,
+            allotted_time="1 week",
+            intended_learning=f"Intended learning outcome {i + 1}",
+            topics=f"Topic {i + 1}",
+            suggested_readings="Textbook, chapter 1",
+            learning_activities="Lecture and laboratory",
+            assessment_tools="Quiz",
+            grading_criteria="Rubric",
+        )
+        SyllabusCotCo.objects.bulk_create(
+            SyllabusCotCo(course_outline=outline, course_outcome=co) for co in course_outcomes[:2]
+        )
+
+    tos = TOS.objects.create(
+        tos_template=TOSTemplate.objects.create(revision_no=1),
+        syllabus=syllabus,
+        user=leaders[0],
+        course=course,
+        bayanihan_group=group,
+        program=program,
+        term="MIDTERM",
+        total_items=50,
+        col1_percentage=25,
+        col2_percentage=25,
+        col3_percentage=25,
+        col4_percentage=25,
+        chair={"name": "Chair Benchmark", "signature": chair_signature},
+    )
+    TOSRow.objects.bulk_create(
+        TOSRow(tos=tos, topic=f"Topic {i + 1}", no_hours=3, percent=10, no_items=5, col1_value=1)
+        for i in range(max((outlines + 1) // 2, 1))
+    )
+    return syllabus, tos
+
+
+def clear_process_caches():
+    """Drop the in-process caches so the next render starts cold."""
+    signatures._cache.clear()
+    html_docx._cache.clear()
+    template_registry.registry.clear()
+
+
+def time_export(kind, object_id, pdf=True):
+    """
+    Load, render, save and (optionally) convert one document, bypassing the
+    rendered-document cache. Returns ``{stage: seconds, ..., "total": s,
+    "queries": n}``.
+    """
+    _, renderer, _ = RENDERERS[kind]
+
+    with CaptureQueriesContext(connection) as queries, record_stages() as timings:
+        start = time.perf_counter()
+        obj = get_export_object(kind, object_id)
+        doc, _ = renderer(obj)
+        rendered = time.perf_counter()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docx_path = os.path.join(tmpdir, "benchmark.docx")
+            doc.save(docx_path)
+            saved = time.perf_counter()
+
+            if pdf:
+                convert_docx_to_pdf(docx_path, os.path.join(tmpdir, "benchmark.pdf"))
+            converted = time.perf_counter()
+
+    result = {name: timings.get(name, 0.0) for name in STAGES}
+    result["context"] = (rendered - start) - sum(timings.values())
+    result["save"] = saved - rendered
+    result["pdf"] = converted - saved if pdf else 0.0
+    result["total"] = converted - start
+    result["queries"] = len(queries)
+    return result
+
+
+def percentile(values, pct):
+    """
+    ``pct``-th percentile of sorted ``values`` as an observed sample: the rank
+    ``pct/100 * (n + 1)`` of ``statistics.quantiles`` rounded up (capped at the
+    largest sample), so a p95 over 20 runs is the slowest run, not the 19th.
+    """
+    rank = min(math.ceil(pct / 100 * (len(values) + 1)), len(values))
+    return values[max(rank, 1) - 1]
@@ -0,0 +1,229 @@
+"""
+Bulk "export everything" archives.
+
+``run_bulk_export`` collects the approved syllabi matching a ``BulkExport``'s
+filters together with their approved TOS and review forms, renders them on
+a worker pool in batches (one converter session per batch) and writes each
+finished document into a ZIP on disk as soon as it is ready, so the archive
+is never held in memory. Progress is saved after every batch; the finished
+ZIP is uploaded to ``default_storage``.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from notifications.models import Notification
+from syllabi.models import Syllabus, SRFForm
+from tos.models import TOS
+from .jobs import get_executor
+from .models import BulkExport
+from .renderers import get_export_object, store_documents
+
+logger = logging.getLogger(__name__)
+
+UNSAFE_NAME_RE = re.compile(r"[^\w.\- ]+")
+
+
+def approved_syllabi(filters):
+    """Latest dean-approved syllabus per Bayanihan group, narrowed by ``filters``."""
+    qs = Syllabus.objects.filter(
+        status="Approved by Dean", is_latest_approved=True
+    ).select_related("course", "bayanihan_group")
+
+    if filters.get("college"):
+        qs = qs.filter(college_id=filters["college"])
+    if filters.get("department"):
+        qs = qs.filter(program__department_id=filters["department"])
+    if filters.get("school_year"):
+        qs = qs.filter(bayanihan_group__school_year=filters["school_year"].strip())
+    if filters.get("semester"):
+        qs = qs.filter(course__course_semester=filters["semester"].upper())
+
+    return qs.order_by("bayanihan_group__school_year", "course__course_code")
+
+
+def collect_items(filters):
+    """``(kind, object_id, folder)`` for every document that goes into the archive."""
+    syllabi = list(approved_syllabi(filters))
+    syllabus_ids = [s.pk for s in syllabi]
+
+    # Latest approved TOS per syllabus and term
+    latest_tos = {}
+    for tos_id, syllabus_id, term in (
+        TOS.objects.filter(syllabus_id__in=syllabus_ids, chair_approved_at__isnull=False)
+        .order_by("version")
+        .values_list("id", "syllabus_id", "term")
+    ):
+        latest_tos.setdefault(syllabus_id, {})[term] = tos_id
+
+    review_forms = dict(
+        SRFForm.objects.filter(syllabus_id__in=syllabus_ids).values_list("syllabus_id", "id")
+    )
+
+    items = []
+    for syllabus in syllabi:
+        folder = "/".join(
+            UNSAFE_NAME_RE.sub("_", part)
+            for part in (
+                syllabus.bayanihan_group.school_year,
+                syllabus.course.get_course_semester_display(),
+                syllabus.course.course_code,
+            )
+        )
+        items.append(("syllabus", syllabus.pk, folder))
+        for _, tos_id in sorted(latest_tos.get(syllabus.pk, {}).items()):
+            items.append(("tos", tos_id, folder))
+        if syllabus.pk in review_forms:
+            items.append(("review_form", review_forms[syllabus.pk], folder))
+    return items
+
+
+def enqueue_bulk_export(user, filters, fmt, target_role=None):
+    bulk = BulkExport.objects.create(
+        user=user, target_role=target_role, filters=filters, format=fmt
+    )
+    transaction.on_commit(lambda: get_executor().submit(run_bulk_export, bulk.pk))
+    return bulk
+
+
+def render_batch(batch, fmt):
+    """
+    Worker-pool task: render (or reuse) a batch of documents. PDFs of the batch
+    share one converter session. Returns a storage path or exception per item.
+    """
+    try:
+        objects = []
+        for kind, object_id, _ in batch:
+            try:
+                objects.append((kind, get_export_object(kind, object_id)))
+            except Exception as e:
+                objects.append(e)
+
+        loaded = [item for item in objects if not isinstance(item, Exception)]
+        rendered = iter(store_documents(loaded, fmt))
+        return [item if isinstance(item, Exception) else next(rendered) for item in objects]
+    finally:
+        close_old_connections()
+
+
+def run_bulk_export(bulk_id):
+    close_old_connections()
+    try:
+        bulk = BulkExport.objects.select_related("user").get(pk=bulk_id)
+        if bulk.status != "QUEUED":
+            return
+
+        items = collect_items(bulk.filters)
+        bulk.status = "RUNNING"
+        bulk.started_at = timezone.now()
+        bulk.total_items = len(items)
+        bulk.save(update_fields=["status", "started_at", "total_items", "updated_at"])
+
+        try:
+            bulk.file_url = build_archive(bulk, items)
+            bulk.status = "DONE"
+        except Exception as e:
+            logger.exception("Bulk export %s failed", bulk.pk)
+            bulk.status = "FAILED"
+            bulk.error = str(e)
+
+        bulk.finished_at = timezone.now()
+        bulk.save(update_fields=["status", "file_url", "file_path", "error", "finished_at", "updated_at"])
+        notify_bulk_export_finished(bulk)
+    finally:
+        close_old_connections()
+
+
+def build_archive(bulk, items):
+    failures = []
+    used_names = set()
+
+    with tempfile.TemporaryFile() as tmp:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as archive, ThreadPoolExecutor(
+            max_workers=getattr(settings, "BULK_EXPORT_WORKERS", 4),
+            thread_name_prefix="bulk-export",
+        ) as pool:
+            batch_size = max(getattr(settings, "BULK_EXPORT_BATCH_SIZE", 8), 1)
+            futures = {
+                pool.submit(render_batch, batch, bulk.format): batch
+                for batch in (items[i:i + batch_size] for i in range(0, len(items), batch_size))
+            }
+
+            # Only this thread touches the ZipFile; entries are added as batches finish
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [e] * len(batch)
+
+                for (kind, object_id, folder), result in zip(batch, results):
+                    try:
+                        if isinstance(result, Exception):
+                            raise result
+                        arcname = f"{folder}/{os.path.basename(result)}"
+                        if arcname in used_names:
+                            arcname = f"{folder}/{kind}-{object_id}-{os.path.basename(result)}"
+                        used_names.add(arcname)
+
+                        with default_storage.open(result, "rb") as src, archive.open(arcname, "w") as dst:
+                            shutil.copyfileobj(src, dst, 1024 * 1024)
+                        bulk.completed_items += 1
+                    except Exception as e:
+                        logger.warning("Bulk export %s: %s #%s failed: %s", bulk.pk, kind, object_id, e)
+                        failures.append(f"{kind} #{object_id}: {e}")
+                        bulk.failed_items += 1
+
+                BulkExport.objects.filter(pk=bulk.pk).update(
+                    completed_items=bulk.completed_items,
+                    failed_items=bulk.failed_items,
+                    updated_at=timezone.now(),
+                )
+
+            if failures:
+                archive.writestr("FAILED.txt", "\n".join(failures))
+
+        if items and len(failures) == len(items):
+            raise RuntimeError(f"All {len(items)} documents failed to render.")
+
+        tmp.seek(0)
+        label = UNSAFE_NAME_RE.sub("_", str(bulk.filters.get("school_year") or "all"))
+        name = f"Syllabi-{label}-{timezone.now():%Y%m%d%H%M%S}.zip"
+        zip_path = default_storage.save(f"bulk_exports/{name}", File(tmp, name=name))
+
+    bulk.file_path = zip_path
+    if failures:
+        bulk.error = "\n".join(failures)
+    return default_storage.url(zip_path)
+
+
+def notify_bulk_export_finished(bulk):
+    if bulk.status == "DONE":
+        message = f"Your bulk export of {bulk.completed_items} documents is ready for download."
+        if bulk.failed_items:
+            message += f" {bulk.failed_items} could not be rendered."
+        notif_type = "export_ready"
+    else:
+        message = "Your bulk export failed. Please try again."
+        notif_type = "export_failed"
+
+    link = bulk.file_url or ""
+    Notification.objects.create(
+        recipient=bulk.user,
+        target_role=bulk.target_role,
+        domain="syllabus",
+        type=notif_type,
+        message=message,
+        # link column is limited to 255 chars; signed storage URLs can be longer
+        link=link if len(link) <= 255 else "",
+    )
@@ -0,0 +1,184 @@
+"""
+Content-addressed cache for rendered documents.
+
+``compute_fingerprint`` hashes everything a renderer reads (the source row
+and its outlines/outcomes/rows/signatories) together with the template
+revision and the template file on disk (and, for PDFs, the export profile's
+options). An export whose fingerprint already has a ``RenderedDocument``
+for the same format and profile returns the stored file instead of
+rendering again.
+"""
+from datetime import timedelta
+import hashlib
+import json
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from bayanihan.models import BayanihanGroupUser
+from syllabi.models import (
+    Syllabus,
+    SyllabusCourseOutcome,
+    SyllabusCourseOutline,
+    SyllabusCotCo,
+    SyllCoPo,
+    SyllabusInstructor,
+)
+from tos.models import TOS, TOSRow
+from .models import RenderedDocument
+from .pdf_profiles import profile_stamp
+from .template_registry import template_file_stamp
+
+# Bump when the renderers change output for the same data
+RENDER_VERSION = 1
+
+# Cache hits refresh ``RenderedDocument.last_used_at`` at most this often
+LAST_USED_RESOLUTION = timedelta(days=1)
+
+
+def _leaders(group_id):
+    return list(
+        BayanihanGroupUser.objects.filter(group_id=group_id, role="LEADER")
+        .order_by("id")
+        .values_list("user__first_name", "user__last_name", "user__signature")
+    )
+
+
+def syllabus_snapshot(syllabus):
+    return {
+        "syllabus": Syllabus.objects.filter(pk=syllabus.pk).values(
+            "updated_at", "status", "dean_approved_at", "dean", "chair",
+            "course__updated_at", "college__updated_at",
+            "program__department__updated_at", "bayanihan_group__school_year",
+        ).first(),
+        "template_revision": syllabus.syllabus_template.revision_no if syllabus.syllabus_template else None,
+        "peos": list(syllabus.peos.order_by("id").values_list("id", "updated_at")),
+        "pos": list(syllabus.program_outcomes.order_by("id").values_list("id", "updated_at")),
+        "course_outcomes": list(
+            SyllabusCourseOutcome.objects.filter(syllabus=syllabus)
+            .order_by("id").values_list("id", "co_code", "co_description")
+        ),
+        "copos": list(
+            SyllCoPo.objects.filter(syllabus=syllabus)
+            .order_by("id").values_list("id", "updated_at")
+        ),
+        "outlines": list(
+            SyllabusCourseOutline.objects.filter(syllabus=syllabus)
+            .order_by("id").values_list("id", "updated_at", "row_no")
+        ),
+        "cotcos": list(
+            SyllabusCotCo.objects.filter(course_outline__syllabus=syllabus)
+            .order_by("id").values_list("id", "updated_at")
+        ),
+        "instructors": list(
+            SyllabusInstructor.objects.filter(syllabus=syllabus)
+            .order_by("id").values_list("user__prefix", "user__first_name", "user__last_name", "user__suffix", "user__email")
+        ),
+        "leaders": _leaders(syllabus.bayanihan_group_id),
+    }
+
+
+def tos_snapshot(tos):
+    return {
+        "tos": TOS.objects.filter(pk=tos.pk).values(
+            "updated_at", "status", "chair_approved_at", "chair",
+            "course__updated_at", "bayanihan_group__school_year",
+        ).first(),
+        "template_revision": tos.tos_template.revision_no if tos.tos_template else None,
+        "rows": list(
+            TOSRow.objects.filter(tos=tos).order_by("id").values_list("id", "updated_at")
+        ),
+        "course_outcomes": list(
+            SyllabusCourseOutcome.objects.filter(syllabus_id=tos.syllabus_id)
+            .order_by("id").values_list("id", "co_code", "co_description")
+        ),
+        "leaders": _leaders(tos.bayanihan_group_id),
+    }
+
+
+def review_form_snapshot(review_form):
+    template = review_form.form_template
+    return {
+        "review_date": review_form.review_date,
+        "action": review_form.action,
+        "course_code": review_form.syllabus.course.course_code,
+        "template_revision": template.revision_no if template else None,
+        "template_effective_date": template.effective_date if template else None,
+    }
+
+
+SNAPSHOTS = {
+    "syllabus": syllabus_snapshot,
+    "tos": tos_snapshot,
+    "review_form": review_form_snapshot,
+}
+
+
+def compute_fingerprint(kind, obj, profile=""):
+    data = {
+        "render_version": RENDER_VERSION,
+        "template_file": template_file_stamp(kind),
+        "source": SNAPSHOTS[kind](obj),
+    }
+    if profile:
+        data["pdf_profile"] = [profile, profile_stamp(profile)]
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_document(kind, obj, fmt, fingerprint, profile=""):
+    """Return the stored path for this fingerprint, or None if it must be rendered."""
+    cached = RenderedDocument.objects.filter(
+        kind=kind, object_id=obj.pk, format=fmt, profile=profile, content_hash=fingerprint
+    ).first()
+    if cached is None:
+        return None
+    if not default_storage.exists(cached.file_path):
+        cached.delete()
+        return None
+
+    now = timezone.now()
+    if cached.superseded_at is not None:
+        # The source changed back before the sweeper removed this file
+        supersede(kind, obj.pk, fmt, profile)
+        RenderedDocument.objects.filter(pk=cached.pk).update(
+            superseded_at=None, last_used_at=now, updated_at=now
+        )
+    elif cached.last_used_at < now - LAST_USED_RESOLUTION:
+        RenderedDocument.objects.filter(pk=cached.pk).update(last_used_at=now)
+    return cached.file_path
+
+
+def store_cached_document(kind, obj, fmt, fingerprint, file_path, size=None, profile=""):
+    """Record a newly stored file; older files of the same document become superseded."""
+    if size is None:
+        size = default_storage.size(file_path)
+    supersede(kind, obj.pk, fmt, profile)
+    RenderedDocument.objects.update_or_create(
+        kind=kind,
+        object_id=obj.pk,
+        format=fmt,
+        profile=profile,
+        content_hash=fingerprint,
+        defaults={
+            "file_path": file_path,
+            "size": size,
+            "superseded_at": None,
+            "last_used_at": timezone.now(),
+        },
+    )
+
+
+def supersede(kind, object_id, fmt=None, profile=None):
+    """Mark the current files of a document as superseded; the sweeper deletes them later."""
+    qs = RenderedDocument.objects.filter(kind=kind, object_id=object_id, superseded_at__isnull=True)
+    if fmt is not None:
+        qs = qs.filter(format=fmt)
+    if profile is not None:
+        qs = qs.filter(profile=profile)
+    qs.update(superseded_at=timezone.now())
+
+
+def invalidate(kind, object_id):
+    """Stop serving the stored files of a source object; they stay until swept."""
+    supersede(kind, object_id)
@@ -0,0 +1,455 @@
+"""
+DOCX → PDF conversion used by every PDF export.
+
+On Linux/macOS each conversion runs a one-shot ``--convert-to`` process
+by default. It uses the LibreOffice profile of the node-wide conversion slot
+it holds (see ``admission``), so profiles are initialized once per slot and
+at most ``EXPORT_MAX_CONVERSIONS`` soffice processes run on the node.
+
+``LIBREOFFICE_POOL_SIZE > 0`` opts a process into a pool of long-lived
+headless instances instead, saving LibreOffice start-up per conversion at
+the cost of that many resident soffice processes in *every* web worker.
+Each instance owns its own user profile directory, listens on a local UNO
+socket, is health-checked before use, recycled after
+``LIBREOFFICE_MAX_CONVERSIONS`` conversions and killed if a conversion runs
+past ``LIBREOFFICE_CONVERSION_TIMEOUT`` seconds. When the Python UNO bridge
+(``uno``) isn't importable, pooled instances also convert one-shot.
+
+``convert_docx_batch`` converts several files under a single lease (one
+``--convert-to`` process for the whole batch in one-shot mode) and reports
+a per-file error instead of failing the batch.
+
+Both take a PDF export profile (see ``pdf_profiles``) whose options are
+passed to LibreOffice as ``writer_pdf_Export`` FilterData; the PDFs are
+then linearized if the profile asks for it.
+
+Both hold a node-wide conversion slot (see ``admission``) while converting.
+"""
+from contextlib import contextmanager
+import atexit
+import os
+import queue
+import shutil
+import socket
+import sys
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .admission import conversion_slot
+from .pdf_profiles import filter_data, filter_options_json, linearize, resolve_profile
+
+if sys.platform == "win32":
+    from docx2pdf import convert
+else:
+    convert = None
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+    PropertyValue = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _props(**values):
+    props = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+class LibreOfficeWorker:
+    """One headless LibreOffice instance with a private profile directory."""
+
+    def __init__(self, index, profile_name=None):
+        self.index = index
+        self.profile_dir = os.path.join(
+            _setting("LIBREOFFICE_PROFILE_ROOT", os.path.join(tempfile.gettempdir(), "syllabease-lo")),
+            profile_name or f"{os.getpid()}-{index}",
+        )
+        self.process = None
+        self.port = None
+        self.desktop = None
+        self.conversions = 0
+
+    @property
+    def profile_url(self):
+        return "file://" + os.path.abspath(self.profile_dir).replace(os.sep, "/")
+
+    def base_command(self):
+        return [
+            _setting("LIBREOFFICE_BINARY", "libreoffice"),
+            f"-env:UserInstallation={self.profile_url}",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nocrashreport",
+            "--nofirststartwizard",
+        ]
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.port = _free_port()
+        accept = f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        try:
+            self.process = subprocess.Popen(
+                self.base_command() + [accept],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "LibreOffice is not installed. Install via: sudo apt install libreoffice"
+            )
+
+        deadline = time.monotonic() + _setting("LIBREOFFICE_STARTUP_TIMEOUT", 30)
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"LibreOffice exited during startup with code {self.process.returncode}")
+            try:
+                self.desktop = self._connect()
+                self.conversions = 0
+                return
+            except Exception:
+                time.sleep(0.25)
+
+        self.stop()
+        raise RuntimeError("LibreOffice did not accept UNO connections in time.")
+
+    def _connect(self):
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx
+        )
+        ctx = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        )
+        return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+    def stop(self):
+        self.desktop = None
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def is_healthy(self):
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def ensure_ready(self):
+        """Health check before a lease; (re)start the instance if it died or is due for recycling."""
+        if uno is None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            return
+        if self.conversions >= _setting("LIBREOFFICE_MAX_CONVERSIONS", 50) or not self.is_healthy():
+            self.stop()
+            self.start()
+
+    # ---------- Conversion ----------
+    def convert(self, input_path, output_path, timeout, options=None):
+        """``options``: ``writer_pdf_Export`` FilterData as ``{name: value}``."""
+        if uno is None:
+            self._convert_oneshot(input_path, output_path, timeout, options)
+        else:
+            self._convert_uno(input_path, output_path, timeout, options)
+        self.conversions += 1
+        return output_path
+
+    def convert_batch(self, pairs, timeout, options=None):
+        """
+        Convert ``[(input_path, output_path), ...]`` on this instance.
+        Returns one error message (or None) per pair; a failing file doesn't stop the rest.
+        """
+        if uno is None:
+            errors = self._convert_oneshot_batch(pairs, timeout, options)
+        else:
+            errors = []
+            for input_path, output_path in pairs:
+                try:
+                    # A failed conversion stops the instance; bring it back for the next file
+                    self.ensure_ready()
+                    self._convert_uno(input_path, output_path, timeout, options)
+                    errors.append(None)
+                except RuntimeError as e:
+                    errors.append(str(e))
+        self.conversions += len(pairs)
+        return errors
+
+    def _convert_uno(self, input_path, output_path, timeout, options=None):
+        outcome = {}
+        store_args = {"FilterName": "writer_pdf_Export"}
+        if options:
+            store_args["FilterData"] = uno.Any("[]com.sun.star.beans.PropertyValue", _props(**options))
+
+        def work():
+            try:
+                document = self.desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(os.path.abspath(input_path)), "_blank", 0, _props(Hidden=True)
+                )
+                try:
+                    # uno.invoke keeps the typed FilterData sequence intact
+                    uno.invoke(document, "storeToURL", (
+                        uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                        uno.Any("[]com.sun.star.beans.PropertyValue", _props(**store_args)),
+                    ))
+                finally:
+                    document.close(True)
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            # Killing the instance unblocks the UNO call; the next lease restarts it
+            self.stop()
+            raise RuntimeError(f"LibreOffice conversion timed out after {timeout}s")
+        if "error" in outcome:
+            self.stop()
+            raise RuntimeError(f"LibreOffice conversion failed: {outcome['error']}")
+
+    @staticmethod
+    def _convert_to(options):
+        # LibreOffice 7.4+ takes filter options as JSON after the filter name
+        if not options:
+            return "pdf"
+        return f"pdf:writer_pdf_Export:{filter_options_json(options)}"
+
+    def _convert_oneshot(self, input_path, output_path, timeout, options=None):
+        try:
+            result = subprocess.run(
+                self.base_command() + [
+                    "--convert-to", self._convert_to(options),
+                    input_path,
+                    "--outdir", os.path.dirname(output_path),
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "LibreOffice is not installed. Install via: sudo apt install libreoffice"
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"LibreOffice conversion timed out after {timeout}s")
+
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"LibreOffice failed with code {result.returncode}: {result.stderr}"
+            )
+
+    def _convert_oneshot_batch(self, pairs, timeout, options=None):
+        """
+        One ``--convert-to`` process per group of files. LibreOffice names each
+        PDF after its input, so inputs sharing a file name go into separate groups.
+        """
+        errors = [None] * len(pairs)
+        groups = []
+        for index, (input_path, _) in enumerate(pairs):
+            stem = os.path.splitext(os.path.basename(input_path))[0]
+            for group in groups:
+                if stem not in group:
+                    group[stem] = index
+                    break
+            else:
+                groups.append({stem: index})
+
+        for group in groups:
+            with tempfile.TemporaryDirectory() as outdir:
+                failure = None
+                try:
+                    result = subprocess.run(
+                        self.base_command()
+                        + ["--convert-to", self._convert_to(options)]
+                        + [pairs[index][0] for index in group.values()]
+                        + ["--outdir", outdir],
+                        capture_output=True,
+                        text=True,
+                        timeout=timeout * len(group),
+                    )
+                    if result.returncode != 0:
+                        failure = f"LibreOffice failed with code {result.returncode}: {result.stderr}"
+                except FileNotFoundError:
+                    raise RuntimeError(
+                        "LibreOffice is not installed. Install via: sudo apt install libreoffice"
+                    )
+                except subprocess.TimeoutExpired:
+                    failure = f"LibreOffice batch conversion timed out after {timeout * len(group)}s"
+
+                for stem, index in group.items():
+                    produced = os.path.join(outdir, f"{stem}.pdf")
+                    if os.path.exists(produced):
+                        shutil.move(produced, pairs[index][1])
+                    else:
+                        errors[index] = failure or "LibreOffice produced no PDF for this file."
+        return errors
+
+
+class LibreOfficePool:
+    """Fixed-size pool of ``LibreOfficeWorker`` leased one conversion at a time."""
+
+    def __init__(self, size):
+        self.workers = [LibreOfficeWorker(index) for index in range(size)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        if timeout is None:
+            timeout = _setting("LIBREOFFICE_ACQUIRE_TIMEOUT", 120)
+        try:
+            worker = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError("No LibreOffice converter became available in time.")
+        try:
+            worker.ensure_ready()
+            yield worker
+        finally:
+            self.idle.put(worker)
+
+    def convert(self, input_path, output_path, options=None):
+        with self.lease() as worker:
+            return worker.convert(
+                input_path, output_path, _setting("LIBREOFFICE_CONVERSION_TIMEOUT", 120), options
+            )
+
+    def convert_batch(self, pairs, options=None):
+        """Convert several files under a single lease; see ``LibreOfficeWorker.convert_batch``."""
+        with self.lease() as worker:
+            return worker.convert_batch(pairs, _setting("LIBREOFFICE_CONVERSION_TIMEOUT", 120), options)
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide converter pool (None unless ``LIBREOFFICE_POOL_SIZE > 0``), started on the first PDF export."""
+    global _pool
+    size = _setting("LIBREOFFICE_POOL_SIZE", 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = LibreOfficePool(size)
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def slot_worker(slot):
+    """One-shot converter using the profile of node-wide conversion slot ``slot``."""
+    worker = LibreOfficeWorker(slot, profile_name=f"slot-{slot}")
+    os.makedirs(worker.profile_dir, exist_ok=True)
+    return worker
+
+
+def convert_docx_to_pdf(input_path, output_path, profile=None):
+    """
+    Cross-platform DOCX → PDF converter.
+    - Windows  → docx2pdf (Microsoft Word COM; profile filter options don't apply)
+    - Linux/Mac → headless LibreOffice (one-shot, or pooled when enabled)
+    """
+
+    system = platform.system().lower()
+    profile = resolve_profile(profile)
+
+    # At most EXPORT_MAX_CONVERSIONS conversions run at once on this host
+    with conversion_slot() as slot:
+        # --- WINDOWS: Use docx2pdf ---
+        if system == "windows":
+            try:
+                convert(input_path, output_path)
+            except Exception as e:
+                raise RuntimeError(f"docx2pdf conversion failed: {e}")
+
+        # --- Linux / macOS: LibreOffice ---
+        else:
+            pool = get_pool()
+            if pool is None:
+                slot_worker(slot)._convert_oneshot(
+                    input_path, output_path, _setting("LIBREOFFICE_CONVERSION_TIMEOUT", 120), filter_data(profile)
+                )
+            else:
+                pool.convert(input_path, output_path, filter_data(profile))
+
+    linearize(output_path, profile)
+    return output_path
+
+
+def convert_docx_batch(pairs, profile=None):
+    """
+    Convert ``[(input_path, output_path), ...]`` in one converter session.
+    Returns ``[{"input", "output", "error"}, ...]`` in the same order; ``error``
+    is None for files that converted.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    profile = resolve_profile(profile)
+
+    with conversion_slot() as slot:
+        if platform.system().lower() == "windows":
+            errors = []
+            for input_path, output_path in pairs:
+                try:
+                    convert(input_path, output_path)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(f"docx2pdf conversion failed: {e}")
+        else:
+            pool = get_pool()
+            if pool is None:
+                errors = slot_worker(slot)._convert_oneshot_batch(
+                    pairs, _setting("LIBREOFFICE_CONVERSION_TIMEOUT", 120), filter_data(profile)
+                )
+            else:
+                errors = pool.convert_batch(pairs, filter_data(profile))
+
+    for (_, output_path), error in zip(pairs, errors):
+        if error is None:
+            linearize(output_path, profile)
+
+    return [
+        {"input": input_path, "output": output_path, "error": error}
+        for (input_path, output_path), error in zip(pairs, errors)
+    ]
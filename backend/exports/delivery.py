@@ -0,0 +1,115 @@
+"""
+Streamed delivery of stored export files.
+
+``file_response`` serves a file straight from ``default_storage`` with
+``FileResponse`` (chunked reads, no full copy in memory) and understands
+single-range ``Range`` requests, ``If-Range`` and ``If-None-Match``. Stored
+export files are never rewritten in place (every render gets a new storage
+name), so the storage path is a stable validator for the ETag.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFile:
+    """Read-only view of ``length`` bytes of an open file, starting at its current position."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def etag_for(path):
+    return '"{}"'.format(hashlib.sha256(path.encode("utf-8")).hexdigest()[:32])
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) for a single ``bytes=`` range, ``None`` when the
+    header should be ignored, or ``False`` when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # absent, malformed or multi-range: serve the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def file_response(request, path, filename=None):
+    """``FileResponse`` for ``path`` in ``default_storage`` honouring Range/If-None-Match."""
+    filename = filename or os.path.basename(path)
+    etag = etag_for(path)
+
+    if_none_match = request.headers.get("If-None-Match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    size = default_storage.size(path)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    f = default_storage.open(path, "rb")
+    if byte_range:
+        start, end = byte_range
+        f.seek(start)
+        response = FileResponse(
+            RangeFile(f, end - start + 1),
+            status=206,
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = FileResponse(f, as_attachment=True, filename=filename, content_type=content_type)
+        response["Content-Length"] = str(size)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,100 @@
+"""
+CO-PO matrix of the syllabus as WordprocessingML.
+
+``copo_table_xml`` writes the whole ``w:tbl`` in one pass over the ``copo``
+grid of ``syllabus_render_data`` instead of adding the table through
+python-docx and formatting it cell by cell (merges, widths, fonts,
+alignment), which was the slowest part of the build for programs with many
+POs.
+
+The markup is what the python-docx builder produced: a "Table Grid" table
+whose first column is 1.5" and PO columns 0.1" (scaled down together to
+fit 4"), 9pt Times New Roman, centered except for the CO labels. The two
+header rows keep the even column widths python-docx gives a new table, the
+CO rows take the grid widths.
+"""
+from functools import lru_cache
+
+from docx.shared import Emu, Inches
+
+from .html_docx import BLOCK_WIDTH, TABLE_LOOK, run_content
+
+MAX_TABLE_WIDTH_INCH = 4
+CO_WIDTH_INCH = 1.5
+CODE_WIDTH_INCH = 0.1
+
+FONT_SIZE = 9
+
+
+@lru_cache(maxsize=None)
+def _cell_start(width_twips, align, bold, extra_tcpr=""):
+    # Everything of a text cell up to its text
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width_twips}"/>{extra_tcpr}'
+        '<w:vAlign w:val="center"/></w:tcPr>'
+        f'<w:p><w:pPr><w:jc w:val="{align}"/></w:pPr><w:r><w:rPr>'
+        '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="Times New Roman"/>'
+        + ("<w:b/>" if bold else '<w:b w:val="0"/>')
+        + f'<w:sz w:val="{FONT_SIZE * 2}"/></w:rPr>'
+    )
+
+
+CELL_END = "</w:r></w:p></w:tc>"
+
+
+def text_cell(text, width_twips, align="center", bold=False, extra_tcpr=""):
+    return _cell_start(width_twips, align, bold, extra_tcpr) + run_content(text) + CELL_END
+
+
+def column_widths(po_count):
+    """``(co_width, code_width)`` in twips."""
+    desired = CO_WIDTH_INCH + po_count * CODE_WIDTH_INCH
+    scale = MAX_TABLE_WIDTH_INCH / desired if desired > MAX_TABLE_WIDTH_INCH else 1.0
+    return (
+        Emu(int(Inches(CO_WIDTH_INCH * scale))).twips,
+        Emu(int(Inches(CODE_WIDTH_INCH * scale))).twips,
+    )
+
+
+def copo_table_xml(copo):
+    """``copo`` is ``{"pos": [po_letter, ...], "cos": [(label, [codes per PO]), ...]}``."""
+    po_list = copo["pos"]
+    n_cols = 1 + len(po_list)
+    co_width, code_width = column_widths(len(po_list))
+    # Header cells keep the even widths of a new python-docx table
+    header_width = Emu(BLOCK_WIDTH // n_cols).twips
+
+    parts = [
+        '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>',
+        TABLE_LOOK,
+        f'</w:tblPr><w:tblGrid><w:gridCol w:w="{co_width}"/>',
+        f'<w:gridCol w:w="{code_width}"/>' * len(po_list),
+        "</w:tblGrid>",
+    ]
+
+    # Header row 1: "Course Outcomes" (spans both header rows) and "Program Outcomes" over the PO columns
+    parts.append("<w:tr>")
+    parts.append(text_cell("Course Outcomes (CO)", header_width, bold=True, extra_tcpr='<w:vMerge w:val="restart"/>'))
+    if po_list:
+        span = f'<w:gridSpan w:val="{len(po_list)}"/>' if len(po_list) > 1 else ""
+        parts.append(text_cell("Program Outcomes (PO)", header_width * len(po_list), bold=True, extra_tcpr=span))
+    parts.append("</w:tr>")
+
+    # Header row 2: PO letters
+    parts.append(
+        f'<w:tr><w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{header_width}"/><w:vMerge/></w:tcPr><w:p/></w:tc>'
+    )
+    for po_letter in po_list:
+        parts.append(text_cell(po_letter, header_width))
+    parts.append("</w:tr>")
+
+    # One row per CO: label, then its codes under each PO
+    for label, codes in copo["cos"]:
+        parts.append("<w:tr>")
+        parts.append(text_cell(label, co_width, align="left"))
+        for code in codes:
+            parts.append(text_cell(code, code_width))
+        parts.append("</w:tr>")
+
+    parts.append("</w:tbl>")
+    return "".join(parts)
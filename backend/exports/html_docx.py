@@ -0,0 +1,477 @@
+"""
+TinyMCE / Word HTML → WordprocessingML for rich-text syllabus fields.
+
+The HTML is parsed with lxml and each top-level ``<p>``, list and table is
+emitted directly as ``w:p`` / ``w:tbl`` markup in one pass, instead of being
+assembled run by run and cell by cell through python-docx. The resulting
+body XML is memoized by a hash of the input HTML, so a field that hasn't
+changed since the last export is only parsed once per worker.
+
+The markup matches what the previous python-docx based converter produced:
+10pt Times New Roman runs, "• " / "1. " list prefixes with a hanging
+indent, ``padding-left`` as left indent and "Table Grid" tables sized to
+the default text width with colspan/rowspan merges.
+
+``sanitize_html`` reduces the same HTML to what this converter understands,
+for places that show it in a browser (the HTML preview).
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from xml.sax.saxutils import escape
+import hashlib
+import html
+import re
+import threading
+
+import lxml.html
+from django.conf import settings
+from docx.shared import Emu, Inches
+
+# Style parsing (same patterns the converter has always matched)
+PADDING_LEFT_RE = re.compile(r"padding-left\s*:\s*(\d+)px")
+BACKGROUND_RE = re.compile(r"background-color\s*:\s*#?([0-9a-fA-F]{6})")
+COLOR_RE = re.compile(r"color\s*:\s*#?([0-9a-fA-F]{6})")
+TEXT_ALIGN_RE = re.compile(r"text-align\s*:\s*(\w+)")
+BORDER_COLOR_RE = re.compile(r"border-color\s*:\s*#?([0-9a-fA-F]{6})")
+BORDER_WIDTH_RE = re.compile(r"border\s*:\s*(\d+)px")
+
+# Tabs and line breaks become w:tab / w:br, like python-docx's Run.text
+RUN_SPLIT_RE = re.compile(r"([\t\r\n])")
+# Control characters that are not allowed in XML
+INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Text width of python-docx's default template, which subdocument tables are sized to
+BLOCK_WIDTH = Inches(6)
+
+HANGING_INDENT = Inches(0.2).twips
+PREFIX_RPR = '<w:rPr><w:sz w:val="20"/></w:rPr>'
+TABLE_LOOK = (
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+    'w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+)
+NO_TABLE_BORDERS = (
+    "<w:tblBorders>"
+    + "".join(f'<w:{side} w:val="none"/>' for side in ("top", "left", "bottom", "right", "insideH", "insideV"))
+    + "</w:tblBorders>"
+)
+
+
+# ---------- Runs ----------
+@lru_cache(maxsize=None)
+def run_properties(bold, italic, underline, color):
+    return (
+        "<w:rPr>"
+        '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="Times New Roman"/>'
+        + ("<w:b/>" if bold else '<w:b w:val="0"/>')
+        + ("<w:i/>" if italic else '<w:i w:val="0"/>')
+        + (f'<w:color w:val="{color.upper()}"/>' if color else "")
+        + '<w:sz w:val="20"/>'
+        + ('<w:u w:val="single"/>' if underline else '<w:u w:val="none"/>')
+        + "</w:rPr>"
+    )
+
+
+def run_content(text):
+    parts = []
+    for piece in RUN_SPLIT_RE.split(INVALID_XML_RE.sub("", text)):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in "\r\n":
+            parts.append("<w:br/>")
+        elif piece.strip() != piece:
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def run(text, rpr=""):
+    return f"<w:r>{rpr}{run_content(text)}</w:r>"
+
+
+def paragraph_properties(left_twips, hanging):
+    first = f'w:hanging="{HANGING_INDENT}"' if hanging else 'w:firstLine="0"'
+    return f'<w:pPr><w:spacing w:after="0"/><w:ind w:left="{left_twips}" {first}/></w:pPr>'
+
+
+def padding_left_twips(style):
+    match = PADDING_LEFT_RE.search(style)
+    if match:
+        # Approx conversion: 96 px = 1 inch
+        return Inches(int(match.group(1)) / 96).twips
+    return 0
+
+
+def span(elem, name):
+    try:
+        return max(int(elem.get(name, 1)), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def is_element(node):
+    # Comments and processing instructions have a callable tag
+    return isinstance(node.tag, str)
+
+
+class HtmlToDocx:
+    """Single-use converter; ``blocks`` collects body-level XML in document order."""
+
+    def __init__(self):
+        self.blocks = []
+
+    # ----------------- Inline content -----------------
+    def render_inline(self, parts, elem, bold=False, italic=False, underline=False, color=None):
+        if not is_element(elem):
+            return
+        tag = elem.tag
+        bold = bold or tag in ("b", "strong")
+        italic = italic or tag in ("i", "em")
+        underline = underline or tag == "u"
+
+        style = (elem.get("style") or "").lower()
+        match_color = COLOR_RE.search(style)
+        if match_color:
+            color = match_color.group(1)
+        if "font-weight: bold" in style:
+            bold = True
+        if "font-style: italic" in style:
+            italic = True
+        if "text-decoration: underline" in style:
+            underline = True
+
+        if tag == "br":
+            parts.append("<w:r><w:br/></w:r>")
+
+        rpr = run_properties(bold, italic, underline, color)
+        if elem.text:
+            parts.append(run(elem.text, rpr))
+        for child in elem:
+            self.render_inline(parts, child, bold, italic, underline, color)
+            if child.tail:
+                parts.append(run(child.tail, rpr))
+
+    def render_contents(self, parts, elem):
+        """Inline-render the children of ``elem`` with default formatting."""
+        rpr = run_properties(False, False, False, None)
+        if elem.text:
+            parts.append(run(elem.text, rpr))
+        for child in elem:
+            self.render_inline(parts, child)
+            if child.tail:
+                parts.append(run(child.tail, rpr))
+
+    # ----------------- Block content -----------------
+    def render_paragraph(self, elem):
+        parts = []
+        text = elem.text or ""
+        if text.lstrip().startswith("●"):
+            parts.append(run("• ", PREFIX_RPR))
+            elem.text = text.replace("●", "", 1)
+        self.render_contents(parts, elem)
+        pPr = paragraph_properties(padding_left_twips(elem.get("style") or ""), hanging=False)
+        self.blocks.append(f"<w:p>{pPr}{''.join(parts)}</w:p>")
+
+    def render_list(self, list_elem):
+        items = [li for li in list_elem if is_element(li) and li.tag == "li"]
+        for idx, li in enumerate(items, start=1):
+            prefix = "• " if list_elem.tag == "ul" else f"{idx}. "
+            parts = [run(prefix, PREFIX_RPR)]
+            self.render_contents(parts, li)
+            pPr = paragraph_properties(padding_left_twips(li.get("style") or ""), hanging=True)
+            self.blocks.append(f"<w:p>{pPr}{''.join(parts)}</w:p>")
+
+            for child in li:
+                if is_element(child) and child.tag in ("ul", "ol"):
+                    self.render_list(child)
+
+    def render_cell(self, td, width_twips, colspan, rowspan):
+        style = td.get("style") or ""
+
+        tcPr = [f'<w:tcW w:type="dxa" w:w="{width_twips}"/>']
+        if colspan > 1:
+            tcPr.append(f'<w:gridSpan w:val="{colspan}"/>')
+        if rowspan > 1:
+            tcPr.append('<w:vMerge w:val="restart"/>')
+
+        border_color = BORDER_COLOR_RE.search(style)
+        border_width = BORDER_WIDTH_RE.search(style)
+        if border_color or border_width:
+            sz = int(border_width.group(1)) * 4 if border_width else 4
+            color = border_color.group(1) if border_color else "000000"
+            tcPr.append(
+                "<w:tcBorders>"
+                + "".join(
+                    f'<w:{side} w:val="single" w:sz="{sz}" w:color="{color}"/>'
+                    for side in ("top", "left", "bottom", "right")
+                )
+                + "</w:tcBorders>"
+            )
+
+        background = BACKGROUND_RE.search(style)
+        if background:
+            tcPr.append(f'<w:shd w:fill="{background.group(1)}"/>')
+
+        valign = (td.get("valign") or "").lower()
+        tcPr.append('<w:vAlign w:val="{}"/>'.format(
+            {"middle": "center", "bottom": "bottom"}.get(valign, "top")
+        ))
+
+        pPr = ""
+        align = TEXT_ALIGN_RE.search(style)
+        if align:
+            jc = align.group(1).lower()
+            pPr = '<w:pPr><w:jc w:val="{}"/></w:pPr>'.format(jc if jc in ("center", "right") else "left")
+
+        text_color = COLOR_RE.search(style)
+        parts = [
+            f'<w:r><w:rPr><w:color w:val="{text_color.group(1).upper()}"/></w:rPr></w:r>'
+            if text_color else "<w:r/>"
+        ]
+        rpr = run_properties(False, False, False, None)
+        if td.text:
+            parts.append(run(td.text, rpr))
+        for child in td:
+            if is_element(child) and child.tag == "table":
+                self.render_table(child)  # nested table, placed after this one
+            else:
+                self.render_inline(parts, child)
+            if child.tail:
+                parts.append(run(child.tail, rpr))
+
+        return f"<w:tc><w:tcPr>{''.join(tcPr)}</w:tcPr><w:p>{pPr}{''.join(parts)}</w:p></w:tc>"
+
+    def render_table(self, table_elem):
+        rows = list(table_elem.iter("tr"))
+        if not rows:
+            return
+        row_cells = [[td for td in tr if is_element(td) and td.tag in ("td", "th")] for tr in rows]
+
+        # Calculate max columns considering colspan
+        n_cols = max(sum(span(td, "colspan") for td in cells) for cells in row_cells)
+        if not n_cols:
+            return
+        col_width = Emu(BLOCK_WIDTH // n_cols)
+
+        def width(cols):
+            return Emu(col_width * cols).twips
+
+        # Reserve this table's slot; nested tables are appended after it
+        slot = len(self.blocks)
+        self.blocks.append("")
+
+        # grid[r][c]: None (empty cell), ("cell", xml, colspan), ("merged", colspan)
+        # for the rows a rowspan continues into, or "covered" inside a span
+        grid = [[None] * n_cols for _ in rows]
+        for r_idx, cells in enumerate(row_cells):
+            c_idx = 0
+            for td in cells:
+                # Find next available column (skip merged cells)
+                while c_idx < n_cols and grid[r_idx][c_idx] is not None:
+                    c_idx += 1
+                if c_idx >= n_cols:
+                    break
+
+                colspan = min(span(td, "colspan"), n_cols - c_idx)
+                rowspan = min(span(td, "rowspan"), len(rows) - r_idx)
+                xml = self.render_cell(td, width(colspan), colspan, rowspan)
+
+                for mr in range(r_idx, r_idx + rowspan):
+                    for mc in range(c_idx, c_idx + colspan):
+                        grid[mr][mc] = "covered"
+                    grid[mr][c_idx] = ("merged", colspan)
+                grid[r_idx][c_idx] = ("cell", xml, colspan)
+
+                c_idx += colspan
+
+        trs = []
+        for row in grid:
+            tcs = []
+            c_idx = 0
+            while c_idx < n_cols:
+                entry = row[c_idx]
+                if entry is None or entry == "covered":
+                    tcs.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width(1)}"/></w:tcPr><w:p/></w:tc>')
+                    c_idx += 1
+                elif entry[0] == "cell":
+                    tcs.append(entry[1])
+                    c_idx += entry[2]
+                else:
+                    colspan = entry[1]
+                    grid_span = f'<w:gridSpan w:val="{colspan}"/>' if colspan > 1 else ""
+                    tcs.append(
+                        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width(colspan)}"/>'
+                        f"{grid_span}<w:vMerge/></w:tcPr><w:p/></w:tc>"
+                    )
+                    c_idx += colspan
+            trs.append(f"<w:tr>{''.join(tcs)}</w:tr>")
+
+        # "border:none" tables override the Table Grid borders
+        table_style = (table_elem.get("style") or "").lower()
+        borders = NO_TABLE_BORDERS if "border:none" in table_style or "border-width:0" in table_style else ""
+
+        grid_cols = "".join(f'<w:gridCol w:w="{width(1)}"/>' for _ in range(n_cols))
+        self.blocks[slot] = (
+            "<w:tbl><w:tblPr>"
+            '<w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>'
+            f"{borders}{TABLE_LOOK}</w:tblPr>"
+            f"<w:tblGrid>{grid_cols}</w:tblGrid>{''.join(trs)}</w:tbl>"
+        )
+
+    # ----------------- Main loop over top-level elements -----------------
+    def convert(self, raw_html):
+        root = lxml.html.fragment_fromstring(raw_html, create_parent="div")
+
+        def loose_text(text):
+            if text and text.strip():
+                self.blocks.append(f"<w:p>{run(text.strip())}</w:p>")
+
+        loose_text(root.text)
+        for elem in root:
+            if is_element(elem):
+                if elem.tag == "p":
+                    self.render_paragraph(elem)
+                elif elem.tag in ("ul", "ol"):
+                    self.render_list(elem)
+                elif elem.tag == "table":
+                    self.render_table(elem)
+            loose_text(elem.tail)
+        return "".join(self.blocks)
+
+
+# ---------- Sanitizing ----------
+# Tags the converter renders; any other tag is unwrapped and keeps its text
+ALLOWED_TAGS = frozenset({
+    "p", "br", "span", "b", "strong", "i", "em", "u", "ul", "ol", "li",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th",
+})
+# Removed together with their content
+DROPPED_TAGS = frozenset({
+    "script", "style", "iframe", "frame", "frameset", "object", "embed", "applet", "svg", "math",
+    "template", "noscript", "textarea", "select", "button", "form", "head", "title", "meta", "link", "base",
+})
+ALLOWED_ATTRIBUTES = frozenset({"style", "colspan", "rowspan", "valign"})
+# CSS properties the converter reads
+ALLOWED_STYLES = frozenset({
+    "padding-left", "background-color", "color", "text-align", "border", "border-color", "border-width",
+    "font-weight", "font-style", "text-decoration",
+})
+# Plain values only: no url(), expression() or escapes
+STYLE_VALUE_RE = re.compile(r"^[#\w\s.,%-]+$")
+SPAN_RE = re.compile(r"^\d{1,3}$")
+
+
+def sanitize_style(style):
+    declarations = []
+    for declaration in style.split(";"):
+        name, sep, value = declaration.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        if sep and name in ALLOWED_STYLES and STYLE_VALUE_RE.match(value):
+            declarations.append(f"{name}: {value}")
+    return "; ".join(declarations)
+
+
+def sanitize_html(raw_html):
+    """
+    ``raw_html`` (TinyMCE / Word HTML) reduced to the tags, attributes and
+    inline styles the DOCX converter supports; safe to insert into a page.
+    """
+    if not raw_html or not raw_html.strip():
+        return ""
+    root = lxml.html.fragment_fromstring(raw_html, create_parent="div")
+
+    for elem in list(root.iterdescendants()):
+        if elem.getparent() is None:
+            continue  # inside a subtree removed earlier
+        if not is_element(elem) or elem.tag in DROPPED_TAGS:
+            elem.drop_tree()
+        elif elem.tag not in ALLOWED_TAGS:
+            elem.drop_tag()
+        else:
+            for name, value in list(elem.attrib.items()):
+                if name == "style":
+                    value = sanitize_style(value)
+                elif name in ("colspan", "rowspan"):
+                    value = value.strip() if SPAN_RE.match(value.strip()) else ""
+                elif name == "valign":
+                    value = value.strip().lower() if value.strip().lower() in ("top", "middle", "bottom") else ""
+                else:
+                    value = ""
+                if value:
+                    elem.set(name, value)
+                else:
+                    del elem.attrib[name]
+
+    return html.escape(root.text or "", quote=False) + "".join(
+        lxml.html.tostring(child, encoding="unicode") for child in root
+    )
+
+
+class ConvertedHtmlCache:
+    """LRU of converted body XML keyed by the SHA-256 of the source HTML."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            xml = self.entries.get(key)
+            if xml is not None:
+                self.entries.move_to_end(key)
+            return xml
+
+    def put(self, key, xml):
+        with self.lock:
+            self.entries[key] = xml
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_cache = ConvertedHtmlCache(getattr(settings, "HTML_DOCX_CACHE_SIZE", 256))
+
+
+def html_to_docx_xml(raw_html):
+    """Body-level WordprocessingML (``w:p``/``w:tbl`` elements) for ``raw_html``."""
+    if not raw_html:
+        return ""
+    key = hashlib.sha256(raw_html.encode("utf-8")).hexdigest()
+    xml = _cache.get(key)
+    if xml is None:
+        xml = HtmlToDocx().convert(raw_html)
+        _cache.put(key, xml)
+    return xml
+
+
+class BodyXml:
+    """
+    Body-level XML that docxtpl inserts like a ``Subdoc`` (``{{p var }}``).
+
+    docxtpl only needs ``str()`` of a subdocument, so this skips building a
+    throwaway python-docx ``Document`` for every rich-text field.
+    """
+
+    def __init__(self, xml):
+        self.xml = xml
+
+    def __str__(self):
+        return self.xml
+
+    def __html__(self):
+        return self.xml
+
+
+def html_to_subdoc(doc, raw_html):
+    """
+    Convert TinyMCE / Word HTML into a subdocument for ``doc``,
+    preserving bold, italic, underline, lists, and tables.
+    """
+    return BodyXml(html_to_docx_xml(raw_html))
@@ -0,0 +1,131 @@
+"""
+Background export queue.
+
+``enqueue_export`` records an ``ExportJob`` and hands it to a process-wide,
+bounded ``ThreadPoolExecutor`` once the surrounding transaction commits.
+The worker renders, converts and uploads the document, then notifies the
+requesting user through a ``Notification``.
+
+``schedule_prerender`` uses the same pool to render final documents right
+after approval, so the render cache already holds them when the downloads
+start.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from notifications.models import Notification
+from .models import ExportJob
+from .renderers import export_document, get_export_object, store_documents
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Notification domain per export kind
+NOTIFICATION_DOMAINS = {
+    "syllabus": "syllabus",
+    "review_form": "syllabus",
+    "packet": "syllabus",
+    "tos": "tos",
+}
+
+
+def get_executor():
+    """Lazily start the worker pool so management commands don't spawn threads."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "EXPORT_WORKERS", 2),
+                thread_name_prefix="export-worker",
+            )
+        return _executor
+
+
+def enqueue_export(user, kind, object_id, fmt, target_role=None, profile=""):
+    """Create a queued export job and schedule it after the current transaction commits."""
+    job = ExportJob.objects.create(
+        user=user,
+        target_role=target_role,
+        kind=kind,
+        object_id=object_id,
+        format=fmt,
+        profile=profile or "",
+    )
+    transaction.on_commit(lambda: get_executor().submit(run_export_job, job.pk))
+    return job
+
+
+def run_export_job(job_id):
+    """Worker entry point: executes one export job and records its outcome."""
+    close_old_connections()
+    try:
+        job = ExportJob.objects.select_related("user").get(pk=job_id)
+        if job.status != "QUEUED":
+            return
+
+        job.status = "RUNNING"
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "updated_at"])
+
+        try:
+            obj = get_export_object(job.kind, job.object_id)
+            job.file_url = export_document(job.kind, obj, job.format, job.profile or None)
+            job.status = "DONE"
+        except Exception as e:
+            logger.exception("Export job %s failed", job.pk)
+            job.status = "FAILED"
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "file_url", "error", "finished_at", "updated_at"])
+        notify_export_finished(job)
+    finally:
+        close_old_connections()
+
+
+def notify_export_finished(job):
+    document = job.get_kind_display()
+    if job.status == "DONE":
+        message = f"Your {document} {job.format.upper()} export is ready for download."
+        notif_type = "export_ready"
+    else:
+        message = f"Your {document} {job.format.upper()} export failed. Please try again."
+        notif_type = "export_failed"
+
+    link = job.file_url or ""
+    Notification.objects.create(
+        recipient=job.user,
+        target_role=job.target_role,
+        domain=NOTIFICATION_DOMAINS.get(job.kind, "system"),
+        type=notif_type,
+        message=message,
+        # link column is limited to 255 chars; signed storage URLs can be longer
+        link=link if len(link) <= 255 else "",
+    )
+
+
+def schedule_prerender(kind, object_id, formats=("docx", "pdf")):
+    """Render the final documents of ``kind``/``object_id`` once the current transaction commits."""
+    transaction.on_commit(lambda: get_executor().submit(prerender_document, kind, object_id, formats))
+
+
+def prerender_document(kind, object_id, formats):
+    """Worker entry point: fill the render cache; failures only get logged."""
+    close_old_connections()
+    try:
+        obj = get_export_object(kind, object_id)
+        for fmt in formats:
+            result = store_documents([(kind, obj)], fmt)[0]
+            if isinstance(result, Exception):
+                logger.warning("Pre-render of %s #%s (%s) failed: %s", kind, object_id, fmt, result)
+    except Exception:
+        logger.exception("Pre-render of %s #%s failed", kind, object_id)
+    finally:
+        close_old_connections()
@@ -0,0 +1,65 @@
+"""
+Export data loaders.
+
+``load_syllabus_export`` fetches everything the syllabus renderer reads in a
+fixed number of queries (one per relation, however many outlines, outcomes or
+signatories the syllabus has) and returns it as a ``SyllabusExportData``, so
+rendering never goes back to the database.
+"""
+from django.db.models import Prefetch
+
+from bayanihan.models import BayanihanGroupUser
+from syllabi.models import Syllabus, SyllabusCotCo, SyllabusInstructor
+
+
+class SyllabusExportData:
+    """Plain snapshot of a syllabus and the related rows its export needs."""
+
+    def __init__(self, syllabus):
+        self.syllabus = syllabus
+        self.peos = list(syllabus.peos.all())
+        self.program_outcomes = list(syllabus.program_outcomes.all())
+        self.course_outcomes = list(syllabus.course_outcomes.all())
+        self.instructors = [instructor.user for instructor in syllabus.instructors.all()]
+        self.leaders = [member.user for member in syllabus.bayanihan_group.bayanihan_members.all()]
+
+        # (course outcome id, program outcome id) -> CO-PO codes
+        self.copo_codes = {}
+        for copo in syllabus.syllcopos.all():
+            self.copo_codes.setdefault(
+                (copo.course_outcome_id, copo.program_outcome_id), []
+            ).append(copo.syllabus_co_po_code)
+
+        # [(outline, "CO1, CO2"), ...]
+        self.outlines = [
+            (outline, ", ".join(cotco.course_outcome.co_code for cotco in outline.cotcos.all()))
+            for outline in syllabus.course_outlines.all()
+        ]
+
+    @property
+    def pk(self):
+        return self.syllabus.pk
+
+
+def load_syllabus_export(syllabus_id):
+    """Load ``SyllabusExportData`` for a syllabus in a fixed number of queries."""
+    syllabus = (
+        Syllabus.objects.select_related(
+            "syllabus_template", "bayanihan_group", "course", "college", "program__department"
+        )
+        .prefetch_related(
+            "peos",
+            "program_outcomes",
+            "course_outcomes",
+            "syllcopos",
+            Prefetch("instructors", queryset=SyllabusInstructor.objects.select_related("user")),
+            Prefetch(
+                "bayanihan_group__bayanihan_members",
+                queryset=BayanihanGroupUser.objects.filter(role="LEADER").select_related("user"),
+            ),
+            "course_outlines",
+            Prefetch("course_outlines__cotcos", queryset=SyllabusCotCo.objects.select_related("course_outcome")),
+        )
+        .get(pk=syllabus_id)
+    )
+    return SyllabusExportData(syllabus)
@@ -0,0 +1,156 @@
+import time
+
+from django.core.management.base import BaseCommand
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt
+from docxtpl import Subdoc
+
+from exports.docx_tables import copo_table_xml
+from exports.template_registry import get_template
+
+
+def build_copo_table_python_docx(doc, copo):
+    """The python-docx builder ``copo_table_xml`` replaced; baseline of the benchmark."""
+    subdoc = Subdoc(doc)
+
+    po_list = copo["pos"]
+    co_list = copo["cos"]
+
+    # Create header row
+    table = subdoc.add_table(rows=2, cols=1 + len(po_list))
+    table.style = 'Table Grid'
+
+    # -----------------------------
+    # PAGE WIDTH
+    # -----------------------------
+    MAX_TABLE_WIDTH_INCH = 4    # usable page width
+    MAX_TABLE_WIDTH = Inches(MAX_TABLE_WIDTH_INCH)
+
+    # Desired widths (in inches)
+    DESIRED_CO_INCH = 1.5 
+    DESIRED_CODE_INCH = 0.1
+
+    # Total desired width in inches
+    desired_total_width_inch = DESIRED_CO_INCH + len(po_list) * DESIRED_CODE_INCH
+
+    # -----------------------------
+    # SCALE IF NEEDED
+    # -----------------------------
+    if desired_total_width_inch > MAX_TABLE_WIDTH_INCH:
+        scale_factor = MAX_TABLE_WIDTH_INCH / desired_total_width_inch
+    else:
+        scale_factor = 1.0
+
+    # Final widths (convert to EMUs & int)
+    CO_WIDTH = int(Inches(DESIRED_CO_INCH * scale_factor)) 
+    CODE_WIDTH = int(Inches(DESIRED_CODE_INCH * scale_factor))
+
+    # -----------------------------
+    # APPLY COLUMN WIDTHS
+    # -----------------------------
+    # 1st column: CO (big)
+    table.columns[0].width = CO_WIDTH
+
+    # Following columns:
+    # Row 1 = PO letter (medium)
+    # Row 2+ = CO-PO codes (tiny)
+    for idx in range(1, len(table.columns)):
+        table.columns[idx].width = CODE_WIDTH   # use code width for all body rows
+
+    # Helper for cell formatting
+    def set_cell_text(cell, text, bold=False, size=9, align_center=True, valign_center=True):
+        cell.text = text
+        for paragraph in cell.paragraphs:
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER if align_center else WD_ALIGN_PARAGRAPH.LEFT
+            run = paragraph.runs[0]
+            run.font.name = 'Times New Roman'
+            run.font.size = Pt(size)
+            run.bold = bold
+            rFonts = run._element.rPr.rFonts
+            rFonts.set(qn('w:eastAsia'), 'Times New Roman')
+
+        # Vertical alignment
+        tc_pr = cell._tc.get_or_add_tcPr()
+        vAlign = OxmlElement('w:vAlign')
+        vAlign.set(qn('w:val'), 'center')
+        tc_pr.append(vAlign)
+
+    # ----- HEADER ROWS -----
+    # CO header
+    co_cell = table.cell(0, 0)
+    co_cell.merge(table.cell(1, 0))
+    set_cell_text(co_cell, "Course Outcomes (CO)", bold=True)
+
+    # PO header merged
+    if po_list:
+        po_cell = table.cell(0, 1)
+        for idx in range(1, len(po_list)):
+            po_cell.merge(table.cell(0, idx + 1))
+        set_cell_text(po_cell, "Program Outcomes (PO)", bold=True)
+
+    # PO code letters
+    for idx, po_letter in enumerate(po_list):
+        cell = table.cell(1, idx + 1)
+        set_cell_text(cell, po_letter)
+
+    # ----- BODY ROWS -----
+    for label, codes in co_list:
+        row_cells = table.add_row().cells
+
+        # CO description (left aligned)
+        set_cell_text(row_cells[0], label, align_center=False)
+
+        # CO-PO codes
+        for idx, cell_text in enumerate(codes):
+            set_cell_text(row_cells[idx + 1], cell_text)
+
+    return subdoc
+
+
+def sample_copo(pos, cos):
+    return {
+        "pos": [chr(ord("a") + i % 26) for i in range(pos)],
+        "cos": [
+            (f"CO{i + 1}: Apply the concepts of unit {i + 1} to practical problems",
+             ["I, D" if (i + j) % 3 == 0 else ("E" if (i + j) % 3 == 1 else "") for j in range(pos)])
+            for i in range(cos)
+        ],
+    }
+
+
+def timed(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return sum(timings) / len(timings), timings[len(timings) // 2]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the CO-PO table builder against the python-docx builder it replaced."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pos", type=int, action="append", help="PO counts to try (default: 5, 12, 24).")
+        parser.add_argument("--cos", type=int, default=8, help="Course outcomes per table.")
+        parser.add_argument("--iterations", type=int, default=50, help="Builds per builder and size.")
+
+    def handle(self, *args, **options):
+        doc = get_template("syllabus")
+        iterations = max(options["iterations"], 1)
+
+        for pos in options["pos"] or [5, 12, 24]:
+            copo = sample_copo(pos, options["cos"])
+            same = str(build_copo_table_python_docx(doc, copo)) == copo_table_xml(copo)
+
+            old_mean, old_p50 = timed(lambda: str(build_copo_table_python_docx(doc, copo)), iterations)
+            new_mean, new_p50 = timed(lambda: copo_table_xml(copo), iterations)
+            self.stdout.write(
+                f"{pos:>3} POs x {options['cos']} COs: python-docx mean {old_mean * 1000:.2f} ms "
+                f"p50 {old_p50 * 1000:.2f} ms | xml mean {new_mean * 1000:.3f} ms "
+                f"p50 {new_p50 * 1000:.3f} ms | {old_mean / new_mean:.0f}x faster"
+                f"{'' if same else ' | OUTPUT DIFFERS'}"
+            )
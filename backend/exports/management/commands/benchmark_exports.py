@@ -0,0 +1,162 @@
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from exports.benchmark import STAGES, clear_process_caches, create_fixture, percentile, time_export
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark syllabus/TOS exports stage by stage on generated data. "
+        "Run with --settings=backend.settings_benchmark (local SQLite, no network)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--outlines", type=int, default=12, help="Course outline rows per syllabus.")
+        parser.add_argument("--cos", type=int, default=5, help="Course outcomes per syllabus.")
+        parser.add_argument("--pos", type=int, default=10, help="Program outcomes per syllabus.")
+        parser.add_argument("--signatories", type=int, default=3, help="Bayanihan leaders with signatures.")
+        parser.add_argument("--iterations", type=int, default=10, help="Timed exports per document kind.")
+        parser.add_argument("--kind", choices=["syllabus", "tos"], action="append", help="Document kinds (default: both).")
+        parser.add_argument("--cold", action="store_true", help="Clear in-process caches before every export.")
+        parser.add_argument("--skip-pdf", action="store_true", help="Skip the DOCX → PDF conversion stage.")
+        parser.add_argument(
+            "--output",
+            help="Results file (default: <temp dir>/syllabease-benchmarks/exports-<commit>-<time>.json).",
+        )
+        parser.add_argument("--compare", help="Earlier results file to print the difference against.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "benchmark_exports writes synthetic data; run it with "
+                "--settings=backend.settings_benchmark (throwaway SQLite database)."
+            )
+        if not getattr(settings, "EXPORT_BENCHMARK", False):
+            self.stderr.write(self.style.WARNING("Not using backend.settings_benchmark; uploads go to MEDIA_ROOT."))
+
+        call_command("migrate", run_syncdb=True, verbosity=0, interactive=False)
+
+        params = {key: options[key] for key in ("outlines", "cos", "pos", "signatories", "iterations", "cold", "skip_pdf")}
+        kinds = options["kind"] or ["syllabus", "tos"]
+        iterations = max(options["iterations"], 1)
+
+        syllabus, tos = create_fixture(options["outlines"], options["cos"], options["pos"], options["signatories"])
+        object_ids = {"syllabus": syllabus.pk, "tos": tos.pk}
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['outlines']} outlines, {options['cos']} COs, {options['pos']} POs, "
+            f"{options['signatories']} signatories; {iterations} iterations"
+            f"{' (cold caches)' if options['cold'] else ''}"
+        ))
+
+        results = {}
+        for kind in kinds:
+            runs = []
+            for _ in range(iterations):
+                if options["cold"]:
+                    clear_process_caches()
+                runs.append(time_export(kind, object_ids[kind], pdf=not options["skip_pdf"]))
+
+            # Separate pass so tracing overhead stays out of the timings
+            clear_process_caches()
+            tracemalloc.start()
+            try:
+                time_export(kind, object_ids[kind], pdf=False)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            results[kind] = {
+                "stages": {name: summarize([run[name] for run in runs]) for name in STAGES + ["total"]},
+                "queries": runs[-1]["queries"],
+                "peak_python_memory": peak,
+            }
+
+        report = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": params,
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            "max_rss": (
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if platform.system() == "Darwin" else 1024)
+                if resource else None
+            ),
+            "results": results,
+        }
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as f:
+                baseline = json.load(f)
+            if baseline.get("params") != params:
+                self.stderr.write(self.style.WARNING(
+                    f"{options['compare']} was run with different parameters: {baseline.get('params')}"
+                ))
+        self.print_report(report, baseline)
+
+        output = options["output"] or os.path.join(
+            tempfile.gettempdir(), "syllabease-benchmarks",
+            f"exports-{report['commit'] or 'unknown'}-{datetime.now():%Y%m%d%H%M%S}.json",
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def print_report(self, report, baseline=None):
+        for kind, result in report["results"].items():
+            base = (baseline or {}).get("results", {}).get(kind)
+            self.stdout.write(self.style.MIGRATE_LABEL(
+                f"\n{kind}: {result['queries']} queries, peak Python memory {result['peak_python_memory'] / 1024 / 1024:.1f} MiB"
+            ))
+            header = f"{'stage':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            if base:
+                header += f"{'base ms':>10}{'change':>9}"
+            self.stdout.write(header)
+
+            for name, stats in result["stages"].items():
+                line = f"{name:<12}{stats['mean'] * 1000:>10.2f}{stats['p50'] * 1000:>10.2f}{stats['p95'] * 1000:>10.2f}"
+                base_stats = base["stages"].get(name) if base else None
+                if base_stats:
+                    before, after = base_stats["mean"], stats["mean"]
+                    change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+                    line += f"{before * 1000:>10.2f}{change:>9}"
+                self.stdout.write(line)
+
+        if report["max_rss"]:
+            self.stdout.write(f"\nmax RSS {report['max_rss'] / 1024 / 1024:.1f} MiB (commit {report['commit'] or 'unknown'})")
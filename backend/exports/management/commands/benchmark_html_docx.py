@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exports import html_docx
+from exports.benchmark import percentile
+from exports.template_registry import get_template
+from syllabi.models import Syllabus
+
+
+class Command(BaseCommand):
+    help = "Benchmark the rich-text HTML → DOCX converter on stored syllabus course requirements."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50, help="Number of syllabi to sample.")
+        parser.add_argument("--iterations", type=int, default=20, help="Passes over the sample.")
+        parser.add_argument(
+            "--file", action="append", default=[],
+            help="Extra HTML file to include (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        samples = list(
+            Syllabus.objects.exclude(course_requirements__isnull=True)
+            .exclude(course_requirements="")
+            .order_by("-updated_at")
+            .values_list("course_requirements", flat=True)[: options["limit"]]
+        )
+        for path in options["file"]:
+            with open(path, encoding="utf-8") as f:
+                samples.append(f.read())
+
+        if not samples:
+            raise CommandError("No course requirements found; pass --file with sample HTML.")
+
+        iterations = max(options["iterations"], 1)
+        doc = get_template("syllabus")
+        total_bytes = sum(len(html.encode("utf-8")) for html in samples)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{len(samples)} documents, {total_bytes / 1024:.1f} KiB of HTML, {iterations} iterations"
+        ))
+
+        # Cold: every conversion parses the HTML and builds the XML
+        cold = []
+        for _ in range(iterations):
+            for html in samples:
+                html_docx._cache.clear()
+                start = time.perf_counter()
+                html_docx.html_to_subdoc(doc, html)
+                cold.append(time.perf_counter() - start)
+
+        # Warm: the body XML comes from the memo, only the subdocument is built
+        warm = []
+        for _ in range(iterations):
+            for html in samples:
+                start = time.perf_counter()
+                html_docx.html_to_subdoc(doc, html)
+                warm.append(time.perf_counter() - start)
+
+        for label, timings in (("cold", cold), ("memoized", warm)):
+            timings.sort()
+            mean = sum(timings) / len(timings)
+            self.stdout.write(
+                f"{label:>9}: mean {mean * 1000:.2f} ms  p50 {percentile(timings, 50) * 1000:.2f} ms  "
+                f"p95 {percentile(timings, 95) * 1000:.2f} ms  per document"
+            )
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+
+from exports.retention import storage_usage, sweep, sweep_bulk_exports, sweep_orphans, tracked_since
+
+
+def human_size(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        size /= 1024
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete superseded and expired export files (syllabi/, tos/, review_forms/, packets/) "
+        "in batches, and bulk export ZIPs (bulk_exports/) past their retention, then report "
+        "storage use per prefix. Meant to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Artifacts per batch (default: EXPORT_SWEEP_BATCH_SIZE).")
+        parser.add_argument("--limit", type=int, help="Stop after deleting this many artifacts.")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting.")
+        parser.add_argument(
+            "--orphans", action="store_true",
+            help=(
+                "Also list files under the export prefixes that no artifact refers to "
+                "(stored since export tracking started). Never deletes them; see --delete-orphans."
+            ),
+        )
+        parser.add_argument(
+            "--delete-orphans", action="store_true",
+            help="Delete the files --orphans lists. Review an --orphans run first.",
+        )
+        parser.add_argument("--stats", action="store_true", help="Only print storage use per prefix.")
+
+    def handle(self, *args, **options):
+        if not options["stats"]:
+            verb = "Would delete" if options["dry_run"] else "Deleted"
+            totals = sweep(options["batch_size"], options["limit"], options["dry_run"])
+            self.stdout.write(
+                f"{verb} {totals['artifacts']} artifacts ({human_size(totals['bytes'])})"
+            )
+            if totals["failed"]:
+                self.stderr.write(self.style.WARNING(f"{totals['failed']} files could not be deleted; see the log."))
+
+            bulk = sweep_bulk_exports(options["dry_run"])
+            self.stdout.write(f"{verb} {bulk['files']} bulk export archives ({human_size(bulk['bytes'])})")
+            if bulk["failed"]:
+                self.stderr.write(self.style.WARNING(f"{bulk['failed']} archives could not be deleted; see the log."))
+
+            if options["orphans"] or options["delete_orphans"]:
+                # Untracked files are only listed unless deletion is asked for explicitly
+                dry_run = options["dry_run"] or not options["delete_orphans"]
+                orphans = sweep_orphans(dry_run=dry_run)
+                since = tracked_since()
+                self.stdout.write(
+                    f"{'Would delete' if dry_run else 'Deleted'} {orphans['files']} untracked files "
+                    f"({human_size(orphans['bytes'])}) stored since "
+                    f"{since.isoformat(timespec='seconds') if since else 'an unknown time (skipped)'}"
+                )
+                if options["verbosity"] > 1:
+                    for path in orphans["paths"]:
+                        self.stdout.write(f"  {path}")
+                if dry_run and orphans["files"]:
+                    self.stdout.write("Run with --delete-orphans to delete them.")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Storage use"))
+        for row in storage_usage():
+            self.stdout.write(
+                f"  {row['prefix'] + '/':<15} {row['files']:>7} files {human_size(row['bytes']):>12}"
+                f"   superseded: {row['superseded_files']} ({human_size(row['superseded_bytes'])})"
+            )
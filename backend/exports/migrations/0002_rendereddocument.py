@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('syllabus', 'Syllabus'), ('tos', 'Table of Specifications'), ('review_form', 'Syllabus Review Form')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('format', models.CharField(choices=[('docx', 'DOCX'), ('pdf', 'PDF')], max_length=10)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('file_path', models.CharField(max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'unique_together': {('kind', 'object_id', 'format', 'content_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0003_bulkexport'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='kind',
+            field=models.CharField(choices=[('syllabus', 'Syllabus'), ('tos', 'Table of Specifications'), ('review_form', 'Syllabus Review Form'), ('packet', 'Accreditation Packet')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='rendereddocument',
+            name='kind',
+            field=models.CharField(choices=[('syllabus', 'Syllabus'), ('tos', 'Table of Specifications'), ('review_form', 'Syllabus Review Form'), ('packet', 'Accreditation Packet')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0004_packet_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rendereddocument',
+            name='last_used_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='rendereddocument',
+            name='size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rendereddocument',
+            name='superseded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='rendereddocument',
+            index=models.Index(fields=['superseded_at'], name='exports_ren_superse_3661b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rendereddocument',
+            index=models.Index(fields=['last_used_at'], name='exports_ren_last_us_a8ea81_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0005_artifact_retention'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='rendereddocument',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='profile',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='rendereddocument',
+            name='profile',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rendereddocument',
+            unique_together={('kind', 'object_id', 'format', 'profile', 'content_hash')},
+        ),
+    ]
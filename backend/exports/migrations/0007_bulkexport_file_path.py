@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:41
+
+from posixpath import basename
+from urllib.parse import unquote, urlsplit
+
+from django.db import migrations, models
+
+
+def backfill_file_path(apps, schema_editor):
+    # Archives were saved as bulk_exports/<name>; the URL ends with that name
+    BulkExport = apps.get_model("exports", "BulkExport")
+    for bulk in BulkExport.objects.exclude(file_url__isnull=True).exclude(file_url="").only("pk", "file_url"):
+        name = unquote(basename(urlsplit(bulk.file_url).path))
+        if name:
+            BulkExport.objects.filter(pk=bulk.pk).update(file_path=f"bulk_exports/{name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0006_pdf_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkexport',
+            name='file_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.RunPython(backfill_file_path, migrations.RunPython.noop),
+    ]
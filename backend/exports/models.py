@@ -0,0 +1,131 @@
+from django.db import models
+from django.utils import timezone
+from users.models import User
+
+# Create your models here.
+class ExportJob(models.Model):
+    """
+    A queued document export. The HTTP request only creates the job;
+    rendering, conversion and upload run on the export worker pool.
+    """
+    KIND_CHOICES = [
+        ("syllabus", "Syllabus"),
+        ("tos", "Table of Specifications"),
+        ("review_form", "Syllabus Review Form"),
+        ("packet", "Accreditation Packet"),
+    ]
+
+    FORMAT_CHOICES = [
+        ("docx", "DOCX"),
+        ("pdf", "PDF"),
+    ]
+
+    STATUS_CHOICES = [
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    # Role the export was requested under, used as the notification target role
+    target_role = models.CharField(max_length=50, blank=True, null=True)
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default="pdf")
+    # PDF export profile (exports.pdf_profiles); blank = default
+    profile = models.CharField(max_length=30, blank=True, default="")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED")
+    file_url = models.TextField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} → {self.format.upper()} ({self.status})"
+
+
+class RenderedDocument(models.Model):
+    """
+    A generated export file: the stored file produced for a source object at
+    a given content fingerprint (see ``exports.cache.compute_fingerprint``).
+    Doubles as the render cache and as the artifact index the retention
+    sweeper (``manage.py sweep_exports``) deletes files from.
+    """
+    kind = models.CharField(max_length=20, choices=ExportJob.KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    format = models.CharField(max_length=10, choices=ExportJob.FORMAT_CHOICES)
+    # PDF export profile the file was converted with ("" for DOCX)
+    profile = models.CharField(max_length=30, blank=True, default="")
+    content_hash = models.CharField(max_length=64)
+    file_path = models.CharField(max_length=500)
+    size = models.PositiveBigIntegerField(default=0)
+
+    # Set when the source changed or a newer render replaced this file
+    superseded_at = models.DateTimeField(blank=True, null=True)
+    # Last time an export was served from this file (refreshed at most daily)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id", "format", "profile", "content_hash")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["superseded_at"]),
+            models.Index(fields=["last_used_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} ({self.format}) {self.content_hash[:12]}"
+
+
+class BulkExport(models.Model):
+    """
+    One ZIP with every approved syllabus, TOS and review form matching
+    ``filters`` (college, department, school_year, semester).
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="bulk_exports"
+    )
+    target_role = models.CharField(max_length=50, blank=True, null=True)
+    filters = models.JSONField(default=dict, blank=True)
+    format = models.CharField(max_length=10, choices=ExportJob.FORMAT_CHOICES, default="pdf")
+
+    status = models.CharField(max_length=10, choices=ExportJob.STATUS_CHOICES, default="QUEUED")
+    total_items = models.PositiveIntegerField(default=0)
+    completed_items = models.PositiveIntegerField(default=0)
+    failed_items = models.PositiveIntegerField(default=0)
+    file_url = models.TextField(blank=True, null=True)
+    # Storage path of the ZIP; cleared with file_url once the sweeper deletes it
+    file_path = models.CharField(max_length=500, blank=True, default="")
+    error = models.TextField(blank=True, null=True)
+
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def progress(self):
+        """Percentage of documents processed (rendered or failed)."""
+        if not self.total_items:
+            return 100 if self.status in ("DONE", "FAILED") else 0
+        return int((self.completed_items + self.failed_items) * 100 / self.total_items)
+
+    def __str__(self):
+        return f"Bulk export #{self.pk} {self.filters} → {self.format.upper()} ({self.status})"
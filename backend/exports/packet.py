@@ -0,0 +1,151 @@
+"""
+Per-course accreditation packet: the syllabus, its latest approved TOS for
+every term (Prelim to Finals) and the chair's review form in one document.
+
+The parts are rendered like any other export (a part whose DOCX is already
+in the render cache, e.g. pre-rendered on approval, is reused as is),
+merged with docxcompose in one pass and, for PDF, converted in a single
+converter run. Every part starts a new section that keeps its own page
+size, orientation, margins, headers and footers.
+"""
+from copy import deepcopy
+import hashlib
+import itertools
+import os
+import shutil
+import tempfile
+
+from django.core.files.storage import default_storage
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.opc.packuri import PackURI
+from docx.opc.part import PartFactory
+from docx.oxml.ns import qn
+from docxcompose.composer import Composer
+
+from syllabi.models import SRFForm
+from tos.models import TOS
+from .cache import compute_fingerprint, get_cached_document, store_cached_document
+from .converter import convert_docx_to_pdf
+from .pdf_profiles import profile_stamp
+from .renderers import com_initialized, get_export_object, render_docx_file, upload_file
+from .singleflight import single_flight
+
+TERM_ORDER = [term for term, _ in TOS.TERM_CHOICES]
+
+
+def packet_parts(syllabus):
+    """``[(kind, obj), ...]`` in packet order: syllabus, TOS by term, review form."""
+    latest_tos = {}
+    for tos_id, term in (
+        TOS.objects.filter(syllabus=syllabus, chair_approved_at__isnull=False)
+        .order_by("version")
+        .values_list("id", "term")
+    ):
+        latest_tos[term] = tos_id
+
+    parts = [("syllabus", syllabus)]
+    for term in sorted(latest_tos, key=lambda t: TERM_ORDER.index(t) if t in TERM_ORDER else len(TERM_ORDER)):
+        parts.append(("tos", get_export_object("tos", latest_tos[term])))
+
+    review_form_id = SRFForm.objects.filter(syllabus=syllabus).values_list("id", flat=True).first()
+    if review_form_id:
+        parts.append(("review_form", get_export_object("review_form", review_form_id)))
+    return parts
+
+
+def _clone_part(part, reltype, package, counter):
+    """Copy ``part`` and everything it references into ``package`` under fresh part names."""
+    stem = os.path.splitext(os.path.basename(part.partname))[0].rstrip("0123456789")
+    partname = PackURI(f"{part.partname.baseURI}/packet{next(counter)}-{stem}.{part.partname.ext}")
+    clone = PartFactory(partname, part.content_type, reltype, part.blob, package)
+    for rel in part.rels.values():
+        if rel.is_external:
+            clone.load_rel(rel.reltype, rel.target_ref, rel.rId, is_external=True)
+        else:
+            target = _clone_part(rel.target_part, rel.reltype, package, counter)
+            clone.load_rel(rel.reltype, target, rel.rId)
+    return clone
+
+
+def append_section(composer, doc, counter):
+    """Append ``doc`` to the composed document as a new section with its own page setup."""
+    master = composer.doc
+    body = master.element.body
+
+    # Close the current last section: its properties move into a paragraph
+    closing = body.add_p()
+    closing.get_or_add_pPr()._insert_sectPr(deepcopy(body.sectPr))
+
+    # The appended document's properties become the new last section's
+    sect_pr = deepcopy(doc.element.body.sectPr)
+    sect_pr.start_type = WD_SECTION.NEW_PAGE
+    for ref in sect_pr.xpath("w:headerReference|w:footerReference"):
+        rel = doc.part.rels[ref.get(qn("r:id"))]
+        clone = _clone_part(rel.target_part, rel.reltype, master.part.package, counter)
+        ref.set(qn("r:id"), master.part.relate_to(clone, rel.reltype))
+    body.replace(body.sectPr, sect_pr)
+
+    composer.append(doc)
+
+
+def compose_docx(paths, output_path):
+    composer = Composer(Document(paths[0]))
+    counter = itertools.count(1)
+    for path in paths[1:]:
+        append_section(composer, Document(path), counter)
+    composer.save(output_path)
+
+
+def store_packet(syllabus, fmt, profile=""):
+    """
+    Render, merge and store the packet of ``syllabus`` (PDFs with export
+    ``profile``); returns the storage path.
+    """
+    parts = packet_parts(syllabus)
+    fingerprints = [compute_fingerprint(kind, obj) for kind, obj in parts]
+    key = "".join(fingerprints) + (f":{profile}:{profile_stamp(profile)}" if profile else "")
+    fingerprint = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    cached_path = get_cached_document("packet", syllabus, fmt, fingerprint, profile)
+    if cached_path:
+        return cached_path
+
+    # Identical concurrent exports render once; the others wait and reuse the file
+    with single_flight(f"packet:{syllabus.pk}:{fmt}:{fingerprint}"):
+        cached_path = get_cached_document("packet", syllabus, fmt, fingerprint, profile)
+        if cached_path:
+            return cached_path
+
+        course = syllabus.course
+        filename_docx = (
+            f"Packet-{course.course_code}-{course.course_semester.lower()} Semester-"
+            f"{syllabus.bayanihan_group.school_year}.docx"
+        )
+
+        with com_initialized(), tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for index, ((kind, obj), part_fingerprint) in enumerate(zip(parts, fingerprints)):
+                path = os.path.join(tmpdir, f"part{index}.docx")
+                cached_part = get_cached_document(kind, obj, "docx", part_fingerprint)
+                if cached_part:
+                    with default_storage.open(cached_part, "rb") as src, open(path, "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                else:
+                    render_docx_file(kind, obj, path)
+                paths.append(path)
+
+            temp_docx = os.path.join(tmpdir, "packet.docx")
+            compose_docx(paths, temp_docx)
+
+            if fmt == "docx":
+                local_path = temp_docx
+                path = upload_file(temp_docx, f"packets/{filename_docx}")
+            else:
+                # One conversion for the whole packet
+                local_path = os.path.join(tmpdir, "packet.pdf")
+                convert_docx_to_pdf(temp_docx, local_path, profile)
+                path = upload_file(local_path, f"packets/{filename_docx.replace('.docx', '.pdf')}")
+
+            store_cached_document("packet", syllabus, fmt, fingerprint, path, os.path.getsize(local_path), profile)
+    return path
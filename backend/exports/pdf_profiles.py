@@ -0,0 +1,119 @@
+"""
+Named PDF export profiles.
+
+``EXPORT_PDF_PROFILES`` maps a profile name to its options:
+
+- ``jpeg_quality``: JPEG quality (1-100) images are recompressed with
+- ``lossless``: keep images lossless instead (overrides ``jpeg_quality``)
+- ``max_dpi``: downsample images above this resolution (75, 150, 300, 600 or 1200)
+- ``pdfa``: "1b", "2b" or "3b" to produce PDF/A
+- ``linearize``: rewrite the PDF for fast web view with ``qpdf`` (skipped when
+  qpdf isn't installed; LibreOffice itself can't linearize)
+
+The first five become ``writer_pdf_Export`` FilterData. Exports use
+``EXPORT_PDF_DEFAULT_PROFILE`` unless the request names another one
+(``?profile=web``). The profile and its options are part of the render
+cache key, so changing a profile re-renders its PDFs.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILES = {
+    "standard": {"jpeg_quality": 85, "max_dpi": 300, "linearize": True},
+}
+
+PDFA_VERSIONS = {"1b": 1, "2b": 2, "3b": 3}
+
+
+class UnknownProfile(ValueError):
+    pass
+
+
+def profiles():
+    return getattr(settings, "EXPORT_PDF_PROFILES", DEFAULT_PROFILES)
+
+
+def resolve_profile(name=None):
+    """Name of the profile to use: ``name``, or the default when empty."""
+    name = name or getattr(settings, "EXPORT_PDF_DEFAULT_PROFILE", "standard")
+    if name not in profiles():
+        raise UnknownProfile(
+            f"Unknown PDF profile '{name}'. Available: {', '.join(sorted(profiles()))}."
+        )
+    return name
+
+
+def profile_options(name):
+    return profiles()[resolve_profile(name)]
+
+
+def profile_stamp(name):
+    """Short hash of a profile's options, for cache keys."""
+    payload = json.dumps(profile_options(name), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def filter_data(name):
+    """``writer_pdf_Export`` FilterData for a profile, as ``{name: value}``."""
+    options = profile_options(name)
+    data = {}
+    if options.get("lossless"):
+        data["UseLosslessCompression"] = True
+    elif options.get("jpeg_quality"):
+        data["UseLosslessCompression"] = False
+        data["Quality"] = int(options["jpeg_quality"])
+    if options.get("max_dpi"):
+        data["ReduceImageResolution"] = True
+        data["MaxImageResolution"] = int(options["max_dpi"])
+    if options.get("pdfa"):
+        data["SelectPdfVersion"] = PDFA_VERSIONS[str(options["pdfa"]).lower()]
+    return data
+
+
+def filter_options_json(data):
+    """FilterData in the JSON form ``soffice --convert-to pdf:writer_pdf_Export:{...}`` accepts."""
+    def typed(value):
+        if isinstance(value, bool):
+            return {"type": "boolean", "value": "true" if value else "false"}
+        if isinstance(value, int):
+            return {"type": "long", "value": str(value)}
+        return {"type": "string", "value": str(value)}
+
+    return json.dumps({key: typed(value) for key, value in data.items()}, separators=(",", ":"))
+
+
+def linearize(path, name):
+    """Linearize ``path`` in place when the profile asks for it and qpdf is available."""
+    if not profile_options(name).get("linearize"):
+        return
+    binary = shutil.which(getattr(settings, "QPDF_BINARY", "qpdf"))
+    if binary is None:
+        logger.debug("qpdf not installed; %s left unlinearized", path)
+        return
+
+    linearized = f"{path}.linearized"
+    try:
+        result = subprocess.run(
+            [binary, "--linearize", path, linearized],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        # Exit code 3: succeeded with warnings
+        if result.returncode in (0, 3):
+            os.replace(linearized, path)
+        else:
+            logger.warning("qpdf could not linearize %s: %s", path, result.stderr.strip())
+    except subprocess.TimeoutExpired:
+        logger.warning("qpdf timed out linearizing %s", path)
+    finally:
+        if os.path.exists(linearized):
+            os.remove(linearized)
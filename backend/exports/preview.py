@@ -0,0 +1,70 @@
+"""
+Printable HTML previews of syllabi and TOS.
+
+``render_preview`` builds the same snapshot the DOCX export uses
+(``syllabus_render_data`` / ``tos_render_data``) and renders it with a
+Django template instead of docxtpl + LibreOffice. The HTML is cached under
+the document's render fingerprint, so it stays valid until something that
+appears in the export changes.
+"""
+import base64
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import compute_fingerprint
+from .html_docx import sanitize_html
+from .renderers import BUILDERS
+
+PREVIEW_TEMPLATES = {
+    "syllabus": "exports/syllabus_preview.html",
+    "tos": "exports/tos_preview.html",
+}
+
+# Rich text is sanitized (sanitize_html) before it is rendered; the CSP also applies
+# when the preview is opened as a page of its own
+PREVIEW_CSP = "default-src 'none'; img-src data:; style-src 'unsafe-inline'"
+
+
+def signature_data_uri(data):
+    """Normalized signature PNG bytes as an ``<img src>`` value ("" when missing)."""
+    if not data:
+        return ""
+    return "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+
+
+def preview_context(kind, data):
+    context = dict(
+        data["context"],
+        title=data["filename"].rsplit(".", 1)[0],
+        leaders=[
+            dict(leader, signature=signature_data_uri(leader["signature"]))
+            for leader in data["leaders"]
+        ],
+        chair_signature=signature_data_uri(data["chair_signature"]),
+    )
+    if kind == "syllabus":
+        context.update(
+            copo=data["copo"],
+            outline_terms=[
+                ("Midterm", data["context"]["course_outlines_mid"]),
+                ("Finals", data["context"]["course_outlines_final"]),
+            ],
+            course_requirements=mark_safe(sanitize_html(data["course_requirements"])),
+            dean_signature=signature_data_uri(data["dean_signature"]),
+        )
+    return context
+
+
+def render_preview(kind, obj):
+    """HTML preview of ``obj`` ("syllabus" or "tos"), served from the cache when unchanged."""
+    # v2: previews cached before rich text was sanitized are not served again
+    key = f"exports:preview:v2:{kind}:{obj.pk}:{compute_fingerprint(kind, obj)}"
+    html = cache.get(key)
+    if html is None:
+        data = BUILDERS[kind][0](obj)
+        html = render_to_string(PREVIEW_TEMPLATES[kind], preview_context(kind, data))
+        cache.set(key, html, getattr(settings, "EXPORT_PREVIEW_CACHE_TIMEOUT", 60 * 60))
+    return html
@@ -0,0 +1,35 @@
+"""
+Per-stage timing for the export renderers.
+
+Renderers wrap their expensive steps in ``stage("name")``. Outside of
+``record_stages()`` that is a no-op; inside, the elapsed time of every stage
+is added to the dict ``record_stages`` yields (used by ``benchmark_exports``).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+_timings = ContextVar("export_stage_timings", default=None)
+
+
+@contextmanager
+def stage(name):
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+@contextmanager
+def record_stages():
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
@@ -0,0 +1,88 @@
+"""
+Warm process pool for the CPU-bound part of an export.
+
+Building the DOCX (docxtpl render, CO-PO table, rich-text conversion) is pure
+Python and holds the GIL, so in a threaded web worker one large syllabus
+stalls every other request. ``run`` executes that work in a
+``ProcessPoolExecutor`` of ``EXPORT_RENDER_PROCESSES`` children which have
+Django set up and every DOCX template loaded before their first task. Only
+plain data crosses the process boundary; the children never query the
+database.
+
+Children are started with ``spawn``: forking a multi-threaded web worker
+can deadlock. Each child is a full Django process, and every web worker
+starts its own pool, so the pool is opt-in: with the default
+``EXPORT_RENDER_PROCESSES = 0`` the work runs in the calling thread.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import atexit
+import logging
+import multiprocessing
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+    from .template_registry import TEMPLATE_FILES, get_template
+    for kind in TEMPLATE_FILES:
+        try:
+            get_template(kind)
+        except Exception:
+            logger.exception("Could not preload the %s template", kind)
+
+
+def _ping():
+    return True
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """Process-wide render pool (None when disabled), started on first use."""
+    global _pool
+    size = getattr(settings, "EXPORT_RENDER_PROCESSES", 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            # Start every child now so none pays Django/template start-up on a real export
+            for _ in range(size):
+                _pool.submit(_ping)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _discard(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run(fn, *args):
+    """Run ``fn(*args)`` in the render pool; ``fn`` and its arguments must be picklable."""
+    pool = get_render_pool()
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        # A child died (e.g. OOM-killed); the next export starts a fresh pool
+        logger.error("Render process pool broke; restarting it")
+        _discard(pool)
+        raise RuntimeError("A document render process crashed. Please try again.")
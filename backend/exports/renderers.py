@@ -0,0 +1,616 @@
+"""
+Document renderers shared by the synchronous export actions and the
+background export workers.
+
+Each ``render_*`` function takes a model instance and returns the rendered
+``DocxTemplate`` together with the DOCX filename, without touching the
+request. It is split in two: ``*_render_data`` reads the database and the
+signatures into a plain snapshot, ``build_*_docx`` renders that snapshot.
+Stored exports run the build step in the render process pool
+(``render_docx_file``). ``export_document`` stores the result (as DOCX or
+PDF) in ``default_storage`` and returns its public URL.
+"""
+from django.core.files.storage import default_storage
+from django.core.files import File
+from contextlib import contextmanager
+import tempfile
+
+import html as ihtml
+
+from syllabi.models import Syllabus, SRFForm
+from tos.models import TOS
+from . import render_pool
+from .cache import compute_fingerprint, get_cached_document, store_cached_document
+from .converter import convert_docx_batch, convert_docx_to_pdf
+from .docx_tables import copo_table_xml
+from .html_docx import BodyXml, html_to_subdoc
+from .loaders import load_syllabus_export
+from .pdf_profiles import resolve_profile
+from .profiling import stage
+from .signatures import load_signatures, signature_image
+from .singleflight import single_flight, single_flight_many
+from .template_registry import get_template
+
+import os
+import sys
+import platform
+
+if sys.platform == "win32":
+    import pythoncom
+else:
+    pythoncom = None
+
+
+@contextmanager
+def com_initialized():
+    """docx2pdf drives Word over COM, which must be initialized per thread on Windows."""
+    is_windows = platform.system().lower() == "windows"
+    if is_windows and pythoncom is not None:
+        pythoncom.CoInitialize()
+    try:
+        yield
+    finally:
+        if is_windows and pythoncom is not None:
+            pythoncom.CoUninitialize()
+
+
+# Creates Course Outcomes Table in the Syllabus
+def build_copo_table(doc, copo):
+    """``copo`` is ``{"pos": [po_letter, ...], "cos": [(label, [codes per PO]), ...]}``."""
+    return BodyXml(copo_table_xml(copo))
+
+# Preprocesses Course Requirement HTML data
+def preprocess_html(raw_html: str) -> str:
+    """Clean up quirks in HTML exported from Word/TinyMCE."""
+    if not raw_html:
+        return ""
+
+    # Decode entities using html module
+    cleaned = ihtml.unescape(raw_html)
+
+    # Apply PHP-like replacements
+    replacements = [
+        ("andbull;", "•"),   # fix bullet entity
+        ("&bull;", "•"),     # also normal bull
+        ("&nbsp;", ""),      # strip non-breaking spaces
+        ("&", "and"),        # replace stray ampersands
+        ("/n", "<br/>"),     # normalize line breaks
+        ("andrsquo;", "'"),  # right single quote
+        ("andndash;", "-"),  # dash
+    ]
+    for old, new in replacements:
+        cleaned = cleaned.replace(old, new)
+
+    return cleaned
+
+# ---------- Syllabus ----------
+def syllabus_render_data(syllabus):
+    """
+    Plain (picklable) snapshot of everything ``build_syllabus_docx`` needs:
+    template fields, CO-PO grid, course requirements HTML and signature bytes.
+    """
+    # Everything the template needs, in a fixed number of queries
+    data = load_syllabus_export(syllabus.pk)
+    syllabus = data.syllabus
+
+    # ---------- CO–PO grid ----------
+    copo = {
+        "pos": [po.po_letter for po in data.program_outcomes],
+        "cos": [
+            (
+                f"{co.co_code}: {co.co_description}",
+                [
+                    ", ".join(code for code in data.copo_codes.get((co.pk, po.pk), []) if code)
+                    for po in data.program_outcomes
+                ],
+            )
+            for co in data.course_outcomes
+        ],
+    }
+
+    # ---------- Build Course Outline Data ----------
+    outline_rows_mid = []
+    outline_rows_final = []     
+    
+    for outline, co_codes in data.outlines:
+        row = {
+            "allotted_time": f"{outline.allotted_hour or ''} hours, {outline.allotted_time or ''}".strip(),
+            "co_code": co_codes or "",
+            "ilo": outline.intended_learning or "",
+            "topics": outline.topics or "",
+            "readings": outline.suggested_readings or "",
+            "activities": outline.learning_activities or "",
+            "assessment": outline.assessment_tools or "",
+            "grading": outline.grading_criteria or "",
+            "remarks": outline.remarks or "",
+        }
+
+        if outline.syllabus_term == "MIDTERM":
+            outline_rows_mid.append(row)
+        elif outline.syllabus_term == "FINALS":
+            outline_rows_final.append(row)   
+    
+    # --- Bayanihan Leaders ----   
+    leaders = data.leaders
+    chair_sig_url = syllabus.chair.get("signature") if syllabus.chair else None
+    dean_sig_url = syllabus.dean.get("signature") if syllabus.dean else None
+
+    # Fetch every signature for this document in one go
+    with stage("signatures"):
+        *leader_sigs, chair_sig, dean_sig = load_signatures(
+            [getattr(user, "signature", None) for user in leaders] + [chair_sig_url, dean_sig_url]
+        )
+
+    # 2. Prepare context with syllabus fields
+    context = {
+        "version": (
+            f"{int(syllabus.syllabus_template.revision_no):02d}"
+            if syllabus.syllabus_template and syllabus.syllabus_template.revision_no is not None
+            else ""
+        ),
+        "effective_date": syllabus.effective_date.strftime("%m.%d.%y") if syllabus.effective_date else "",
+        "college_description": syllabus.college.college_description if syllabus.college else "",
+        "department_name": syllabus.program.department.department_name if syllabus.program.department else "",
+        "peos": [
+            {"peo_code": peo.peo_code, "peo_description": peo.peo_description} for peo in data.peos
+        ],
+        "pos": [
+            {"po_letter": po.po_letter, "po_description": po.po_description} for po in data.program_outcomes
+        ],
+        "course_title": syllabus.course.course_title,
+        "course_code": syllabus.course.course_code,
+        "course_semester": syllabus.course.course_semester.lower(),
+        "school_year": syllabus.bayanihan_group.school_year,  
+        "course_description": syllabus.course_description,
+        "class_schedules": syllabus.class_schedules,
+        "building_room": syllabus.building_room,
+        "course_pre_req": syllabus.course.course_pre_req,
+        "course_co_req": syllabus.course.course_co_req,
+        "consultation_hours": syllabus.consultation_hours,
+        "consultation_room": syllabus.consultation_room,
+        "consultation_contact": syllabus.consultation_contact,
+        "instructor_names": ", ".join(user.get_full_name() for user in data.instructors),
+        "instructor_emails": ", ".join(user.email for user in data.instructors),
+        "class_contact": syllabus.class_contact,
+        "course_credit_unit": syllabus.course.course_credit_unit,
+        "course_unit_lec": syllabus.course.course_unit_lec,
+        "course_unit_lab": syllabus.course.course_unit_lab,
+        "course_semester": syllabus.course.course_semester,
+
+        "course_outlines_mid": outline_rows_mid, 
+        "course_outlines_final": outline_rows_final, 
+        
+        # Signatories
+        "chair": syllabus.chair.get("name") if syllabus.chair else "",
+        "dept": syllabus.program.department.department_code if syllabus.program.department else "",
+        "dean": syllabus.dean.get("name") if syllabus.dean else "",
+        "college": syllabus.college.college_code if syllabus.college else "",
+    }
+
+    timestamp = syllabus.dean_approved_at.strftime("%Y-%m-%d") if syllabus.dean_approved_at else "NA"
+    return {
+        "revision": syllabus.syllabus_template.revision_no if syllabus.syllabus_template else None,
+        "context": context,
+        "copo": copo,
+        "course_requirements": syllabus.course_requirements or "",
+        "leaders": [
+            {"fname": user.first_name, "lname": user.last_name, "signature": sig}
+            for user, sig in zip(leaders, leader_sigs)
+        ],
+        "chair_signature": chair_sig,
+        "dean_signature": dean_sig,
+        "filename": f"Syllabus-{syllabus.course.course_code}-{syllabus.course.course_semester.lower()} Semester-{syllabus.bayanihan_group.school_year}-{syllabus.status}-{timestamp}.docx",
+    }
+
+
+def build_syllabus_docx(data):
+    """Render ``syllabus_render_data`` output into ``SyllabusTemp.docx``. No database access."""
+    # 1. Load your DOCX template
+    doc = get_template("syllabus", data["revision"])
+    
+    # ---------- Build CO–PO Table ----------  
+    with stage("copo_table"):
+        copo_subdoc = build_copo_table(doc, data["copo"])
+
+    # ---------- Build Course Requirements Data ----------
+    with stage("html"):
+        course_requirements_subdoc = html_to_subdoc(doc, data["course_requirements"])
+
+    context = dict(
+        data["context"],
+        # Special placeholders
+        copo=copo_subdoc,
+        course_requirements=course_requirements_subdoc,
+        leaders=[
+            dict(leader, signature=signature_image(doc, leader["signature"]))
+            for leader in data["leaders"]
+        ],
+        chair_signature=signature_image(doc, data["chair_signature"]),
+        dean_signature=signature_image(doc, data["dean_signature"]),
+    )
+
+    # 3. Render the DOCX with data
+    with stage("render"):
+        doc.render(context)
+    return doc
+
+
+def render_syllabus_docx(syllabus):
+    """Render the syllabus into ``SyllabusTemp.docx``; returns ``(doc, filename_docx)``."""
+    data = syllabus_render_data(syllabus)
+    return build_syllabus_docx(data), data["filename"]
+
+
+# ---------- TOS ----------
+def tos_render_data(tos):
+    """Plain (picklable) snapshot of everything ``build_tos_docx`` needs."""
+    # ---------- Get Course Outcomes of Syllabus Associated with TOS ----------
+    course_outcomes = []
+    if tos.syllabus:
+        for co in tos.syllabus.course_outcomes.all():
+            course_outcomes.append({
+                "co_code": co.co_code,
+                "co_description": co.co_description,
+            }) 
+    
+     # ---------- Build Course Outline ---------- 
+    tos_rows = []
+    
+    # Initialize totals
+    totals = {
+        "total_hours": 0,
+        "total_percent": 0,
+        "total_items": 0,
+        "total_col1": 0,
+        "total_col2": 0,
+        "total_col3": 0,
+        "total_col4": 0,
+    }
+    
+    for row in tos.tos_rows.all():
+        # Convert to float/int safely
+        no_hours = int(row.no_hours or 0)
+        percent = int(row.percent or 0)
+        no_items = int(row.no_items or 0)
+        col1_value = int(row.col1_value or 0)
+        col2_value = int(row.col2_value or 0)
+        col3_value = int(row.col3_value or 0)
+        col4_value = int(row.col4_value or 0)
+
+        # Append row
+        tos_rows.append({
+            "topic": row.topic or "",
+            "no_hours": no_hours,
+            "percent": percent,
+            "no_items": no_items,
+            "col1_value": col1_value,
+            "col2_value": col2_value,
+            "col3_value": col3_value,
+            "col4_value": col4_value,
+        })
+
+        # Add to totals
+        totals["total_hours"] += no_hours
+        totals["total_percent"] += percent
+        totals["total_items"] += no_items
+        totals["total_col1"] += col1_value
+        totals["total_col2"] += col2_value
+        totals["total_col3"] += col3_value
+        totals["total_col4"] += col4_value
+    
+    def safe_percentage(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0    
+    
+    # --- Leaders ---
+    leaders = [
+        m for m in tos.bayanihan_group.bayanihan_members.all()
+        if m.role == "LEADER"
+    ]
+    chair_sig_url = tos.chair.get("signature") if tos.chair else None
+
+    # Fetch every signature for this document in one go
+    with stage("signatures"):
+        *leader_sigs, chair_sig = load_signatures(
+            [getattr(m.user, "signature", None) for m in leaders] + [chair_sig_url]
+        )
+
+    def checkbox(term_name, current_term):
+        return "✓" if current_term and current_term.lower() == term_name.lower() else ""
+
+    # 2. Prepare context with TOS fields
+    context = {
+        "version": (
+            f"{int(tos.tos_template.revision_no):02d}"
+            if tos.tos_template and tos.tos_template.revision_no is not None
+            else ""
+        ),
+        "effective_date": tos.effective_date.strftime("%m.%d.%y") if tos.effective_date else "",
+        "course_code": getattr(tos.course, "course_code", ""),
+        "course_title": getattr(tos.course, "course_title", ""),
+        "school_year": getattr(tos.bayanihan_group, "school_year", ""),
+        "course_semester": getattr(tos.course, "course_semester", "").lower(),
+        "tos_cpys": tos.tos_cpys or "",
+        "chair_submitted_at": tos.chair_submitted_at.strftime("%B %d, %Y") if tos.chair_submitted_at else "",
+        "course_outcomes": course_outcomes,
+        "col1_percentage": safe_percentage(tos.col1_percentage),
+        "col2_percentage": safe_percentage(tos.col2_percentage),
+        "col3_percentage": safe_percentage(tos.col3_percentage),
+        "col4_percentage": safe_percentage(tos.col4_percentage),
+        "tos_rows": tos_rows,
+        "totals": totals, 
+        
+        "prelim_box": checkbox("Prelim", tos.term),
+        "midterm_box": checkbox("Midterm", tos.term),
+        "semifinal_box": checkbox("Semi-Finals", tos.term),
+        "final_box": checkbox("Finals", tos.term),
+        
+        # Signatories 
+        "chair": tos.chair.get("name") if tos.chair else "",
+    }
+
+    timestamp = tos.chair_approved_at.strftime("%Y-%m-%d") if tos.chair_approved_at else "NA"
+    return {
+        "revision": tos.tos_template.revision_no if tos.tos_template else None,
+        "context": context,
+        "leaders": [
+            {"fname": m.user.first_name, "lname": m.user.last_name, "signature": sig}
+            for m, sig in zip(leaders, leader_sigs)
+        ],
+        "chair_signature": chair_sig,
+        "filename": (
+            f"TOS-{tos.term}-{tos.course.course_code}-"
+            f"{tos.course.course_semester.lower()} Semester-"
+            f"{tos.bayanihan_group.school_year}-{tos.status}-{timestamp}.docx"
+        ),
+    }
+
+
+def build_tos_docx(data):
+    """Render ``tos_render_data`` output into ``TOSTemplate.docx``. No database access."""
+    doc = get_template("tos", data["revision"])
+    context = dict(
+        data["context"],
+        leaders=[
+            dict(leader, signature=signature_image(doc, leader["signature"]))
+            for leader in data["leaders"]
+        ],
+        chair_signature=signature_image(doc, data["chair_signature"]),
+    )
+
+    # 3. Render the DOCX with data
+    with stage("render"):
+        doc.render(context)
+    return doc
+
+
+def render_tos_docx(tos):
+    """Render the TOS into ``TOSTemplate.docx``; returns ``(doc, filename_docx)``."""
+    data = tos_render_data(tos)
+    return build_tos_docx(data), data["filename"]
+
+
+# ---------- Syllabus Review Form ----------
+def review_form_render_data(review_form):
+    """Plain (picklable) snapshot of everything ``build_review_form_docx`` needs."""
+    template = review_form.form_template
+
+    # 2️⃣ Fill in context in DOCX (simple replacement for placeholders)
+    revision_no = (
+        f"{int(review_form.form_template.revision_no):02d}"
+        if review_form.form_template and review_form.form_template.revision_no is not None
+        else ""
+    )
+    effective_date = (
+        review_form.form_template.effective_date.strftime("%m.%d.%y")
+        if review_form.form_template and review_form.form_template.effective_date
+        else ""
+    )
+
+    context = {
+        "revision_no": revision_no,
+        "effective_date": effective_date,
+    }
+
+    timestamp = review_form.review_date.strftime("%Y-%m-%d") if review_form.review_date else "NA"
+    action_str = "APPROVED" if review_form.action == SRFForm.Action.APPROVED else "REJECTED"
+    return {
+        "revision": template.revision_no if template else None,
+        "context": context,
+        "filename": f"ReviewForm-{review_form.syllabus.course.course_code}-{action_str}-{timestamp}.docx",
+    }
+
+
+def build_review_form_docx(data):
+    """Render ``review_form_render_data`` output into ``ReviewFormHeaderTemp.docx``."""
+    # 1️⃣ Load DOCX template
+    doc = get_template("review_form", data["revision"])
+    with stage("render"):
+        doc.render(data["context"])
+    return doc
+
+
+def render_review_form_docx(review_form):
+    """Render the SRF header into ``ReviewFormHeaderTemp.docx``; returns ``(doc, filename_docx)``."""
+    data = review_form_render_data(review_form)
+    return build_review_form_docx(data), data["filename"]
+
+
+# kind -> (model, renderer, storage prefix)
+RENDERERS = {
+    "syllabus": (Syllabus, render_syllabus_docx, "syllabi"),
+    "tos": (TOS, render_tos_docx, "tos"),
+    "review_form": (SRFForm, render_review_form_docx, "review_forms"),
+}
+
+# kind -> (plain snapshot of the object, DOCX builder run on that snapshot)
+BUILDERS = {
+    "syllabus": (syllabus_render_data, build_syllabus_docx),
+    "tos": (tos_render_data, build_tos_docx),
+    "review_form": (review_form_render_data, build_review_form_docx),
+}
+
+
+def build_docx_file(kind, data, path):
+    """Render-pool task: build the DOCX from its snapshot and save it to ``path``."""
+    BUILDERS[kind][1](data).save(path)
+    return path
+
+
+def render_docx_file(kind, obj, path):
+    """
+    Render ``obj`` into the DOCX file ``path`` and return its export filename.
+    Queries and signature loading happen here; the CPU-bound build runs in
+    the render process pool.
+    """
+    data = BUILDERS[kind][0](obj)
+    render_pool.run(build_docx_file, kind, data, path)
+    return data["filename"]
+
+
+def get_export_object(kind, object_id):
+    """Load the source object of an export with the relations the renderer walks."""
+    if kind == "packet":
+        kind = "syllabus"  # a packet is exported from its syllabus
+    model = RENDERERS[kind][0]
+    qs = model.objects.all()
+    if kind == "syllabus":
+        qs = qs.select_related(
+            "syllabus_template", "bayanihan_group", "course", "college", "program__department"
+        )
+    elif kind == "tos":
+        qs = qs.select_related("tos_template", "syllabus", "bayanihan_group", "course")
+    elif kind == "review_form":
+        qs = qs.select_related("form_template", "syllabus__course")
+    return qs.get(pk=object_id)
+
+
+def export_document(kind, obj, fmt, profile=None):
+    """
+    Render ``obj`` and upload it to ``default_storage`` as ``fmt`` ("docx" or "pdf").
+    PDFs are converted with the export ``profile`` (default profile when None).
+    Returns the public URL of the stored file.
+    """
+    return default_storage.url(store_document(kind, obj, fmt, profile))
+
+
+def upload_file(local_path, name):
+    """Stream a local file into ``default_storage`` as ``name``; returns the storage path."""
+    with open(local_path, "rb") as f:
+        return default_storage.save(name, File(f, name=os.path.basename(name)))
+
+
+def store_document(kind, obj, fmt, profile=None):
+    """Like ``export_document`` but returns the storage path of the file."""
+    profile = resolve_profile(profile) if fmt == "pdf" else ""
+    if kind == "packet":
+        from .packet import store_packet  # packet.py builds on this module
+        return store_packet(obj, fmt, profile)
+
+    prefix = RENDERERS[kind][2]
+
+    # Unchanged source + template (+ PDF profile) → reuse the stored file
+    fingerprint = compute_fingerprint(kind, obj, profile)
+    cached_path = get_cached_document(kind, obj, fmt, fingerprint, profile)
+    if cached_path:
+        return cached_path
+
+    # Identical concurrent exports render once; the others wait and reuse the file
+    with single_flight(f"{kind}:{obj.pk}:{fmt}:{fingerprint}"):
+        cached_path = get_cached_document(kind, obj, fmt, fingerprint, profile)
+        if cached_path:
+            return cached_path
+
+        # Use a temp directory so we can run LibreOffice/win32com conversion
+        with com_initialized(), tempfile.TemporaryDirectory() as tmpdir:
+            temp_docx = os.path.join(tmpdir, "document.docx")
+            filename_docx = render_docx_file(kind, obj, temp_docx)
+
+            if fmt == "docx":
+                local_path = temp_docx
+                path = upload_file(temp_docx, f"{prefix}/{filename_docx}")
+            else:
+                # Convert DOCX -> PDF
+                local_path = os.path.join(tmpdir, "document.pdf")
+                convert_docx_to_pdf(temp_docx, local_path, profile)
+
+                # Upload to DigitalOcean Spaces, streaming from the temp file
+                path = upload_file(local_path, f"{prefix}/{filename_docx.replace('.docx', '.pdf')}")
+
+            store_cached_document(kind, obj, fmt, fingerprint, path, os.path.getsize(local_path), profile)
+    return path
+
+
+def store_documents(items, fmt, profile=None):
+    """
+    Batch form of ``store_document`` for ``[(kind, obj), ...]``.
+
+    Cache hits are returned as is; the misses are rendered under their
+    single-flight locks, and all PDFs of the batch go through one
+    ``convert_docx_batch`` call (one converter lease). Returns a storage
+    path or the exception raised, per item.
+    """
+    results = [None] * len(items)
+    misses = []
+    pending = []
+    profile = resolve_profile(profile) if fmt == "pdf" else ""
+
+    for index, (kind, obj) in enumerate(items):
+        try:
+            fingerprint = compute_fingerprint(kind, obj, profile)
+            cached_path = get_cached_document(kind, obj, fmt, fingerprint, profile)
+            if cached_path:
+                results[index] = cached_path
+            else:
+                misses.append((index, kind, obj, fingerprint))
+        except Exception as e:
+            results[index] = e
+
+    # Same keys as store_document, so a batch and an interactive export of
+    # one document render it once; whoever waited picks up the stored file
+    keys = (f"{kind}:{obj.pk}:{fmt}:{fingerprint}" for _, kind, obj, fingerprint in misses)
+    with single_flight_many(keys), com_initialized(), tempfile.TemporaryDirectory() as tmpdir:
+        for index, kind, obj, fingerprint in misses:
+            try:
+                cached_path = get_cached_document(kind, obj, fmt, fingerprint, profile)
+                if cached_path:
+                    results[index] = cached_path
+                    continue
+
+                prefix = RENDERERS[kind][2]
+                # Index-based temp names keep LibreOffice's output names unique
+                temp_docx = os.path.join(tmpdir, f"{index}.docx")
+                filename_docx = render_docx_file(kind, obj, temp_docx)
+                if fmt == "docx":
+                    results[index] = upload_file(temp_docx, f"{prefix}/{filename_docx}")
+                    store_cached_document(kind, obj, fmt, fingerprint, results[index], os.path.getsize(temp_docx))
+                    continue
+
+                pending.append((index, kind, obj, fingerprint, f"{prefix}/{filename_docx.replace('.docx', '.pdf')}"))
+            except Exception as e:
+                results[index] = e
+
+        conversions = convert_docx_batch(
+            (
+                (os.path.join(tmpdir, f"{index}.docx"), os.path.join(tmpdir, f"{index}.pdf"))
+                for index, *_ in pending
+            ),
+            profile,
+        )
+        for (index, kind, obj, fingerprint, name), conversion in zip(pending, conversions):
+            if conversion["error"]:
+                results[index] = RuntimeError(conversion["error"])
+                continue
+            try:
+                with open(conversion["output"], "rb") as f:
+                    pdf_path = default_storage.save(name, File(f, name=os.path.basename(name)))
+                store_cached_document(
+                    kind, obj, fmt, fingerprint, pdf_path, os.path.getsize(conversion["output"]), profile
+                )
+                results[index] = pdf_path
+            except Exception as e:
+                results[index] = e
+
+    return results
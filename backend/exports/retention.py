@@ -0,0 +1,212 @@
+"""
+Retention for generated export files.
+
+Every stored export has a ``RenderedDocument`` row. A row is *superseded*
+once its source changed or a newer render of the same document replaced it,
+and *expired* once no export has been served from it for
+``EXPORT_ARTIFACT_RETENTION_DAYS``. ``sweep`` deletes the files and rows of
+both, in batches; superseded files are kept for
+``EXPORT_SUPERSEDED_GRACE_HOURS`` first, so links handed out just before a
+change keep working for a while.
+
+``sweep_bulk_exports`` deletes bulk export ZIPs ``EXPORT_BULK_RETENTION_DAYS``
+after they finished.
+
+``sweep_orphans`` deletes untracked files under the export prefixes, but
+only ones stored since artifacts were tracked (``tracked_since``): files
+exported before that have no row, yet their URLs were handed out and saved
+in jobs and notifications.
+"""
+from datetime import datetime, timedelta
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import BulkExport, RenderedDocument
+from .renderers import RENDERERS
+
+logger = logging.getLogger(__name__)
+
+# Storage prefix each kind of export is uploaded under
+ARTIFACT_PREFIXES = dict(
+    {kind: prefix for kind, (_, _, prefix) in RENDERERS.items()},
+    packet="packets",
+)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def sweepable(now=None):
+    """Artifacts whose files may be deleted now."""
+    now = now or timezone.now()
+    superseded_before = now - timedelta(hours=_setting("EXPORT_SUPERSEDED_GRACE_HOURS", 24))
+    unused_since = now - timedelta(days=_setting("EXPORT_ARTIFACT_RETENTION_DAYS", 30))
+    return RenderedDocument.objects.filter(
+        Q(superseded_at__lt=superseded_before) | Q(last_used_at__lt=unused_since)
+    )
+
+
+def _delete_file(path):
+    try:
+        default_storage.delete(path)
+        return True
+    except Exception:
+        logger.exception("Could not delete export file %s", path)
+        return False
+
+
+def sweep(batch_size=None, limit=None, dry_run=False):
+    """
+    Delete sweepable artifacts ``batch_size`` at a time (at most ``limit``).
+    Returns ``{"artifacts": n, "bytes": n, "failed": n}``.
+
+    Rows are claimed and deleted in one short transaction before their files
+    are removed, so an export can no longer be served from a file that is
+    about to disappear. A file that cannot be deleted is logged and left
+    behind (``--orphans`` picks it up later).
+    """
+    batch_size = batch_size or _setting("EXPORT_SWEEP_BATCH_SIZE", 200)
+    totals = {"artifacts": 0, "bytes": 0, "failed": 0}
+    last_pk = 0
+
+    while limit is None or totals["artifacts"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - totals["artifacts"])
+        with transaction.atomic():
+            batch = list(
+                sweepable()
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .select_for_update(skip_locked=True)
+                .values_list("pk", "file_path", "size")[:size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            if not dry_run:
+                RenderedDocument.objects.filter(pk__in=[pk for pk, _, _ in batch]).delete()
+
+        for _, path, file_size in batch:
+            if dry_run or _delete_file(path):
+                totals["artifacts"] += 1
+                totals["bytes"] += file_size
+            else:
+                totals["failed"] += 1
+    return totals
+
+
+def sweep_bulk_exports(dry_run=False):
+    """
+    Delete the ZIPs of bulk exports finished more than ``EXPORT_BULK_RETENTION_DAYS``
+    ago and clear their ``file_url``. Returns ``{"files": n, "bytes": n, "failed": n}``.
+    """
+    finished_before = timezone.now() - timedelta(days=_setting("EXPORT_BULK_RETENTION_DAYS", 7))
+    totals = {"files": 0, "bytes": 0, "failed": 0}
+
+    expired = BulkExport.objects.filter(finished_at__lt=finished_before).exclude(file_path="")
+    for bulk in expired.only("pk", "file_path").iterator():
+        try:
+            size = default_storage.size(bulk.file_path)
+        except Exception:
+            size = 0  # already gone
+        if dry_run:
+            totals["files"] += 1
+            totals["bytes"] += size
+        elif not size or _delete_file(bulk.file_path):
+            BulkExport.objects.filter(pk=bulk.pk).update(file_url=None, file_path="", updated_at=timezone.now())
+            totals["files"] += 1
+            totals["bytes"] += size
+        else:
+            totals["failed"] += 1
+    return totals
+
+
+def tracked_since():
+    """
+    When exports started getting a ``RenderedDocument`` row: ``EXPORT_ORPHANS_TRACKED_SINCE``
+    if set, otherwise when the migration creating the table was applied (None if unknown).
+    """
+    since = _setting("EXPORT_ORPHANS_TRACKED_SINCE", None)
+    if isinstance(since, str):
+        since = parse_datetime(since)
+    recorder = MigrationRecorder(connection)
+    if since is None and recorder.has_table():
+        since = (
+            recorder.migration_qs.filter(app="exports", name="0002_rendereddocument")
+            .values_list("applied", flat=True)
+            .first()
+        )
+    if isinstance(since, datetime) and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def sweep_orphans(prefixes=None, dry_run=False):
+    """
+    Delete files under the export prefixes that no artifact refers to (whose
+    row was lost). Only files stored after ``tracked_since()`` and older than
+    the superseded grace period are touched; earlier exports never had a row.
+    Returns ``{"files": n, "bytes": n, "paths": [...]}``.
+    """
+    cutoff = timezone.now() - timedelta(hours=_setting("EXPORT_SUPERSEDED_GRACE_HOURS", 24))
+    totals = {"files": 0, "bytes": 0, "paths": []}
+    since = tracked_since()
+    if since is None:
+        logger.warning("Not sweeping untracked export files: unknown when export tracking started")
+        return totals
+
+    for prefix in prefixes or sorted(set(ARTIFACT_PREFIXES.values())):
+        try:
+            _, names = default_storage.listdir(prefix)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        batch_size = _setting("EXPORT_SWEEP_BATCH_SIZE", 200)
+        for start in range(0, len(names), batch_size):
+            paths = [f"{prefix}/{name}" for name in names[start:start + batch_size]]
+            known = set(
+                RenderedDocument.objects.filter(file_path__in=paths).values_list("file_path", flat=True)
+            )
+            for path in paths:
+                if path in known:
+                    continue
+                modified = default_storage.get_modified_time(path)
+                if modified < since or modified >= cutoff:
+                    continue
+                size = default_storage.size(path)
+                if dry_run or _delete_file(path):
+                    totals["files"] += 1
+                    totals["bytes"] += size
+                    totals["paths"].append(path)
+    return totals
+
+
+def storage_usage():
+    """
+    Storage held by export artifacts, per prefix:
+    ``[{"prefix", "files", "bytes", "superseded_files", "superseded_bytes"}, ...]``.
+    """
+    fields = ("files", "bytes", "superseded_files", "superseded_bytes")
+    superseded = Q(superseded_at__isnull=False)
+    usage = {}
+    for prefix in sorted(set(ARTIFACT_PREFIXES.values())):
+        usage[prefix] = dict({"prefix": prefix}, **dict.fromkeys(fields, 0))
+
+    for row in RenderedDocument.objects.values("kind").annotate(
+        files=Count("id"),
+        bytes=Sum("size"),
+        superseded_files=Count("id", filter=superseded),
+        superseded_bytes=Sum("size", filter=superseded),
+    ):
+        prefix = ARTIFACT_PREFIXES.get(row["kind"], row["kind"])
+        entry = usage.setdefault(prefix, dict({"prefix": prefix}, **dict.fromkeys(fields, 0)))
+        for key in fields:
+            entry[key] += row[key] or 0
+    return list(usage.values())
@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from .models import ExportJob, BulkExport
+
+class ExportJobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "kind",
+            "object_id",
+            "format",
+            "profile",
+            "status",
+            "file_url",
+            "error",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class BulkExportSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = BulkExport
+        fields = [
+            "id",
+            "filters",
+            "format",
+            "status",
+            "total_items",
+            "completed_items",
+            "failed_items",
+            "progress",
+            "file_url",
+            "error",
+            "started_at",
+            "finished_at",
+            "created_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from syllabi.models import (
+    Syllabus,
+    SyllabusCourseOutcome,
+    SyllabusCourseOutline,
+    SyllabusCotCo,
+    SyllCoPo,
+    SRFForm,
+)
+from tos.models import TOS, TOSRow
+from .cache import invalidate
+
+
+def invalidate_syllabus(syllabus_id):
+    invalidate("syllabus", syllabus_id)
+    # TOS documents print the syllabus course outcomes
+    for tos_id in TOS.objects.filter(syllabus_id=syllabus_id).values_list("id", flat=True):
+        invalidate("tos", tos_id)
+
+
+@receiver([post_save, post_delete], sender=Syllabus)
+def syllabus_changed(sender, instance, **kwargs):
+    invalidate_syllabus(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=SyllabusCourseOutline)
+@receiver([post_save, post_delete], sender=SyllabusCourseOutcome)
+@receiver([post_save, post_delete], sender=SyllCoPo)
+def syllabus_part_changed(sender, instance, **kwargs):
+    invalidate_syllabus(instance.syllabus_id)
+
+
+@receiver([post_save, post_delete], sender=SyllabusCotCo)
+def syllabus_cotco_changed(sender, instance, **kwargs):
+    syllabus_id = (
+        SyllabusCourseOutline.objects.filter(pk=instance.course_outline_id)
+        .values_list("syllabus_id", flat=True)
+        .first()
+    )
+    if syllabus_id:
+        invalidate_syllabus(syllabus_id)
+
+
+@receiver([post_save, post_delete], sender=TOS)
+def tos_changed(sender, instance, **kwargs):
+    invalidate("tos", instance.pk)
+
+
+@receiver([post_save, post_delete], sender=TOSRow)
+def tos_row_changed(sender, instance, **kwargs):
+    invalidate("tos", instance.tos_id)
+
+
+@receiver([post_save, post_delete], sender=SRFForm)
+def review_form_changed(sender, instance, **kwargs):
+    invalidate("review_form", instance.pk)
@@ -0,0 +1,135 @@
+"""
+Signature images for document exports.
+
+Signatures are read straight from ``default_storage`` instead of being
+downloaded over HTTP from our own media URL. ``User.signature`` is used as
+is; the ``dean``/``chair`` JSON snapshots store an absolute URL, which is
+mapped back to its storage key. Images are normalized once (RGBA PNG,
+bounded width) and kept in a size-bounded in-memory LRU, so repeated exports
+of documents with the same signatories don't touch storage at all.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+import io
+import threading
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from docxtpl import InlineImage
+from docx.shared import Mm
+from PIL import Image
+
+# Signatures are printed at 20mm wide; anything past this is wasted bytes
+MAX_SIGNATURE_WIDTH = 600
+
+
+class SignatureCache:
+    """Thread-safe LRU of normalized PNG bytes, bounded by total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+_cache = SignatureCache(getattr(settings, "SIGNATURE_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+
+def storage_key(ref):
+    """
+    Storage key for a signature reference: a ``FieldFile`` (``User.signature``)
+    or the absolute/relative media URL kept in the dean/chair snapshots.
+    """
+    if not ref:
+        return None
+    name = getattr(ref, "name", None)
+    if name:
+        return name
+
+    path = unquote(urlsplit(str(ref)).path)
+    for prefix in (unquote(urlsplit(default_storage.url("")).path), settings.MEDIA_URL):
+        if prefix and path.startswith(prefix):
+            return path[len(prefix):].lstrip("/") or None
+    return None
+
+
+def normalize_image(raw):
+    """Re-encode as PNG and cap the width; unreadable files yield None."""
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            if image.width > MAX_SIGNATURE_WIDTH:
+                height = round(image.height * MAX_SIGNATURE_WIDTH / image.width)
+                image = image.resize((MAX_SIGNATURE_WIDTH, height), Image.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, format="PNG", optimize=True)
+            return out.getvalue()
+    except (OSError, ValueError):
+        return None
+
+
+def load_signature(ref):
+    """Normalized PNG bytes for a signature reference, or None if it can't be read."""
+    key = storage_key(ref)
+    if not key:
+        return None
+
+    data = _cache.get(key)
+    if data is not None:
+        return data
+
+    try:
+        with default_storage.open(key, "rb") as f:
+            raw = f.read()
+    except (OSError, ValueError):
+        return None
+
+    data = normalize_image(raw)
+    if data is not None:
+        _cache.put(key, data)
+    return data
+
+
+def load_signatures(refs):
+    """Load several signatures concurrently; results keep the order of ``refs``."""
+    refs = list(refs)
+    if len(refs) <= 1:
+        return [load_signature(ref) for ref in refs]
+    with ThreadPoolExecutor(max_workers=min(len(refs), 8)) as pool:
+        return list(pool.map(load_signature, refs))
+
+
+def signature_image(doc, data, width=Mm(20)):
+    """``InlineImage`` for the template, or "" when the signatory has no signature."""
+    if not data:
+        return ""
+    return InlineImage(doc, io.BytesIO(data), width=width)
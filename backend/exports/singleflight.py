@@ -0,0 +1,112 @@
+"""
+Single-flight coalescing of identical exports.
+
+A double-clicked export, or chair and dean opening the same syllabus at
+once, would otherwise render and convert the same document several times.
+``single_flight(key)`` lets one caller per key do the work while the others
+wait for it; callers re-check the render cache once they hold the lock and
+so pick up the file the first one stored. Batches take the locks of all
+their keys at once with ``single_flight_many``.
+
+On MySQL the lock is a ``GET_LOCK`` named lock, which every worker on every
+node shares. Other databases (SQLite in development) fall back to the
+host-wide lock files of ``exports.admission``.
+"""
+from contextlib import ExitStack, contextmanager
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .admission import FileSlots, wait_budget
+
+logger = logging.getLogger(__name__)
+
+# Lock files used by the non-MySQL fallback; unrelated keys may share one
+LOCK_FILE_STRIPES = 64
+
+
+def _lock_name(key):
+    # MySQL lock names are limited to 64 characters
+    return "syllabease-export-" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _lock_for(key):
+    """``(lock, name)`` guarding ``key``; keys sharing a lock file get the same name."""
+    name = _lock_name(key)
+    if connection.vendor == "mysql":
+        return _mysql_lock, name
+    return _file_lock, f"export-{int(name[-8:], 16) % LOCK_FILE_STRIPES}"
+
+
+def _default_timeout():
+    # Interactive exports wait no longer than their admission deadline
+    return wait_budget(getattr(settings, "EXPORT_SINGLE_FLIGHT_TIMEOUT", 120))
+
+
+@contextmanager
+def _mysql_lock(name, timeout):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", [name, int(timeout)])
+        acquired = cursor.fetchone()[0] == 1
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", [name])
+
+
+@contextmanager
+def _file_lock(name, timeout):
+    slots = FileSlots(name, 1)
+    slot = slots.acquire(timeout)
+    try:
+        yield slot is not None
+    finally:
+        if slot is not None:
+            slots.release(slot)
+
+
+@contextmanager
+def single_flight(key, timeout=None):
+    """
+    Hold the export lock for ``key`` while the body runs, waiting up to
+    ``timeout`` seconds (``EXPORT_SINGLE_FLIGHT_TIMEOUT``) for another holder
+    to finish. When the wait times out the body runs anyway, unlocked: a
+    duplicate render is better than a failed export.
+    """
+    if timeout is None:
+        timeout = _default_timeout()
+    lock, name = _lock_for(key)
+
+    with lock(name, timeout) as acquired:
+        if not acquired:
+            logger.warning("Export %s still locked after %ss; rendering without the lock", key, timeout)
+        yield
+
+
+@contextmanager
+def single_flight_many(keys, timeout=None):
+    """
+    ``single_flight`` for every key of a batch at once, all waits together
+    bounded by ``timeout``. Locks are taken in name order so two batches
+    never wait on each other, and keys sharing a lock take it once.
+    """
+    if timeout is None:
+        timeout = _default_timeout()
+    deadline = time.monotonic() + timeout
+    locks = {}
+    for key in keys:
+        lock, name = _lock_for(key)
+        locks.setdefault(name, (lock, key))
+
+    with ExitStack() as stack:
+        for name in sorted(locks):
+            lock, key = locks[name]
+            wait = max(deadline - time.monotonic(), 0)
+            if not stack.enter_context(lock(name, wait)):
+                logger.warning("Export %s still locked after %ss; rendering without the lock", key, timeout)
+        yield
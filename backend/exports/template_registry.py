@@ -0,0 +1,67 @@
+"""
+Process-wide registry of the DOCX export templates.
+
+Each template file is read once per worker and kept in memory as raw bytes;
+``get_template`` hands every render its own ``DocxTemplate`` over an
+in-memory stream, so exports no longer hit the disk for the template. An
+entry is reloaded when the file on disk changes (mtime/size) or when the
+caller passes a different DB revision than the one it was loaded for.
+"""
+import io
+import os
+import threading
+
+from django.conf import settings
+from docxtpl import DocxTemplate
+
+TEMPLATE_FILES = {
+    "syllabus": os.path.join("syllabi", "templates", "SyllabusTemp.docx"),
+    "tos": os.path.join("tos", "templates", "TOSTemplate.docx"),
+    "review_form": os.path.join("syllabi", "templates", "ReviewFormHeaderTemp.docx"),
+}
+
+
+def template_path(kind):
+    return os.path.join(settings.BASE_DIR, TEMPLATE_FILES[kind])
+
+
+def template_file_stamp(kind):
+    """mtime + size of the DOCX template, so replacing the file on disk is noticed."""
+    try:
+        stat = os.stat(template_path(kind))
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class TemplateRegistry:
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get_bytes(self, kind, revision=None):
+        stamp = template_file_stamp(kind)
+        key = (stamp, revision)
+        with self.lock:
+            entry = self.entries.get(kind)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+
+        with open(template_path(kind), "rb") as f:
+            data = f.read()
+
+        with self.lock:
+            self.entries[kind] = (key, data)
+        return data
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+registry = TemplateRegistry()
+
+
+def get_template(kind, revision=None):
+    """Fresh ``DocxTemplate`` for ``kind`` backed by the cached template bytes."""
+    return DocxTemplate(io.BytesIO(registry.get_bytes(kind, revision)))
@@ -0,0 +1,6 @@
+from rest_framework.throttling import UserRateThrottle
+
+
+class ExportRateThrottle(UserRateThrottle):
+    """Per-user limit on the export actions (``DEFAULT_THROTTLE_RATES["exports"]``)."""
+    scope = "exports"
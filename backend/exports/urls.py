@@ -0,0 +1,9 @@
+from rest_framework.routers import DefaultRouter
+from .views import ExportJobViewSet, BulkExportViewSet, ExportStorageViewSet
+
+router = DefaultRouter()
+router.register(r"export-jobs", ExportJobViewSet, basename="export-jobs")
+router.register(r"bulk-exports", BulkExportViewSet, basename="bulk-exports")
+router.register(r"export-storage", ExportStorageViewSet, basename="export-storage")
+
+urlpatterns = router.urls
@@ -0,0 +1,154 @@
+from contextlib import nullcontext
+
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, Throttled, ValidationError
+from rest_framework.response import Response
+from django.http import HttpResponse, JsonResponse
+
+from users.access import get_access
+from users.permissions import RolePermission
+from .admission import ConversionBusy, admit_export
+from .bulk import enqueue_bulk_export
+from .delivery import file_response
+from .jobs import enqueue_export
+from .models import ExportJob, BulkExport
+from .pdf_profiles import UnknownProfile, resolve_profile
+from .preview import PREVIEW_CSP, render_preview
+from .retention import storage_usage
+from .renderers import export_document, store_document
+from .serializers import ExportJobSerializer, BulkExportSerializer
+
+
+class ExportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status/result endpoint for queued exports. Users only see their own jobs."""
+    serializer_class = ExportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        qs = ExportJob.objects.filter(user=self.request.user)
+
+        job_status = self.request.GET.get("status")
+        if job_status:
+            qs = qs.filter(status=job_status.upper())
+
+        return qs.order_by("-created_at")
+
+    @action(detail=True, methods=["get"])
+    def result(self, request, pk=None):
+        job = self.get_object()
+
+        if job.status == "DONE":
+            url_key = "pdf_url" if job.format == "pdf" else "docx_url"
+            return Response({url_key: job.file_url}, status=status.HTTP_200_OK)
+        if job.status == "FAILED":
+            return Response(
+                {"detail": "Export failed.", "error": job.error},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        # Still queued or running
+        return Response(ExportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class BulkExportViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    POST queues a ZIP of every approved syllabus (with its TOS and review
+    form) matching ``college``, ``department``, ``school_year`` and
+    ``semester``; GET returns the job with its progress.
+    Deans are limited to their college and chairpersons to their department.
+    """
+    serializer_class = BulkExportSerializer
+    permission_classes = [RolePermission("ADMIN", "DEAN", "CHAIRPERSON", "AUDITOR")]
+
+    FILTER_FIELDS = ["college", "department", "school_year", "semester"]
+
+    def get_queryset(self):
+        return BulkExport.objects.filter(user=self.request.user).order_by("-created_at")
+
+    def create(self, request, *args, **kwargs):
+        user = request.user
+        role = (request.data.get("role") or request.query_params.get("role") or "").upper()
+        fmt = request.data.get("format", "pdf")
+        if fmt not in ("pdf", "docx"):
+            return Response({"detail": "format must be 'pdf' or 'docx'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {
+            field: request.data.get(field)
+            for field in self.FILTER_FIELDS
+            if request.data.get(field) not in (None, "")
+        }
+
+        if role in ("ADMIN", "AUDITOR"):
+            if not user.has_role(role):
+                raise PermissionDenied(f"You are not an {role.title()}.")
+        elif role == "DEAN":
+            dean_college_id = get_access(user).entity_id("DEAN", "College")
+            if dean_college_id is None:
+                raise PermissionDenied("You are not a Dean.")
+            filters["college"] = dean_college_id
+        elif role == "CHAIRPERSON":
+            chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+            if chair_department_id is None:
+                raise PermissionDenied("You are not a Chairperson.")
+            filters["department"] = chair_department_id
+        else:
+            raise PermissionDenied("Invalid role parameter.")
+
+        bulk = enqueue_bulk_export(user, filters, fmt, target_role=role)
+        return Response(BulkExportSerializer(bulk).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ExportStorageViewSet(viewsets.ViewSet):
+    """Storage held by generated exports, per prefix (``manage.py sweep_exports --stats``)."""
+    permission_classes = [RolePermission("ADMIN")]
+
+    def list(self, request):
+        return Response(storage_usage(), status=status.HTTP_200_OK)
+
+
+def export_response(request, kind, obj, fmt):
+    """
+    Shared body of the ``export_docx``/``export_pdf`` actions.
+    With ``?mode=async`` the export is queued and the job is returned (202);
+    with ``?mode=file`` the document itself is streamed back (Range/ETag aware);
+    otherwise the document is rendered inline and its URL returned as before.
+    Inline PDF exports need an admission ticket; when the node's conversion
+    queue is full the client gets 429 with Retry-After.
+    PDFs use the export profile named by ``?profile=`` (default profile otherwise).
+    """
+    url_key = "pdf_url" if fmt == "pdf" else "docx_url"
+    mode = request.query_params.get("mode")
+
+    profile = None
+    if fmt == "pdf":
+        try:
+            profile = resolve_profile(request.query_params.get("profile"))
+        except UnknownProfile as e:
+            raise ValidationError({"profile": str(e)})
+
+    if mode == "async":
+        job = enqueue_export(
+            request.user, kind, obj.pk, fmt,
+            target_role=request.query_params.get("role"),
+            profile=profile,
+        )
+        return Response(ExportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    try:
+        with admit_export() if fmt == "pdf" else nullcontext():
+            if mode == "file":
+                return file_response(request, store_document(kind, obj, fmt, profile))
+            return JsonResponse({url_key: export_document(kind, obj, fmt, profile)})
+    except ConversionBusy as e:
+        raise Throttled(wait=e.retry_after, detail=str(e))
+
+
+def preview_response(request, kind, obj):
+    """
+    Shared body of the ``preview`` actions: the export rendered as a
+    standalone HTML page, without DOCX or PDF conversion.
+    """
+    response = HttpResponse(render_preview(kind, obj), content_type="text/html; charset=utf-8")
+    response["Content-Security-Policy"] = PREVIEW_CSP
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0011_alter_notification_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(blank=True, choices=[('syllabus_review', 'Syllabus Needs Review'), ('syllabus_approval', 'Syllabus Needs Approval'), ('syllabus_returned', 'Syllabus Returned'), ('syllabus_approved', 'Syllabus Approved'), ('tos_review', 'TOS Needs Review'), ('tos_returned', 'TOS Returned'), ('tos_approved', 'TOS Approved'), ('role_assigned', 'New Role Assigned'), ('group_assignment', 'Bayanihan Group Assignment'), ('course_new', 'New Course'), ('memo_new', 'New Memo'), ('deadline_reminder', 'Deadline Reminder'), ('export_ready', 'Export Ready'), ('export_failed', 'Export Failed')], max_length=50, null=True),
+        ),
+    ]
@@ -30,6 +30,9 @@ class Notification(models.Model):
         ("course_new", "New Course"),
         ("memo_new", "New Memo"),
         ("deadline_reminder", "Deadline Reminder"),
+
+        ("export_ready", "Export Ready"),
+        ("export_failed", "Export Failed"),
     ] 
 
     recipient = models.ForeignKey(
@@ -54,5 +57,11 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # a user's notifications, unread count, newest first
+            models.Index(fields=["recipient", "is_read", "created_at"], name="notif_recipient_read_idx"),
+        ]
+
     def __str__(self):
         return f"{self.recipient.username}: {self.message[:30]}"
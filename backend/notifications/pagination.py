@@ -0,0 +1,7 @@
+from shared.pagination import ListPagination
+
+class NotificationPagination(ListPagination):
+    page_size = 10
+    cursor_ordering = ("-created_at", "-id")
+    # The notification list has always been returned whole; page only on ?page= / ?cursor=
+    paginate_by_default = False
@@ -4,12 +4,14 @@ from rest_framework.views import APIView
 from rest_framework.decorators import action
 from bayanihan.models import BayanihanGroupUser
 from .models import Notification
+from .pagination import NotificationPagination
 from .serializers import NotificationSerializer
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get_queryset(self):
         qs = Notification.objects.filter(recipient=self.request.user)
@@ -0,0 +1,277 @@
+"""
+Search index of courses, syllabi, TOS, Bayanihan groups and users.
+
+Each object has a ``SearchEntry`` and one ``SearchToken`` per word of its
+searchable text (codes, titles, school year, names...), normalized to
+lowercase ASCII. Words mixing letters and digits are also indexed by their
+parts, so "IT101" is found by "it101", "it" and "101".
+
+A query matches an entry when every query term is a prefix of one of its
+tokens. Each term is a range scan on the token index, so matching never
+scans the searched tables or their joins; ``matching_ids`` hands the
+matches to the list views as a subquery. ``rank`` scores hits by the
+weight of the tokens matched, exact words first, in the same query, so a
+search reads only the rows it returns.
+
+The signals in ``search.signals`` re-index objects as they change;
+``manage.py rebuild_search_index`` rebuilds everything.
+"""
+import re
+import unicodedata
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Case, F, Max, Q, Value, When
+
+MAX_TOKEN_LENGTH = 64
+# Query terms beyond this many are ignored
+MAX_QUERY_TERMS = 8
+
+CODE_WEIGHT = 3
+TITLE_WEIGHT = 2
+OTHER_WEIGHT = 1
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+PART_RE = re.compile(r"[a-z]+|[0-9]+")
+# Token characters in sort order (the same in binary and case-insensitive collations)
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def query_terms(query):
+    """Distinct words of a search query, in order."""
+    terms = []
+    for word in WORD_RE.findall(normalize(query)):
+        word = word[:MAX_TOKEN_LENGTH]
+        if word not in terms:
+            terms.append(word)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def tokenize(text):
+    tokens = set()
+    for word in WORD_RE.findall(normalize(text)):
+        tokens.add(word[:MAX_TOKEN_LENGTH])
+        parts = PART_RE.findall(word)
+        if len(parts) > 1:
+            tokens.update(part[:MAX_TOKEN_LENGTH] for part in parts)
+    return tokens
+
+
+def prefix_range(term):
+    """``(low, high)`` bounds of the tokens starting with ``term``; ``high`` is None when unbounded."""
+    for i in range(len(term) - 1, -1, -1):
+        position = ALPHABET.find(term[i])
+        if position < len(ALPHABET) - 1:
+            return term, term[:i] + ALPHABET[position + 1]
+    return term, None
+
+
+def prefix_filter(term):
+    low, high = prefix_range(term)
+    if high is None:
+        return {"token__gte": low}
+    return {"token__gte": low, "token__lt": high}
+
+
+# --- Documents --------------------------------------------------------------
+# Each returns the entry fields of an object and its ``(text, weight)`` fields.
+
+def course_document(course):
+    department = course.curriculum.program.department
+    return {
+        "title": f"{course.course_code} - {course.course_title}",
+        "subtitle": course.curriculum.program.program_code,
+        "college_id": department.college_id,
+        "department_id": department.pk,
+        "group_id": None,
+        "fields": [(course.course_code, CODE_WEIGHT), (course.course_title, TITLE_WEIGHT)],
+    }
+
+
+def syllabus_document(syllabus):
+    course = syllabus.course
+    school_year = syllabus.bayanihan_group.school_year
+    return {
+        "title": f"{course.course_code} - {course.course_title}",
+        "subtitle": f"Syllabus v{syllabus.version}, SY {school_year} ({syllabus.status or 'Draft'})",
+        "college_id": syllabus.college_id,
+        "department_id": syllabus.program.department_id,
+        "group_id": syllabus.bayanihan_group_id,
+        "fields": [
+            (course.course_code, CODE_WEIGHT),
+            (course.course_title, TITLE_WEIGHT),
+            (school_year, OTHER_WEIGHT),
+        ],
+    }
+
+
+def tos_document(tos):
+    course = tos.course
+    school_year = tos.bayanihan_group.school_year
+    return {
+        "title": f"{course.course_code} - {course.course_title}",
+        "subtitle": f"{tos.term} TOS v{tos.version}, SY {school_year} ({tos.status or 'Draft'})",
+        "college_id": tos.program.department.college_id,
+        "department_id": tos.program.department_id,
+        "group_id": tos.bayanihan_group_id,
+        "fields": [
+            (course.course_code, CODE_WEIGHT),
+            (course.course_title, TITLE_WEIGHT),
+            (f"{tos.term} {school_year}", OTHER_WEIGHT),
+        ],
+    }
+
+
+def group_document(group):
+    course = group.course
+    department = course.curriculum.program.department
+    return {
+        "title": f"{course.course_code} - {course.course_title}",
+        "subtitle": f"Bayanihan group, SY {group.school_year}",
+        "college_id": department.college_id,
+        "department_id": department.pk,
+        "group_id": group.pk,
+        "fields": [
+            (course.course_code, CODE_WEIGHT),
+            (course.course_title, TITLE_WEIGHT),
+            (group.school_year, OTHER_WEIGHT),
+        ],
+    }
+
+
+def user_document(user):
+    name = " ".join(part for part in (user.prefix, user.first_name, user.last_name, user.suffix) if part)
+    return {
+        "title": name or user.username,
+        "subtitle": user.email or "",
+        "college_id": None,
+        "department_id": None,
+        "group_id": None,
+        "fields": [
+            (user.faculty_id, CODE_WEIGHT),
+            (f"{user.first_name} {user.last_name}", TITLE_WEIGHT),
+            (f"{user.email} {user.prefix or ''} {user.suffix or ''} {user.phone or ''}", OTHER_WEIGHT),
+        ],
+    }
+
+
+# kind -> (model, select_related, document)
+DOCUMENTS = {
+    "course": ("academics.Course", ("curriculum__program__department",), course_document),
+    "syllabus": ("syllabi.Syllabus", ("course", "bayanihan_group", "program"), syllabus_document),
+    "tos": ("tos.TOS", ("course", "bayanihan_group", "program__department"), tos_document),
+    "group": ("bayanihan.BayanihanGroup", ("course__curriculum__program__department",), group_document),
+    "user": ("users.User", (), user_document),
+}
+
+
+def _model(label, get_model):
+    return get_model(*label.split("."))
+
+
+# --- Writing ----------------------------------------------------------------
+
+def index_objects(kind, objects, get_model=django_apps.get_model):
+    """(Re-)index ``objects`` of ``kind``, replacing their previous tokens."""
+    SearchEntry = get_model("search", "SearchEntry")
+    SearchToken = get_model("search", "SearchToken")
+    document = DOCUMENTS[kind][2]
+
+    tokens = []
+    with transaction.atomic():
+        for obj in objects:
+            doc = document(obj)
+            weights = {}
+            for text, weight in doc.pop("fields"):
+                for token in tokenize(text):
+                    weights[token] = max(weight, weights.get(token, 0))
+            doc["title"] = doc["title"][:255]
+            doc["subtitle"] = doc["subtitle"][:255]
+
+            entry, created = SearchEntry.objects.update_or_create(kind=kind, object_id=obj.pk, defaults=doc)
+            if not created:
+                entry.tokens.all().delete()
+            tokens.extend(
+                SearchToken(entry=entry, token=token, weight=weight) for token, weight in weights.items()
+            )
+        SearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+def index(kind, pks, get_model=django_apps.get_model):
+    """(Re-)index the ``kind`` objects with primary keys ``pks``."""
+    label, related, _ = DOCUMENTS[kind]
+    queryset = _model(label, get_model).objects.filter(pk__in=list(pks))
+    if related:
+        queryset = queryset.select_related(*related)
+    index_objects(kind, queryset, get_model)
+
+
+def unindex(kind, pk):
+    django_apps.get_model("search", "SearchEntry").objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(kinds=None, batch_size=500, get_model=django_apps.get_model):
+    """Index every object of ``kinds`` (all by default) and drop entries of deleted ones."""
+    SearchEntry = get_model("search", "SearchEntry")
+    totals = {}
+    for kind in kinds or DOCUMENTS:
+        label, related, _ = DOCUMENTS[kind]
+        model = _model(label, get_model)
+        pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(pks), batch_size):
+            index(kind, pks[start:start + batch_size], get_model)
+        SearchEntry.objects.filter(kind=kind).exclude(object_id__in=model.objects.values("pk")).delete()
+        totals[kind] = len(pks)
+    return totals
+
+
+# --- Reading ----------------------------------------------------------------
+
+def matching_entries(query, kinds=None):
+    """Entries that have a token starting with every term of ``query``."""
+    SearchEntry = django_apps.get_model("search", "SearchEntry")
+    SearchToken = django_apps.get_model("search", "SearchToken")
+
+    terms = query_terms(query)
+    if not terms:
+        return SearchEntry.objects.none()
+
+    entries = SearchEntry.objects.all()
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    for term in terms:
+        entries = entries.filter(
+            pk__in=SearchToken.objects.filter(**prefix_filter(term)).values("entry_id")
+        )
+    return entries
+
+
+def matching_ids(kind, query):
+    """Subquery of the ids of the ``kind`` objects matching ``query``, for ``pk__in`` filters."""
+    return matching_entries(query, [kind]).values("object_id")
+
+
+def rank(entries, query):
+    """
+    The ``entries`` queryset best first, annotated with its ``score``: each
+    query term scores the weight of the best token it matches, doubled when
+    it is the whole word. Slice it to get the top hits.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return entries.none()
+
+    term_scores = {}
+    for i, term in enumerate(terms):
+        matches = Q(**{f"tokens__{lookup}": value for lookup, value in prefix_filter(term).items()})
+        term_scores[f"term_{i}_score"] = Max(
+            F("tokens__weight") * Case(When(tokens__token=term, then=Value(2)), default=Value(1)),
+            filter=matches,
+        )
+    score = sum((F(name) for name in term_scores), Value(0))
+    return entries.alias(**term_scores).annotate(score=score).order_by("-score", "title", "pk")
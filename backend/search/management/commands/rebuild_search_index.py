@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from search.indexing import DOCUMENTS, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index (all kinds, or those given) from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", choices=sorted(DOCUMENTS), help="Kinds to rebuild (default: all).")
+        parser.add_argument("--batch-size", type=int, default=500, help="Objects indexed per batch.")
+
+    def handle(self, *args, **options):
+        totals = rebuild(options["kinds"] or None, options["batch_size"])
+        for kind, count in totals.items():
+            self.stdout.write(f"Indexed {count} {kind} objects")
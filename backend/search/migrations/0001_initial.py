@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('syllabus', 'Syllabus'), ('tos', 'Table of Specifications'), ('group', 'Bayanihan Group'), ('user', 'User')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, default='', max_length=255)),
+                ('college_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('department_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('group_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='search.searchentry')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'entry'], name='search_sear_token_55c349_idx')],
+            },
+        ),
+    ]
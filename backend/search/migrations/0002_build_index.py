@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from search.indexing import rebuild
+
+
+def build_index(apps, schema_editor):
+    rebuild(get_model=apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('academics', '0012_alter_memo_file_name'),
+        ('bayanihan', '0003_alter_bayanihangroup_unique_together_and_more'),
+        ('syllabi', '0036_latest_version_flags'),
+        ('tos', '0011_latest_version_flags'),
+        ('users', '0006_remove_user_signature_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable object (course, syllabus, TOS, Bayanihan group or user)
+    as shown in search results, with the ids used to scope results to the
+    searching user's role. Its words are the ``tokens``.
+    """
+    KIND_CHOICES = [
+        ("course", "Course"),
+        ("syllabus", "Syllabus"),
+        ("tos", "Table of Specifications"),
+        ("group", "Bayanihan Group"),
+        ("user", "User"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default="")
+
+    college_id = models.PositiveBigIntegerField(blank=True, null=True)
+    department_id = models.PositiveBigIntegerField(blank=True, null=True)
+    group_id = models.PositiveBigIntegerField(blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
+
+
+class SearchToken(models.Model):
+    """A normalized word of an entry; queries match token prefixes."""
+    entry = models.ForeignKey(
+        SearchEntry, on_delete=models.CASCADE, related_name="tokens"
+    )
+    token = models.CharField(max_length=64)
+    # Codes outrank titles, titles outrank the rest
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["token", "entry"]),
+        ]
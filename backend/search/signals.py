@@ -0,0 +1,76 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from academics.models import Course
+from bayanihan.models import BayanihanGroup
+from syllabi.models import Syllabus
+from tos.models import TOS
+from users.models import User
+from .indexing import index, unindex
+
+KINDS = {Course: "course", Syllabus: "syllabus", TOS: "tos", BayanihanGroup: "group", User: "user"}
+
+# Saves limited to other fields (update_fields) leave the indexed text unchanged
+INDEXED_FIELDS = {
+    "course": {"course_code", "course_title", "curriculum", "curriculum_id"},
+    "syllabus": {
+        "course", "course_id", "bayanihan_group", "bayanihan_group_id", "program", "program_id",
+        "college", "college_id", "version", "status",
+    },
+    "tos": {"course", "course_id", "bayanihan_group", "bayanihan_group_id", "program", "program_id",
+            "term", "version", "status"},
+    "group": {"course", "course_id", "school_year"},
+    "user": {"username", "faculty_id", "first_name", "last_name", "prefix", "suffix", "email", "phone"},
+}
+
+
+def touches(kind, update_fields):
+    return update_fields is None or not INDEXED_FIELDS[kind].isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, update_fields=None, **kwargs):
+    if not touches("course", update_fields):
+        return
+    index("course", [instance.pk])
+    # Syllabi, TOS and groups are found by their course's code and title
+    index("syllabus", Syllabus.objects.filter(course_id=instance.pk).values_list("pk", flat=True))
+    index("tos", TOS.objects.filter(course_id=instance.pk).values_list("pk", flat=True))
+    index("group", BayanihanGroup.objects.filter(course_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Syllabus)
+def syllabus_saved(sender, instance, update_fields=None, **kwargs):
+    if touches("syllabus", update_fields):
+        index("syllabus", [instance.pk])
+
+
+@receiver(post_save, sender=TOS)
+def tos_saved(sender, instance, update_fields=None, **kwargs):
+    if touches("tos", update_fields):
+        index("tos", [instance.pk])
+
+
+@receiver(post_save, sender=BayanihanGroup)
+def group_saved(sender, instance, update_fields=None, **kwargs):
+    if not touches("group", update_fields):
+        return
+    index("group", [instance.pk])
+    # The school year is part of its syllabi and TOS
+    index("syllabus", Syllabus.objects.filter(bayanihan_group_id=instance.pk).values_list("pk", flat=True))
+    index("tos", TOS.objects.filter(bayanihan_group_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if touches("user", update_fields):
+        index("user", [instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Syllabus)
+@receiver(post_delete, sender=TOS)
+@receiver(post_delete, sender=BayanihanGroup)
+@receiver(post_delete, sender=User)
+def searchable_deleted(sender, instance, **kwargs):
+    unindex(KINDS[sender], instance.pk)
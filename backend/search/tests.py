@@ -0,0 +1,156 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from academics.models import Course
+from exports.benchmark import create_fixture
+from users.models import Role, User, UserRole
+from .models import SearchEntry
+
+SEARCH_URL = "/api/search/"
+
+
+class SearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Two separate colleges, each with a department, group, syllabus and TOS
+        cls.syllabus, cls.tos = cls.submitted_fixture()
+        cls.other_syllabus, cls.other_tos = cls.submitted_fixture()
+
+    @staticmethod
+    def submitted_fixture():
+        syllabus, tos = create_fixture(outlines=1, cos=1, pos=1, signatories=0)
+        now = timezone.now()
+        syllabus.chair_submitted_at = syllabus.dean_submitted_at = now
+        syllabus.save()
+        tos.chair_submitted_at = now
+        tos.save()
+        return syllabus, tos
+
+    def search(self, user, role, q, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(SEARCH_URL, {"q": q, "role": role, **params})
+
+    def found(self, user, role, q="benchmark", **params):
+        response = self.search(user, role, q, **params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {(result["kind"], result["id"]) for result in response.json()["results"]}
+
+    def user_with_role(self, name, entity=None):
+        user = User.objects.create_user(username=f"{name.lower()}-user", email=f"{name.lower()}@example.com")
+        role, _ = Role.objects.get_or_create(name=name)
+        entity_type, entity_id = entity or (None, None)
+        UserRole.objects.create(user=user, role=role, entity_type=entity_type, entity_id=entity_id)
+        return user
+
+
+class SearchScopeTests(SearchTestCase):
+    def test_dean_sees_only_their_college(self):
+        dean = self.user_with_role("DEAN", ("College", self.syllabus.college_id))
+        found = self.found(dean, "DEAN")
+
+        self.assertIn(("syllabus", self.syllabus.pk), found)
+        self.assertIn(("course", self.syllabus.course_id), found)
+        self.assertIn(("group", self.syllabus.bayanihan_group_id), found)
+        self.assertNotIn(("syllabus", self.other_syllabus.pk), found)
+        self.assertNotIn(("course", self.other_syllabus.course_id), found)
+        self.assertNotIn(("group", self.other_syllabus.bayanihan_group_id), found)
+        # Deans do not search TOS
+        self.assertFalse({kind for kind, _ in found} & {"tos", "user"})
+
+    def test_chairperson_sees_only_their_department(self):
+        chair = self.user_with_role("CHAIRPERSON", ("Department", self.syllabus.program.department_id))
+        found = self.found(chair, "CHAIRPERSON")
+
+        self.assertIn(("syllabus", self.syllabus.pk), found)
+        self.assertIn(("tos", self.tos.pk), found)
+        self.assertNotIn(("syllabus", self.other_syllabus.pk), found)
+        self.assertNotIn(("tos", self.other_tos.pk), found)
+
+    def test_leader_sees_only_their_groups(self):
+        leader = self.syllabus.bayanihan_group.bayanihan_members.get().user
+        UserRole.objects.create(user=leader, role=Role.objects.create(name="BAYANIHAN_LEADER"))
+        found = self.found(leader, "BAYANIHAN_LEADER")
+
+        self.assertEqual(found, {
+            ("syllabus", self.syllabus.pk),
+            ("tos", self.tos.pk),
+            ("group", self.syllabus.bayanihan_group_id),
+        })
+
+    def test_unscoped_dean_sees_nothing(self):
+        dean = self.user_with_role("DEAN")
+        self.assertEqual(self.found(dean, "DEAN"), set())
+
+    def test_only_the_versions_the_role_lists_show(self):
+        # Not approved yet, so not in the auditor's lists
+        auditor = self.user_with_role("AUDITOR")
+        found = self.found(auditor, "AUDITOR", kinds="syllabus")
+        self.assertEqual(found, set())
+
+        self.syllabus.dean_approved_at = timezone.now()
+        self.syllabus.save()
+        self.assertEqual(self.found(auditor, "AUDITOR", kinds="syllabus"), {("syllabus", self.syllabus.pk)})
+
+    def test_role_the_user_does_not_hold_is_refused(self):
+        dean = self.user_with_role("DEAN", ("College", self.syllabus.college_id))
+        self.assertEqual(self.search(dean, "ADMIN", "benchmark").status_code, 403)
+
+
+class SearchRankingTests(SearchTestCase):
+    def test_best_matches_first_regardless_of_recency(self):
+        curriculum = self.syllabus.curriculum
+        code_match = Course.objects.create(
+            curriculum=curriculum, course_code="NET101", course_title="Data Communications",
+            course_year_level="1", course_semester="1ST",
+        )
+        title_word = Course.objects.create(
+            curriculum=curriculum, course_code="CS201", course_title="Net Basics",
+            course_year_level="1", course_semester="1ST",
+        )
+        title_prefix = Course.objects.create(
+            curriculum=curriculum, course_code="CS301", course_title="Networks",
+            course_year_level="1", course_semester="1ST",
+        )
+        # The weakest match is the most recently updated
+        title_prefix.save()
+
+        admin = self.user_with_role("ADMIN")
+        response = self.search(admin, "ADMIN", "net", kinds="course")
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["id"] for result in results], [code_match.pk, title_word.pk, title_prefix.pk]
+        )
+        self.assertEqual([result["score"] for result in results], [6, 4, 2])
+
+        response = self.search(admin, "ADMIN", "net", kinds="course", limit=1)
+        self.assertEqual([result["id"] for result in response.json()["results"]], [code_match.pk])
+
+    def test_every_term_must_match(self):
+        admin = self.user_with_role("ADMIN")
+        code = self.syllabus.course.course_code
+        found = self.found(admin, "ADMIN", q=f"{code} benchmark", kinds="course")
+        self.assertEqual(found, {("course", self.syllabus.course_id)})
+        self.assertEqual(self.found(admin, "ADMIN", q=f"{code} chemistry", kinds="course"), set())
+
+
+class SearchIndexUpkeepTests(SearchTestCase):
+    def test_saved_changes_are_searchable(self):
+        admin = self.user_with_role("ADMIN")
+        course = self.syllabus.course
+        course.course_title = "Thermodynamics"
+        course.save()
+
+        self.assertIn(("course", course.pk), self.found(admin, "ADMIN", q="thermo"))
+        # Syllabi are found by their course's title too
+        self.assertIn(("syllabus", self.syllabus.pk), self.found(admin, "ADMIN", q="thermo"))
+        self.assertNotIn(("course", course.pk), self.found(admin, "ADMIN", q="benchmark"))
+
+    def test_deleted_objects_leave_the_index(self):
+        tos_id = self.tos.pk
+        self.tos.delete()
+
+        self.assertFalse(SearchEntry.objects.filter(kind="tos", object_id=tos_id).exists())
+        admin = self.user_with_role("ADMIN")
+        self.assertNotIn(("tos", tos_id), self.found(admin, "ADMIN", kinds="tos"))
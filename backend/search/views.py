@@ -0,0 +1,92 @@
+from django.db.models import Q
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from syllabi.models import Syllabus
+from tos.models import TOS
+from users.access import get_access
+from users.permissions import RolePermission
+from .indexing import matching_entries, rank
+
+# role -> kinds it may find
+ROLE_KINDS = {
+    "ADMIN": ("course", "syllabus", "tos", "group", "user"),
+    "DEAN": ("course", "syllabus", "group"),
+    "CHAIRPERSON": ("course", "syllabus", "tos", "group"),
+    "BAYANIHAN_LEADER": ("syllabus", "tos", "group"),
+    "BAYANIHAN_TEACHER": ("syllabus", "tos", "group"),
+    "AUDITOR": ("course", "syllabus", "tos"),
+}
+
+# role -> version flag of the syllabi/TOS its lists show (see shared.versioning)
+ROLE_VERSION_FLAG = {
+    "DEAN": "is_latest_dean",
+    "CHAIRPERSON": "is_latest_chair",
+    "AUDITOR": "is_latest_approved",
+}
+
+VERSIONED = {"syllabus": Syllabus, "tos": TOS}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+class SearchView(APIView):
+    """
+    ``GET /api/search/?q=...&role=...[&kinds=course,syllabus][&limit=20]``
+
+    Ranked matches across courses, syllabi, TOS, Bayanihan groups and
+    users, limited to what the role's own lists show: its college,
+    department or groups, and the same syllabus/TOS versions.
+    """
+    permission_classes = [RolePermission(*ROLE_KINDS)]
+
+    def get(self, request):
+        user = request.user
+        access = get_access(user)
+        query = request.query_params.get("q", "").strip()
+        role = (request.query_params.get("role") or "").upper()
+
+        if role not in ROLE_KINDS:
+            raise PermissionDenied("Missing or invalid role parameter.")
+        if not access.has_role(role):
+            raise PermissionDenied(f"You are not a {role.replace('_', ' ').title()}.")
+
+        kinds = ROLE_KINDS[role]
+        requested = request.query_params.get("kinds")
+        if requested:
+            kinds = [kind for kind in requested.split(",") if kind in kinds]
+
+        try:
+            limit = max(min(int(request.query_params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT), 1)
+        except ValueError:
+            raise ValidationError({"limit": "Must be a number."})
+
+        entries = matching_entries(query, kinds)
+        if role == "DEAN":
+            entries = entries.filter(college_id__in=access.entity_ids("DEAN", "College"))
+        elif role == "CHAIRPERSON":
+            entries = entries.filter(department_id__in=access.entity_ids("CHAIRPERSON", "Department"))
+        elif role in ("BAYANIHAN_LEADER", "BAYANIHAN_TEACHER"):
+            entries = entries.filter(group_id__in=access.group_ids(role.split("_")[1]))
+
+        # Only the syllabus/TOS versions the role's lists show
+        flag = ROLE_VERSION_FLAG.get(role, "is_latest")
+        shown = ~Q(kind__in=VERSIONED)
+        for kind, model in VERSIONED.items():
+            if kind in kinds:
+                shown |= Q(kind=kind, object_id__in=model.objects.filter(**{flag: True}).values("pk"))
+        entries = entries.filter(shown)
+
+        results = [
+            {
+                "kind": entry.kind,
+                "id": entry.object_id,
+                "title": entry.title,
+                "subtitle": entry.subtitle,
+                "score": entry.score,
+            }
+            for entry in rank(entries, query)[:limit]
+        ]
+        return Response({"query": query, "results": results})
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:18
+
+from django.db import migrations, models
+
+from shared.versioning import REPORT_LATEST_FLAGS, refresh_latest_flags
+
+
+def backfill_latest_flags(apps, schema_editor):
+    Report = apps.get_model("shared", "Report")
+    TOSReport = apps.get_model("shared", "TOSReport")
+    for group_id in Report.objects.values_list("bayanihan_group_id", flat=True).order_by().distinct():
+        refresh_latest_flags(Report, REPORT_LATEST_FLAGS, bayanihan_group_id=group_id)
+    for group_id, term in TOSReport.objects.values_list("bayanihan_group_id", "tos__term").order_by().distinct():
+        refresh_latest_flags(TOSReport, REPORT_LATEST_FLAGS, bayanihan_group_id=group_id, tos__term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0005_tosreport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='is_latest',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tosreport',
+            name='is_latest',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_latest_flags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bayanihan', '0004_hot_path_indexes'),
+        ('shared', '0006_latest_version_flags'),
+        ('syllabi', '0036_latest_version_flags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['bayanihan_group', 'version'], name='report_group_version_idx'),
+        ),
+    ]
@@ -78,6 +78,8 @@ class Report(models.Model):
 
     # ---- Version tracking ----
     version = models.PositiveIntegerField(default=1)
+    # Latest report of the group, maintained by shared.signals
+    is_latest = models.BooleanField(default=False, editable=False, db_index=True)
 
     # ---- Timeline tracking fields ----
     chair_submitted_at = models.DateTimeField(blank=True, null=True) 
@@ -92,6 +94,9 @@ class Report(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["bayanihan_group", "version"], name="report_group_version_idx"),
+        ]
 
     def __str__(self):
         return f"Syllabus Reports {self.syllabus.course.course_title} (v{self.version})"
@@ -138,6 +143,8 @@ class TOSReport(models.Model):
     )
 
     version = models.PositiveIntegerField(default=1)
+    # Latest report of the group and TOS term, maintained by shared.signals
+    is_latest = models.BooleanField(default=False, editable=False, db_index=True)
 
     # Chair timeline
     chair_submitted_at = models.DateTimeField(blank=True, null=True)
@@ -1,23 +1,177 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
-class ReportsPagination(PageNumberPagination):
-    page_size = 10  # default number of groups per page
-    page_size_query_param = "page_size"  # allows ?page_size=10
+
+def cached_count(queryset):
+    """``queryset.count()``, kept in the default cache under a hash of its SQL for ``LIST_COUNT_CACHE_TIMEOUT``."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = "lists:count:" + hashlib.sha1(repr((sql, params)).encode("utf-8")).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(settings, "LIST_COUNT_CACHE_TIMEOUT", 60))
+    return count
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith("-") else "-" + field for field in ordering)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on every field of ``ordering``, not just the
+    first one as DRF's does (which falls back to an offset for ties).
+
+    The cursor holds the whole ordering tuple of the row it starts after, and
+    the next page is ``WHERE (a, b) < (x, y)``, spelled
+    ``a <= x AND (a < x OR (a = x AND b < y))`` so the index on ``(a, b)``
+    serves it. Rows sharing an ``updated_at`` are neither skipped nor repeated
+    across pages. The last field of ``ordering`` must be unique.
+    """
+    # Page size and ordering are set by ListPagination
+    page_size_query_param = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor is not None else None
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(self.seek(current_position, reverse))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if len(results) > len(self.page) else None
+        )
+
+        # Positions are unique, so the cursors DRF builds from them never need an offset
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def seek(self, position, reverse):
+        """Rows strictly after ``position`` in the (possibly reversed) ordering."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        names = [field.lstrip("-") for field in self.ordering]
+        lookups = [
+            "lt" if field.startswith("-") != reverse else "gt" for field in self.ordering
+        ]
+        after = Q()
+        for i in range(len(names)):
+            ties = dict(zip(names[:i], values[:i]))
+            after |= Q(**ties, **{f"{names[i]}__{lookups[i]}": values[i]})
+        # Redundant, but a plain range on the leading column is what the index can seek on
+        return Q(**{f"{names[0]}__{lookups[0]}e": values[0]}) & after
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            values.append(str(instance[name] if isinstance(instance, dict) else getattr(instance, name)))
+        return json.dumps(values)
+
+
+class ListPagination(PageNumberPagination):
+    """
+    Page-number pagination of the list endpoints, plus:
+
+    - ``?all=true`` returns the whole list unpaginated (dropdowns)
+    - ``?cursor=`` (empty for the first page) seeks past the last row's
+      ``cursor_ordering`` values (``KeysetPagination``) instead of counting
+      and skipping rows, so deep pages cost the same as the first. ``next``/``previous`` carry the cursor; ``total_results`` is
+      a cached count (null with ``?count=false``); ``total_pages`` and
+      ``current_page`` are null.
+
+    The response keeps the same keys in both modes.
+    """
+    page_size = 5
+    page_size_query_param = "page_size"
     max_page_size = 50
 
+    # Keyset order for ?cursor=; the last field must be unique
+    cursor_ordering = ("-updated_at", "-id")
+    # Endpoints without pagination so far only paginate when asked (?page= / ?cursor=)
+    paginate_by_default = True
+
+    total_key = "total_results"
+    results_key = "results"
+
     def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
         # ✅ Disable pagination if ?all=true
         if request.query_params.get("all") == "true":
             return None
+
+        if "cursor" in request.query_params:
+            self.keyset = KeysetPagination()
+            self.keyset.page_size = self.get_page_size(request)
+            self.keyset.ordering = self.cursor_ordering
+            self.total = None if request.query_params.get("count") == "false" else cached_count(queryset)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if not self.paginate_by_default and self.page_query_param not in request.query_params:
+            return None
         return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return Response({
+                self.total_key: self.total,
+                "total_pages": None,
+                "current_page": None,
+                "next": self.keyset.get_next_link(),
+                "previous": self.keyset.get_previous_link(),
+                self.results_key: data,
+            })
         return Response({
-            "total_results": self.page.paginator.count,
+            self.total_key: self.page.paginator.count,
             "total_pages": self.page.paginator.num_pages,
             "current_page": self.page.number,
             "next": self.get_next_link(),
             "previous": self.get_previous_link(),
-            "results": data,  # instead of “results”
-        })  
\ No newline at end of file
+            self.results_key: data,
+        })
+
+
+class ReportsPagination(ListPagination):
+    page_size = 10  # default number of groups per page
@@ -0,0 +1,82 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from syllabi.models import Syllabus
+from tos.models import TOS
+from .models import Report, TOSReport
+from .versioning import (
+    REPORT_LATEST_FLAGS,
+    SYLLABUS_LATEST_FLAGS,
+    TOS_LATEST_FLAGS,
+    apply_latest_flags,
+    refresh_latest_flags,
+)
+
+# Saves limited to other fields (update_fields) can't change which version is latest
+SYLLABUS_VERSION_FIELDS = {
+    "bayanihan_group", "bayanihan_group_id", "version",
+    "chair_submitted_at", "dean_submitted_at", "dean_approved_at",
+}
+TOS_VERSION_FIELDS = {
+    "bayanihan_group", "bayanihan_group_id", "term", "version",
+    "chair_submitted_at", "chair_approved_at",
+}
+REPORT_VERSION_FIELDS = {"bayanihan_group", "bayanihan_group_id", "version"}
+
+
+def touches(update_fields, fields):
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver([post_save, post_delete], sender=Syllabus)
+def syllabus_versions_changed(sender, instance, update_fields=None, **kwargs):
+    if not touches(update_fields, SYLLABUS_VERSION_FIELDS):
+        return
+    latest = refresh_latest_flags(
+        Syllabus, SYLLABUS_LATEST_FLAGS, bayanihan_group_id=instance.bayanihan_group_id
+    )
+    apply_latest_flags(instance, latest)
+
+
+@receiver([post_save, post_delete], sender=TOS)
+def tos_versions_changed(sender, instance, update_fields=None, **kwargs):
+    if not touches(update_fields, TOS_VERSION_FIELDS):
+        return
+    # Every term of the group, in case this save moved the TOS to another term
+    terms = set(
+        TOS.objects.filter(bayanihan_group_id=instance.bayanihan_group_id).values_list("term", flat=True)
+    )
+    terms.add(instance.term)
+    for term in terms:
+        latest = refresh_latest_flags(
+            TOS, TOS_LATEST_FLAGS, bayanihan_group_id=instance.bayanihan_group_id, term=term
+        )
+        refresh_latest_flags(
+            TOSReport, REPORT_LATEST_FLAGS, bayanihan_group_id=instance.bayanihan_group_id, tos__term=term
+        )
+        if term == instance.term:
+            apply_latest_flags(instance, latest)
+
+
+@receiver([post_save, post_delete], sender=Report)
+def report_versions_changed(sender, instance, update_fields=None, **kwargs):
+    if not touches(update_fields, REPORT_VERSION_FIELDS):
+        return
+    latest = refresh_latest_flags(
+        Report, REPORT_LATEST_FLAGS, bayanihan_group_id=instance.bayanihan_group_id
+    )
+    apply_latest_flags(instance, latest)
+
+
+@receiver([post_save, post_delete], sender=TOSReport)
+def tos_report_versions_changed(sender, instance, update_fields=None, **kwargs):
+    if not touches(update_fields, REPORT_VERSION_FIELDS | {"tos", "tos_id"}):
+        return
+    term = TOS.objects.filter(pk=instance.tos_id).values_list("term", flat=True).first()
+    if term is None:
+        # Deleted along with its TOS, whose own signal refreshes the reports
+        return
+    latest = refresh_latest_flags(
+        TOSReport, REPORT_LATEST_FLAGS, bayanihan_group_id=instance.bayanihan_group_id, tos__term=term
+    )
+    apply_latest_flags(instance, latest)
@@ -1,3 +1,137 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.db.models.functions import Lower
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from academics.models import Course
+from bayanihan.models import BayanihanGroup
+from exports.benchmark import create_fixture
+from notifications.models import Notification
+from syllabi.models import Syllabus
+from tos.models import TOS
+from users.models import Role, User, UserRole
+from .models import Report
+from .pagination import ListPagination
+
+
+class HotPathQueryPlanTests(TestCase):
+    """
+    The list filters and version lookups run on their composite indexes.
+    Each query is checked against the database's EXPLAIN output, so a
+    dropped index or a filter rewritten into a form the index can't serve
+    (``__iexact``, a function on the column) fails here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.syllabus, cls.tos = create_fixture(outlines=1, cos=1, pos=1, signatories=0)
+        cls.group = cls.syllabus.bayanihan_group
+        cls.user = cls.group.bayanihan_members.first().user
+
+        Report.objects.create(bayanihan_group=cls.group, syllabus=cls.syllabus, version=1)
+        Notification.objects.create(recipient=cls.user, domain="system", message="Plan check")
+        UserRole.objects.create(
+            user=cls.user,
+            role=Role.objects.create(name="DEAN"),
+            entity_type="College",
+            entity_id=cls.syllabus.college_id,
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} not in plan:\n{plan}")
+
+    def test_hot_queries_use_their_indexes(self):
+        group = self.group
+        queries = [
+            ("syllabus_group_version_idx", Syllabus.objects.filter(bayanihan_group=group, version=1)),
+            (
+                "syllabus_status_idx",
+                Syllabus.objects.alias(status_lower=Lower("status")).filter(status_lower="draft"),
+            ),
+            ("syllabus_updated_idx", Syllabus.objects.order_by("-updated_at", "-id")[:5]),
+            (
+                "tos_group_term_version_idx",
+                TOS.objects.filter(bayanihan_group=group, term="MIDTERM", version=1),
+            ),
+            ("tos_status_idx", TOS.objects.alias(status_lower=Lower("status")).filter(status_lower="draft")),
+            ("tos_created_idx", TOS.objects.order_by("-created_at", "-id")[:5]),
+            (
+                "userrole_role_entity_idx",
+                UserRole.objects.filter(
+                    role__name="DEAN", entity_type="College", entity_id=self.syllabus.college_id
+                ),
+            ),
+            ("report_group_version_idx", Report.objects.filter(bayanihan_group=group, version=1)),
+            (
+                "course_semester_level_idx",
+                Course.objects.filter(course_semester="1ST", course_year_level="1"),
+            ),
+            ("group_school_year_idx", BayanihanGroup.objects.filter(school_year="2024-2025")),
+        ]
+        for index_name, queryset in queries:
+            with self.subTest(index_name):
+                self.assertUsesIndex(queryset, index_name)
+
+    def test_unread_notifications_use_the_recipient_index(self):
+        # Django compares booleans directly only on MySQL; elsewhere is_read=False
+        # becomes NOT is_read, which no index column serves
+        if connection.vendor != "mysql":
+            self.skipTest("boolean filters are rendered as NOT <column>")
+        self.assertUsesIndex(
+            Notification.objects.filter(recipient=self.user, is_read=False).order_by("-created_at"),
+            "notif_recipient_read_idx",
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader", email="reader@example.com", password="x")
+        Notification.objects.bulk_create(
+            Notification(recipient=cls.user, domain="system", message=str(i)) for i in range(7)
+        )
+        # Five rows share one timestamp, so every page boundary falls inside a tie
+        now = timezone.now()
+        ids = list(Notification.objects.order_by("id").values_list("id", flat=True))
+        Notification.objects.filter(id__in=ids[:5]).update(created_at=now)
+        Notification.objects.filter(id=ids[5]).update(created_at=now + timedelta(seconds=1))
+        Notification.objects.filter(id=ids[6]).update(created_at=now - timedelta(seconds=1))
+        cls.expected = [ids[5], ids[4], ids[3], ids[2], ids[1], ids[0], ids[6]]
+
+    def page(self, cursor=""):
+        """``(ids, next cursor, previous cursor)`` of one page of two."""
+        paginator = ListPagination()
+        paginator.cursor_ordering = ("-created_at", "-id")
+        params = {"cursor": cursor, "page_size": 2, "count": "false"}
+        request = Request(APIRequestFactory().get("/notifications/", params))
+        rows = paginator.paginate_queryset(Notification.objects.all(), request)
+        response = paginator.get_paginated_response([row.id for row in rows]).data
+
+        def cursor_of(link):
+            return parse_qs(urlparse(link).query)["cursor"][0] if link else None
+        return response["results"], cursor_of(response["next"]), cursor_of(response["previous"])
+
+    def test_pages_across_tied_timestamps(self):
+        forward, cursor = [], ""
+        while cursor is not None:
+            ids, cursor, previous = self.page(cursor)
+            forward.append(ids)
+        self.assertEqual(forward, [self.expected[i:i + 2] for i in range(0, 7, 2)])
+
+        backward = []
+        while previous is not None:
+            ids, _, previous = self.page(previous)
+            backward.insert(0, ids)
+        self.assertEqual(backward, forward[:-1])
 
-# Create your tests here.
+    def test_a_page_is_one_seek_query(self):
+        _, cursor, _ = self.page()
+        with self.assertNumQueries(1):
+            ids, _, _ = self.page(cursor)
+        self.assertEqual(ids, self.expected[2:4])
@@ -0,0 +1,62 @@
+"""
+Denormalized "latest version" flags.
+
+Syllabi, TOS and their reports are versioned per Bayanihan group (TOS and
+TOS reports per group and term). List views only ever show the latest
+version, or the latest one that reached a given stage (submitted to the
+chair, to the dean, approved), so each of those is stored as a boolean on
+the row instead of being looked up with a correlated subquery per row.
+
+``refresh_latest_flags`` recomputes the flags of one group. It runs from
+the post_save/post_delete signals in ``shared.signals``, inside the
+transaction of the submit, review, replicate or duplicate that changed the
+group.
+"""
+from django.db import transaction
+from django.db.models import Case, Max, Q, Value, When
+
+# Flag -> condition a version has to meet to count for it
+SYLLABUS_LATEST_FLAGS = {
+    "is_latest": None,
+    "is_latest_chair": Q(chair_submitted_at__isnull=False),
+    "is_latest_dean": Q(dean_submitted_at__isnull=False),
+    "is_latest_approved": Q(dean_approved_at__isnull=False),
+}
+
+TOS_LATEST_FLAGS = {
+    "is_latest": None,
+    "is_latest_chair": Q(chair_submitted_at__isnull=False),
+    "is_latest_approved": Q(chair_approved_at__isnull=False),
+}
+
+REPORT_LATEST_FLAGS = {
+    "is_latest": None,
+}
+
+
+def refresh_latest_flags(model, flags, **group):
+    """
+    Set each flag in ``flags`` on the versions of ``group`` (filter kwargs),
+    True on the highest version meeting the flag's condition and False on
+    the rest. Returns ``{flag: latest version or None}``.
+    """
+    with transaction.atomic():
+        rows = model.objects.filter(**group)
+        # Lock the group so concurrent version changes refresh one at a time
+        list(rows.select_for_update().values_list("pk", flat=True))
+
+        latest = rows.aggregate(**{
+            flag: Max("version", filter=condition) for flag, condition in flags.items()
+        })
+        rows.update(**{
+            flag: Value(False) if version is None
+            else Case(When(version=version, then=Value(True)), default=Value(False))
+            for flag, version in latest.items()
+        })
+    return latest
+
+
+def apply_latest_flags(instance, latest):
+    """Mirror the flags just written to the database on an in-memory ``instance``."""
+    for flag, version in latest.items():
+        setattr(instance, flag, version is not None and instance.version == version)
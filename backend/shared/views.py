@@ -11,7 +11,9 @@ from .pagination import ReportsPagination
 from .models import Deadline, Report, TOSReport
 from .serializers import DeadlineSerializer, ReportSerializer, TOSReportSerializer
 from academics.models import Department
-from users.models import User, UserRole 
+from users.access import get_access
+from search.indexing import matching_ids
+from users.models import User 
 from users.permissions import RolePermission
 
 # Viewsets
@@ -32,41 +34,25 @@ class DeadlineViewSet(viewsets.ModelViewSet):
                 raise ValidationError({"role": "Missing role query parameter."})
             
             if role and role.upper() == "ADMIN":
-                if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+                if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an Admin.")
                 return base_qs.order_by("-updated_at") 
 
             elif role and role.upper() == "DEAN":
-                try:
-                    dean_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="College",
-                        role__name="DEAN",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                dean_college_id = get_access(user).entity_id("DEAN", "College")
+                if dean_college_id is None:
                     raise PermissionDenied("You are not a Dean.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Dean roles found, please contact admin.") 
 
                 return base_qs.filter(
-                    college__id=dean_role.entity_id, 
+                    college__id=dean_college_id, 
                 ).order_by("-updated_at")[:5]
 
             elif role and role.upper() == "CHAIRPERSON":
-                try:
-                    chair_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="Department",
-                        role__name="Chairperson",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+                if chair_department_id is None:
                     raise PermissionDenied("You are not a Chairperson.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Chairperson roles found, please contact admin.")  
                             
-                department = Department.objects.get(id=chair_role.entity_id)  
+                department = Department.objects.get(id=chair_department_id)  
                 college_id = department.college.pk
 
                 return base_qs.filter(
@@ -74,7 +60,7 @@ class DeadlineViewSet(viewsets.ModelViewSet):
                 ).order_by("-updated_at")[:5]
 
             elif role and role.upper() == "BAYANIHAN_LEADER":
-                if not UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
+                if not user.has_role("BAYANIHAN_LEADER"):
                     raise PermissionDenied("You are not a Bayanihan Leader.")
                 return base_qs.order_by("-updated_at")[:5] 
             
@@ -99,7 +85,7 @@ class DeadlineViewSet(viewsets.ModelViewSet):
         user = request.user
         allowed_roles = ["BAYANIHAN_LEADER", "ADMIN", "DEAN"]
 
-        if not user.user_roles.filter(role__name__in=allowed_roles).exists():
+        if not get_access(user).has_role(*allowed_roles):
             return Response([], status=200)
 
         qs = Deadline.objects.filter(
@@ -170,78 +156,32 @@ class ReportViewSet(viewsets.ModelViewSet):
         # =========================
         if self.action in ["list"]:
             if role == "ADMIN":
-                if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+                if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an admin.")
 
                 # latest version per group
-                latest_version_subquery = (
-                    Report.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id")
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = base_qs.annotate(
-                    latest_version=Subquery(latest_version_subquery)
-                ).filter(version=F("latest_version"))
+                qs = base_qs.filter(is_latest=True)
                 
             elif role == "DEAN":
-                try:
-                    dean_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="College",
-                        role__name="DEAN",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                dean_college_id = get_access(user).entity_id("DEAN", "College")
+                if dean_college_id is None:
                     raise PermissionDenied("You are not a Dean.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Dean roles found, please contact admin.")
-
-                # Subquery: latest version with not null per group
-                latest_dean_version_subquery = (
-                    Report.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"), 
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
 
-                qs = base_qs.annotate(
-                    latest_dean_version=Subquery(latest_dean_version_subquery)
-                ).filter(
-                    syllabus__college__id=dean_role.entity_id,
-                    version=F("latest_dean_version"),
+                # latest version per group
+                qs = base_qs.filter(
+                    syllabus__college__id=dean_college_id,
+                    is_latest=True,
                 )
                 
             elif role == "CHAIRPERSON":
-                try:
-                    chair_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="Department",
-                        role__name="CHAIRPERSON",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+                if chair_department_id is None:
                     raise PermissionDenied("You are not a Chairperson.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Chairperson roles found, please contact admin.")
-
-                # Subquery: latest version with not null per group
-                latest_chair_version_subquery = (
-                    Report.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"), 
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
 
-                qs = base_qs.annotate(
-                    latest_chair_version=Subquery(latest_chair_version_subquery)
-                ).filter(
-                    syllabus__program__department__id=chair_role.entity_id,
-                    version=F("latest_chair_version"),
+                # latest version per group
+                qs = base_qs.filter(
+                    syllabus__program__department__id=chair_department_id,
+                    is_latest=True,
                 )
             else:
                 qs = base_qs
@@ -255,14 +195,11 @@ class ReportViewSet(viewsets.ModelViewSet):
             qs = qs.filter(bayanihan_group__school_year=filter_year) 
         
         if filter_course:
-            qs = qs.filter(
-                Q(bayanihan_group__course__course_title__icontains=filter_course) |
-                Q(bayanihan_group__course__course_code__icontains=filter_course)
-            )
+            qs = qs.filter(bayanihan_group__course_id__in=matching_ids("course", filter_course))
 
         if filter_semester:
             qs = qs.filter(
-                bayanihan_group__course__course_semester__iexact=filter_semester
+                bayanihan_group__course__course_semester=filter_semester.upper()
             ) 
 
         if filter_program:
@@ -373,64 +310,31 @@ class TOSReportViewSet(viewsets.ModelViewSet):
         # ROLE-BASED ACCESS — LATEST VERSION PER TERM
         # ============================================
         if self.action in ["list"]:
-            # Latest version subquery per (bayanihan_group, term)
-            latest_version_subquery = (
-                TOSReport.objects.filter(
-                    bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                    tos__term=OuterRef("tos__term"),
-                )
-                .order_by("-version")
-                .values("version")[:1]
-            )
-
             if role == "ADMIN":
-                if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+                if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an admin.")
 
-                qs = base_qs.annotate(
-                    latest_version=Subquery(latest_version_subquery)
-                ).filter(version=F("latest_version"))
+                # latest version per (bayanihan_group, term)
+                qs = base_qs.filter(is_latest=True)
 
             elif role == "DEAN":
-                try:
-                    dean_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="College",
-                        role__name="DEAN",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                dean_college_id = get_access(user).entity_id("DEAN", "College")
+                if dean_college_id is None:
                     raise PermissionDenied("You are not a Dean.")
 
-                qs = (
-                    base_qs.annotate(
-                        latest_version=Subquery(latest_version_subquery)
-                    )
-                    .filter(
-                        tos__program__department__college_id=dean_role.entity_id,
-                        version=F("latest_version"),
-                    )
+                qs = base_qs.filter(
+                    tos__program__department__college_id=dean_college_id,
+                    is_latest=True,
                 )
 
             elif role == "CHAIRPERSON":
-                try:
-                    chair_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="Department",
-                        role__name="CHAIRPERSON",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+                if chair_department_id is None:
                     raise PermissionDenied("You are not a Chairperson.")
 
-                qs = (
-                    base_qs.annotate(
-                        latest_version=Subquery(latest_version_subquery)
-                    )
-                    .filter(
-                        tos__program__department_id=chair_role.entity_id,
-                        version=F("latest_version"),
-                    )
+                qs = base_qs.filter(
+                    tos__program__department_id=chair_department_id,
+                    is_latest=True,
                 )
             else:
                 qs = base_qs
@@ -444,19 +348,16 @@ class TOSReportViewSet(viewsets.ModelViewSet):
             qs = qs.filter(bayanihan_group__school_year=filter_year) 
         
         if filter_course:
-            qs = qs.filter(
-                Q(bayanihan_group__course__course_title__icontains=filter_course) |
-                Q(bayanihan_group__course__course_code__icontains=filter_course)
-            )
+            qs = qs.filter(bayanihan_group__course_id__in=matching_ids("course", filter_course))
 
         if filter_semester:
             qs = qs.filter(
-                bayanihan_group__course__course_semester__iexact=filter_semester
+                bayanihan_group__course__course_semester=filter_semester.upper()
             ) 
             
         if filter_term:
             qs = qs.filter(
-                tos__term__iexact=filter_term
+                tos__term=filter_term.upper()
             ) 
 
         if filter_program:
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:18
+
+from django.db import migrations, models
+
+from shared.versioning import SYLLABUS_LATEST_FLAGS, refresh_latest_flags
+
+
+def backfill_latest_flags(apps, schema_editor):
+    Syllabus = apps.get_model("syllabi", "Syllabus")
+    for group_id in Syllabus.objects.values_list("bayanihan_group_id", flat=True).order_by().distinct():
+        refresh_latest_flags(Syllabus, SYLLABUS_LATEST_FLAGS, bayanihan_group_id=group_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syllabi', '0035_alter_reviewformtemplate_revision_no_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syllabus',
+            name='is_latest',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='syllabus',
+            name='is_latest_approved',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='syllabus',
+            name='is_latest_chair',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='syllabus',
+            name='is_latest_dean',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_latest_flags, migrations.RunPython.noop),
+    ]
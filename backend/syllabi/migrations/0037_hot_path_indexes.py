@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:29
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_hot_path_indexes'),
+        ('bayanihan', '0004_hot_path_indexes'),
+        ('syllabi', '0036_latest_version_flags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syllabus',
+            index=models.Index(fields=['bayanihan_group', 'version'], name='syllabus_group_version_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syllabus',
+            index=models.Index(django.db.models.functions.text.Lower('status'), name='syllabus_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syllabus',
+            index=models.Index(fields=['updated_at', 'id'], name='syllabus_updated_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from bdb import effective
 from time import timezone
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -98,12 +99,28 @@ class Syllabus(models.Model):
     status = models.CharField(max_length=50, blank=True, null=True)
     version = models.PositiveIntegerField() 
 
+    # Latest version of the group overall / submitted to chair / submitted to dean / approved,
+    # maintained by shared.signals
+    is_latest = models.BooleanField(default=False, editable=False, db_index=True)
+    is_latest_chair = models.BooleanField(default=False, editable=False, db_index=True)
+    is_latest_dean = models.BooleanField(default=False, editable=False, db_index=True)
+    is_latest_approved = models.BooleanField(default=False, editable=False, db_index=True)
+
     dean = models.JSONField(null=True, blank=True)
     chair = models.JSONField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["bayanihan_group", "version"], name="syllabus_group_version_idx"),
+            # status filters compare LOWER(status), see SyllabusViewSet
+            models.Index(Lower("status"), name="syllabus_status_idx"),
+            # keyset pagination order
+            models.Index(fields=["updated_at", "id"], name="syllabus_updated_idx"),
+        ]
+
     def __str__(self):
         return f"Syllabus v{self.version or '1'} for {self.course.course_code} - {self.course.course_semester} - {self.bayanihan_group.school_year}"
 
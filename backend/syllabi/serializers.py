@@ -495,22 +495,12 @@ class SyllabusDetailSerializer(serializers.ModelSerializer):
     dean_feedback = SyllabusDeanFeedbackReadSerializer(read_only=True) 
     review_form = SRFFormReadSerializer(read_only=True)
     
-    is_latest = serializers.SerializerMethodField()
     previous_version = serializers.SerializerMethodField()  # NEW
     
     class Meta:
         model = Syllabus
         fields = "__all__"  
 
-    def get_is_latest(self, obj):
-        latest_version = (
-            Syllabus.objects.filter(bayanihan_group_id=obj.bayanihan_group_id)
-            .order_by("-version")
-            .values_list("version", flat=True)
-            .first()
-        )
-        return obj.version == latest_version
-
     def get_previous_version(self, obj):
         prev_syllabus = (
             Syllabus.objects.filter(
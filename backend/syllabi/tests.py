@@ -1,3 +1,191 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from exports.benchmark import create_fixture
+from exports.cache import compute_fingerprint
+from exports.docx_tables import copo_table_xml
+from exports.html_docx import sanitize_html
+from exports.loaders import load_syllabus_export
+from exports.preview import render_preview
+from exports.renderers import get_export_object, render_syllabus_docx, store_documents
+from exports.singleflight import single_flight
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="syllabi-tests-")
+TESTDATA = os.path.join(os.path.dirname(__file__), "testdata")
+
+# The guarantee: load_syllabus_export runs 9 queries whatever the syllabus size.
+# One for the syllabus row and its FKs plus one per prefetched relation: peos,
+# program outcomes, course outcomes, CO-PO codes, instructors, leaders, outlines
+# and the outlines' CO links.
+EXPORT_LOADER_QUERIES = 9
+# A whole syllabus export adds get_export_object's fetch of the export source: 10.
+EXPORT_QUERIES = EXPORT_LOADER_QUERIES + 1
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SyllabusExportLoaderTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_query_count_does_not_grow_with_the_syllabus(self):
+        small, _ = create_fixture(outlines=2, cos=2, pos=3, signatories=1)
+        large, _ = create_fixture(outlines=24, cos=8, pos=12, signatories=4)
+
+        for syllabus in (small, large):
+            with self.assertNumQueries(EXPORT_LOADER_QUERIES):
+                load_syllabus_export(syllabus.pk)
+
+    def test_snapshot_is_fully_loaded(self):
+        syllabus, _ = create_fixture(outlines=6, cos=3, pos=4, signatories=2)
+        data = load_syllabus_export(syllabus.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(data.pk, syllabus.pk)
+            self.assertEqual(len(data.outlines), 6)
+            self.assertEqual(data.outlines[0][1], "CO1, CO2")
+            self.assertEqual(len(data.leaders), 2)
+            self.assertEqual([user.email for user in data.instructors], [user.email for user in data.leaders])
+            self.assertEqual(len(data.peos), 1)
+            self.assertEqual(len(data.program_outcomes), 4)
+            co, po = data.course_outcomes[0], data.program_outcomes[0]
+            self.assertEqual(data.copo_codes[(co.pk, po.pk)], ["I"])
+            self.assertNotIn((co.pk, data.program_outcomes[1].pk), data.copo_codes)
+            self.assertTrue(data.syllabus.program.department.department_name)
+
+    def test_render_uses_only_the_loader_queries(self):
+        syllabus, _ = create_fixture(outlines=12, cos=5, pos=10, signatories=3)
+        syllabus = get_export_object("syllabus", syllabus.pk)
+
+        with self.assertNumQueries(EXPORT_LOADER_QUERIES):
+            render_syllabus_docx(syllabus)
+
+    def test_whole_export_query_count(self):
+        small, _ = create_fixture(outlines=2, cos=2, pos=3, signatories=1)
+        large, _ = create_fixture(outlines=24, cos=8, pos=12, signatories=4)
+
+        for syllabus in (small, large):
+            with self.assertNumQueries(EXPORT_QUERIES):
+                render_syllabus_docx(get_export_object("syllabus", syllabus.pk))
+
+
+class CoPoTableXmlTests(SimpleTestCase):
+    """
+    ``copo_table_xml`` against golden output. The golden files were produced
+    by the python-docx builder it replaced (``manage.py benchmark_copo_table``
+    still has it and reports any difference).
+    """
+    CASES = {
+        "copo_table_3_pos.xml": {
+            "pos": ["a", "b", "c"],
+            "cos": [
+                ("CO1: Explain <parsers> & lexers", ["I", "", "E, D"]),
+                ("CO2:\tDesign\na compiler", ["", "D", ""]),
+            ],
+        },
+        "copo_table_1_po.xml": {"pos": ["a"], "cos": [("CO1: Analyze", ["I"])]},
+        "copo_table_no_pos.xml": {"pos": [], "cos": [("CO1: Analyze", [])]},
+        # Wider than 4": every column is scaled down
+        "copo_table_30_pos.xml": {
+            "pos": [f"{chr(97 + i % 26)}{i // 26 or ''}" for i in range(30)],
+            "cos": [
+                (f"CO{i + 1}: Outcome {i + 1}", ["I" if (i + j) % 2 else "" for j in range(30)])
+                for i in range(3)
+            ],
+        },
+    }
+
+    def golden(self, name):
+        with open(os.path.join(TESTDATA, name), encoding="utf-8") as f:
+            return f.read().rstrip("\n")
+
+    def test_matches_golden_output(self):
+        for name, copo in self.CASES.items():
+            with self.subTest(name):
+                self.assertEqual(copo_table_xml(copo), self.golden(name))
+
+    def test_output_is_well_formed(self):
+        copo = self.CASES["copo_table_3_pos.xml"]
+        tbl = parse_xml(copo_table_xml(copo).replace("<w:tbl>", f"<w:tbl {nsdecls('w')}>", 1))
+
+        rows = tbl.findall(f"{{{tbl.nsmap['w']}}}tr")
+        self.assertEqual(len(rows), 2 + len(copo["cos"]))
+        self.assertEqual(len(tbl.tblGrid.gridCol_lst), 1 + len(copo["pos"]))
+
+
+class PreviewSanitizeTests(SimpleTestCase):
+    """Rich text shown in the HTML preview keeps only what the DOCX converter supports."""
+
+    def test_scripts_and_handlers_are_removed(self):
+        html = sanitize_html(
+            '<p onclick="steal()">Read <a href="javascript:steal()">this</a>'
+            '<img src="x" onerror="steal()"></p><script>steal()</script>'
+            '<svg onload="steal()"></svg><iframe src="https://example.com"></iframe>'
+        )
+        self.assertEqual(html, "<p>Read this</p>")
+
+    def test_supported_formatting_is_kept(self):
+        html = sanitize_html(
+            '<p style="padding-left: 40px; background: url(javascript:x); color: #FF0000">'
+            "<strong>Bold</strong> <em>it</em> <u>u</u></p>"
+            '<ul><li>One</li></ul><table><tr><td colspan="2" valign="middle" data-x="1">Cell</td></tr></table>'
+        )
+        self.assertEqual(
+            html,
+            '<p style="padding-left: 40px; color: #FF0000"><strong>Bold</strong> <em>it</em> <u>u</u></p>'
+            '<ul><li>One</li></ul><table><tr><td colspan="2" valign="middle">Cell</td></tr></table>',
+        )
+
+    def test_text_is_escaped(self):
+        self.assertEqual(sanitize_html("1 &lt; 2 &amp; <b>3</b>"), "1 &lt; 2 &amp; <b>3</b>")
+        self.assertEqual(sanitize_html(""), "")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SyllabusPreviewTests(TestCase):
+    def test_course_requirements_are_sanitized(self):
+        syllabus, _ = create_fixture(outlines=1, cos=1, pos=1, signatories=0)
+        syllabus.course_requirements = '<p>Pass <img src="x" onerror="alert(1)"></p><script>alert(2)</script>'
+        syllabus.save()
+
+        html = render_preview("syllabus", get_export_object("syllabus", syllabus.pk))
+        self.assertIn("<p>Pass </p>", html)
+        self.assertNotIn("onerror", html)
+        self.assertNotIn("alert(2)", html)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BatchExportSingleFlightTests(TestCase):
+    def setUp(self):
+        syllabus, _ = create_fixture(outlines=1, cos=1, pos=1, signatories=0)
+        self.syllabus = get_export_object("syllabus", syllabus.pk)
+        fingerprint = compute_fingerprint("syllabus", self.syllabus, "")
+        self.key = f"syllabus:{self.syllabus.pk}:docx:{fingerprint}"
+
+    def test_file_stored_while_waiting_is_reused(self):
+        stored = "syllabi/stored.docx"
+        with mock.patch("exports.renderers.get_cached_document", side_effect=[None, stored]), \
+                mock.patch("exports.renderers.render_docx_file") as render:
+            self.assertEqual(store_documents([("syllabus", self.syllabus)], "docx"), [stored])
+        render.assert_not_called()
+
+    def test_miss_renders_under_its_lock(self):
+        def render(kind, obj, path):
+            # Another exporter of the same document has to wait
+            with self.assertLogs("exports.singleflight", "WARNING"):
+                with single_flight(self.key, timeout=0):
+                    pass
+            with open(path, "wb") as f:
+                f.write(b"docx")
+            return "batch.docx"
+
+        with mock.patch("exports.renderers.render_docx_file", side_effect=render):
+            [path] = store_documents([("syllabus", self.syllabus)], "docx")
+        self.assertTrue(path.startswith("syllabi/"), path)
@@ -4,17 +4,10 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.response import Response    
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import F, OuterRef, Subquery, Q, Count
+from django.db.models import Q, Count
+from django.db.models.functions import Lower
 from django.db import transaction
 from django.utils import timezone
-from django.http import FileResponse, JsonResponse
-from django.conf import settings 
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-from urllib.parse import urlsplit, urlunsplit
-import tempfile
-import requests
-import io
 
 from .models import  ( 
     Syllabus, 
@@ -58,45 +51,17 @@ from .pagination import SyllabiPagination
 from .utils.prefill_utils import get_prefill_value
 from auditlog.models import LogEntry
 from academics.models import PEO, ProgramOutcome 
-from bayanihan.models import BayanihanGroupUser, BayanihanGroup 
+from bayanihan.models import BayanihanGroup 
+from users.access import get_access
+from search.indexing import matching_ids
 from users.models import Role, UserRole
 from shared.models import Report
 
 from users.permissions import RolePermission
 
-import os
-import re
-from datetime import date
-from docxtpl import DocxTemplate, RichText, InlineImage, Subdoc  
-from docx.shared import Pt, Mm, Inches, RGBColor 
-from docx.enum.text import WD_ALIGN_PARAGRAPH 
-from docx.oxml.ns import qn, nsdecls 
-from docx.enum.table import WD_ALIGN_VERTICAL
-from urllib.parse import urlparse  
-from docx.oxml import parse_xml     
-import html as ihtml 
-from bs4.element import NavigableString 
-import html as ihtml
-from bs4 import BeautifulSoup 
-
-from tos.views import convert_docx_to_pdf
-import sys
-
-if sys.platform == "win32":
-    import pythoncom
-    from docx2pdf import convert
-else:
-    pythoncom = None
-    convert = None
-    
-import platform
-import subprocess
-
-def get_public_url(url: str):
-    parts = urlsplit(url)
-    # Remove querystring (signed params)
-    clean = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
-    return clean
+from exports.jobs import schedule_prerender
+from exports.throttles import ExportRateThrottle
+from exports.views import export_response, preview_response
 
 # Create your views here. 
 class SyllabusViewSet(viewsets.ModelViewSet):
@@ -129,129 +94,60 @@ class SyllabusViewSet(viewsets.ModelViewSet):
                 if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an admin.")
 
-                latest_sub = (
-                    Syllabus.objects.filter(bayanihan_group_id=OuterRef("bayanihan_group_id"))
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
-                    version=F("latest_version")
-                )   
+                qs = qs.filter(is_latest=True)
 
             # --- BAYANIHAN LEADER ---
             elif role == "BAYANIHAN_LEADER":
-                leader_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="LEADER"
-                ).values_list("group_id", flat=True)
+                leader_groups = get_access(user).group_ids("LEADER")
 
                 if not leader_groups:
                     raise PermissionDenied("You are not a leader in any Bayanihan group.")
 
-                latest_sub = (
-                    Syllabus.objects.filter(bayanihan_group_id=OuterRef("bayanihan_group_id"))
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
+                qs = qs.filter(
                     bayanihan_group_id__in=leader_groups,
-                    version=F("latest_version")
+                    is_latest=True,
                 )
 
             # --- BAYANIHAN TEACHER ---
             elif role == "BAYANIHAN_TEACHER":
-                teacher_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="TEACHER"
-                ).values_list("group_id", flat=True)
+                teacher_groups = get_access(user).group_ids("TEACHER")
 
                 if not teacher_groups:
                     raise PermissionDenied("You are not a teacher in any Bayanihan group.")
 
-                latest_sub = (
-                    Syllabus.objects.filter(bayanihan_group_id=OuterRef("bayanihan_group_id"))
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
+                qs = qs.filter(
                     bayanihan_group_id__in=teacher_groups,
-                    version=F("latest_version")
+                    is_latest=True,
                 )
 
             # --- CHAIRPERSON ---
             elif role == "CHAIRPERSON":
-                try:
-                    chair_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="Department",
-                        role__name="CHAIRPERSON",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+                if chair_department_id is None:
                     raise PermissionDenied("You are not a Chairperson.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Chairperson roles found. Contact admin.")
-
-                latest_sub = (
-                    Syllabus.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        chair_submitted_at__isnull=False,
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
 
-                qs = qs.annotate(latest_chair_version=Subquery(latest_sub)).filter(
-                    program__department_id=chair_role.entity_id,
-                    version=F("latest_chair_version")
+                qs = qs.filter(
+                    program__department_id=chair_department_id,
+                    is_latest_chair=True,
                 )
 
             # --- DEAN ---
             elif role == "DEAN":
-                try:
-                    dean_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="College",
-                        role__name="DEAN",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                dean_college_id = get_access(user).entity_id("DEAN", "College")
+                if dean_college_id is None:
                     raise PermissionDenied("You are not a Dean.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Dean roles found. Contact admin.")
-
-                latest_sub = (
-                    Syllabus.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        dean_submitted_at__isnull=False,
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
 
-                qs = qs.annotate(latest_dean_version=Subquery(latest_sub)).filter(
-                    college_id=dean_role.entity_id,
-                    version=F("latest_dean_version")
+                qs = qs.filter(
+                    college_id=dean_college_id,
+                    is_latest_dean=True,
                 )
 
             # --- AUDITOR ---
             elif role == "AUDITOR":
-                if not UserRole.objects.filter(user=user, role__name="AUDITOR").exists():
+                if not user.has_role("AUDITOR"):
                     raise PermissionDenied("You are not an Auditor.")
 
-                latest_sub = (
-                    Syllabus.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        dean_approved_at__isnull=False,
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
-                    version=F("latest_version")
-                )
+                qs = qs.filter(is_latest_approved=True)
 
             else:
                 raise PermissionDenied("Invalid role parameter.")
@@ -266,22 +162,19 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         search = self.request.GET.get("search")
 
         if year_level:
-            qs = qs.filter(course__course_year_level__iexact=year_level) 
+            qs = qs.filter(course__course_year_level=year_level.upper()) 
         if department:
             qs = qs.filter(program__department_id=department) 
         if program:
             qs = qs.filter(program_id=program)
         if semester:
-            qs = qs.filter(course__course_semester__iexact=semester)
+            qs = qs.filter(course__course_semester=semester.upper())
         if school_year:
-            qs = qs.filter(bayanihan_group__school_year__iexact=school_year)
+            qs = qs.filter(bayanihan_group__school_year=school_year.strip())
         if status:
-            qs = qs.filter(status__iexact=status)
+            qs = qs.alias(status_lower=Lower("status")).filter(status_lower=status.lower())
         if search:
-            qs = qs.filter(
-                Q(course__course_code__icontains=search)
-                | Q(course__course_title__icontains=search)
-            )
+            qs = qs.filter(course_id__in=matching_ids("course", search))
 
         # === Optional: return all if ?all=true (for dropdowns) ===
         if self.request.GET.get("all") == "true":
@@ -351,13 +244,11 @@ class SyllabusViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Role parameter is required.")
         role = role.upper()  # normalize 
         allowed = False 
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         # BAYANIHAN_LEADER can edit course_requirements only for syllabus that belong to their groups
-        elif role == "BAYANIHAN_LEADER" and UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+        elif role == "BAYANIHAN_LEADER" and user.has_role("BAYANIHAN_LEADER"):
+            leader_group_ids = get_access(user).group_ids("LEADER")
             if syllabus.bayanihan_group.id in leader_group_ids:
                 allowed = True
 
@@ -382,13 +273,11 @@ class SyllabusViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Role parameter is required.")
         role = role.upper()  # normalize
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         # BAYANIHAN_LEADER can submit only for their groups
-        elif role == "BAYANIHAN_LEADER" and UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+        elif role == "BAYANIHAN_LEADER" and user.has_role("BAYANIHAN_LEADER"):
+            leader_group_ids = get_access(user).group_ids("LEADER")
             if syllabus.bayanihan_group.id in leader_group_ids:
                 allowed = True
 
@@ -454,14 +343,10 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         department = syllabus.program.department 
         # ✅ Role-based permission check
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         elif role == "CHAIRPERSON":
-            chair_dept_ids = UserRole.objects.filter(
-                user=user,
-                entity_type="Department",
-                role__name="CHAIRPERSON",
-            ).values_list("entity_id", flat=True)
+            chair_dept_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
             if department.id in chair_dept_ids:
                 allowed = True
 
@@ -579,14 +464,10 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         syllabus = self.get_object()
         user = request.user  
         
-        if UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if user.has_role("ADMIN"):
             allowed = True
-        elif UserRole.objects.filter(user=user, role__name="DEAN").exists():
-            dean_college_ids = UserRole.objects.filter(
-                user=user,
-                entity_type="College",
-                role__name="DEAN",
-            ).values_list("entity_id", flat=True)
+        elif user.has_role("DEAN"):
+            dean_college_ids = get_access(user).entity_ids("DEAN", "College")
             if syllabus.college_id in dean_college_ids:
                 allowed = True
 
@@ -605,6 +486,9 @@ class SyllabusViewSet(viewsets.ModelViewSet):
             syllabus.dean_approved_at = timezone.now()
             syllabus.save()
 
+            # Render the final DOCX/PDF in the background so downloads hit the cache
+            schedule_prerender("syllabus", syllabus.pk)
+
         else:  # reject
             feedback_text = request.data.get("feedback_text")
             if not feedback_text:
@@ -673,12 +557,10 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         # ✅ Only Bayanihan Leader of that group (or Admin) can replicate
         role = request.query_params.get("role", "").upper()
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         elif role == "BAYANIHAN_LEADER":
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+            leader_group_ids = get_access(user).group_ids("LEADER")
             if syllabus.bayanihan_group_id in leader_group_ids:
                 allowed = True
 
@@ -804,7 +686,7 @@ class SyllabusViewSet(viewsets.ModelViewSet):
 
         # 2️⃣ Filter based on role
         if role == "ADMIN":
-            if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+            if not user.has_role("ADMIN"):
                 raise PermissionDenied("You are not an Admin.")
 
             qs = (
@@ -819,13 +701,11 @@ class SyllabusViewSet(viewsets.ModelViewSet):
             )
 
         elif role == "BAYANIHAN_LEADER":
-            if not UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
+            if not user.has_role("BAYANIHAN_LEADER"):
                 raise PermissionDenied("You are not a Bayanihan Leader.")
 
             # Verify user is a leader of this group
-            is_leader = BayanihanGroupUser.objects.filter(
-                user=user, group_id=bayanihan_group_id, role="LEADER"
-            ).exists()
+            is_leader = get_access(user).in_group(bayanihan_group_id, "LEADER")
 
             if not is_leader:
                 return Response(
@@ -880,12 +760,10 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         # ✅ Permission logic
         role = request.query_params.get("role", "").upper()
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         elif role == "BAYANIHAN_LEADER":
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+            leader_group_ids = get_access(user).group_ids("LEADER")
 
             # ✅ BAYANIHAN_LEADER may only duplicate to a group with the same course.id
             if target_group.id in leader_group_ids and target_group.course.id == syllabus.course.id:
@@ -1046,7 +924,7 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         
         # --- ADMIN ---
         if role == "ADMIN":
-            if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+            if not user.has_role("ADMIN"):
                 raise PermissionDenied("You are not an Admin.")
 
             qs = (
@@ -1059,12 +937,10 @@ class SyllabusViewSet(viewsets.ModelViewSet):
 
         # --- BAYANIHAN LEADER ---
         elif role == "BAYANIHAN_LEADER":
-            if not UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
+            if not user.has_role("BAYANIHAN_LEADER"):
                 raise PermissionDenied("You are not a Bayanihan Leader.")
 
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+            leader_group_ids = get_access(user).group_ids("LEADER")
 
             if not leader_group_ids:
                 return Response(
@@ -1108,1132 +984,33 @@ class SyllabusViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-    @action(detail=True, methods=["get"])
-    def export_docx(self, request, pk=None): 
-        is_windows = platform.system().lower() == "windows" 
-        if is_windows and pythoncom is not None:
-            pythoncom.CoInitialize() 
-           
-        # Converts signature to absolute urls (https:127.0.0.1:8000/media/signatures/signature_name.png)
-        def url_to_local_file(url):
-            """Convert absolute URL to local MEDIA_ROOT path."""
-            if not url:
-                return None
-
-            response = requests.get(url)
-            if response.status_code != 200:
-                return None
-
-            # Create a temporary file
-            suffix = os.path.splitext(url)[1] or ".png"
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            tmp_file.write(response.content)
-            tmp_file.flush()
-            tmp_file.close()
-            return tmp_file.name
-         
-        # Creates Course Outcomes Table in the Syllabus
-        def build_copo_table(doc, syllabus):
-            subdoc = Subdoc(doc)
-
-            po_list = list(syllabus.program_outcomes.all())
-            co_list = list(syllabus.course_outcomes.all())
-
-            # Create header row
-            table = subdoc.add_table(rows=2, cols=1 + len(po_list))
-            table.style = 'Table Grid'
-
-            # -----------------------------
-            # PAGE WIDTH
-            # -----------------------------
-            MAX_TABLE_WIDTH_INCH = 4    # usable page width
-            MAX_TABLE_WIDTH = Inches(MAX_TABLE_WIDTH_INCH)
-
-            # Desired widths (in inches)
-            DESIRED_CO_INCH = 1.5 
-            DESIRED_CODE_INCH = 0.1
-
-            # Total desired width in inches
-            desired_total_width_inch = DESIRED_CO_INCH + len(po_list) * DESIRED_CODE_INCH
-
-            # -----------------------------
-            # SCALE IF NEEDED
-            # -----------------------------
-            if desired_total_width_inch > MAX_TABLE_WIDTH_INCH:
-                scale_factor = MAX_TABLE_WIDTH_INCH / desired_total_width_inch
-            else:
-                scale_factor = 1.0
-
-            # Final widths (convert to EMUs & int)
-            CO_WIDTH = int(Inches(DESIRED_CO_INCH * scale_factor)) 
-            CODE_WIDTH = int(Inches(DESIRED_CODE_INCH * scale_factor))
-
-            # -----------------------------
-            # APPLY COLUMN WIDTHS
-            # -----------------------------
-            # 1st column: CO (big)
-            table.columns[0].width = CO_WIDTH
-
-            # Following columns:
-            # Row 1 = PO letter (medium)
-            # Row 2+ = CO-PO codes (tiny)
-            for idx in range(1, len(table.columns)):
-                table.columns[idx].width = CODE_WIDTH   # use code width for all body rows
-
-            # Helper for cell formatting
-            def set_cell_text(cell, text, bold=False, size=9, align_center=True, valign_center=True):
-                cell.text = text
-                for paragraph in cell.paragraphs:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER if align_center else WD_ALIGN_PARAGRAPH.LEFT
-                    run = paragraph.runs[0]
-                    run.font.name = 'Times New Roman'
-                    run.font.size = Pt(size)
-                    run.bold = bold
-                    rFonts = run._element.rPr.rFonts
-                    rFonts.set(qn('w:eastAsia'), 'Times New Roman')
-
-                # Vertical alignment
-                tc_pr = cell._tc.get_or_add_tcPr()
-                from docx.oxml import OxmlElement
-                vAlign = OxmlElement('w:vAlign')
-                vAlign.set(qn('w:val'), 'center')
-                tc_pr.append(vAlign)
-
-            # ----- HEADER ROWS -----
-            # CO header
-            co_cell = table.cell(0, 0)
-            co_cell.merge(table.cell(1, 0))
-            set_cell_text(co_cell, "Course Outcomes (CO)", bold=True)
-
-            # PO header merged
-            if po_list:
-                po_cell = table.cell(0, 1)
-                for idx in range(1, len(po_list)):
-                    po_cell.merge(table.cell(0, idx + 1))
-                set_cell_text(po_cell, "Program Outcomes (PO)", bold=True)
-
-            # PO code letters
-            for idx, po in enumerate(po_list):
-                cell = table.cell(1, idx + 1)
-                set_cell_text(cell, po.po_letter)
-
-            # ----- BODY ROWS -----
-            for co in co_list:
-                row_cells = table.add_row().cells
-
-                # CO description (left aligned)
-                set_cell_text(
-                    row_cells[0],
-                    f"{co.co_code}: {co.co_description}",
-                    align_center=False
-                )
-
-                # CO-PO codes
-                for idx, po in enumerate(po_list):
-                    codes = syllabus.syllcopos.filter(
-                        program_outcome=po,
-                        course_outcome=co
-                    ).values_list("syllabus_co_po_code", flat=True)
-
-                    cell_text = ", ".join(codes) if codes else ""
-                    set_cell_text(row_cells[idx + 1], cell_text)
-
-            return subdoc
-
-        # Preprocesses Course Requirement HTML data
-        def preprocess_html(raw_html: str) -> str:
-            """Clean up quirks in HTML exported from Word/TinyMCE."""
-            if not raw_html:
-                return ""
-
-            # Decode entities using html module
-            cleaned = ihtml.unescape(raw_html)
-
-            # Apply PHP-like replacements
-            replacements = [
-                ("andbull;", "•"),   # fix bullet entity
-                ("&bull;", "•"),     # also normal bull
-                ("&nbsp;", ""),      # strip non-breaking spaces
-                ("&", "and"),        # replace stray ampersands
-                ("/n", "<br/>"),     # normalize line breaks
-                ("andrsquo;", "'"),  # right single quote
-                ("andndash;", "-"),  # dash
-            ]
-            for old, new in replacements:
-                cleaned = cleaned.replace(old, new)
-
-            return cleaned
-        
-        # Iterates Course Requirements HTML data and converts it to Docx elements 
-        def html_to_subdoc(doc, raw_html):
-            """
-            Convert TinyMCE / Word HTML into a python-docx Subdoc,
-            preserving bold, italic, underline, lists, and tables.
-            """
-            subdoc = Subdoc(doc)
-            if not raw_html:
-                return subdoc
-
-            soup = BeautifulSoup(raw_html, "html.parser")
-            
-            def get_padding_left_in_inches(elem):
-                style = elem.get("style", "")
-                match = re.search(r"padding-left\s*:\s*(\d+)px", style)
-                if match:
-                    px = int(match.group(1))
-                    # Approx conversion: 96 px = 1 inch
-                    return px / 96
-                return 0
-
-            def apply_cell_style(cell, td_elem):
-                # Background color
-                style = td_elem.attrs.get("style", "")
-                match_bg = re.search(r'background-color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                if match_bg:
-                    color = match_bg.group(1)
-                    shading_elm = parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), color))
-                    cell._tc.get_or_add_tcPr().append(shading_elm)
-                    
-                # Text color
-                match_color = re.search(r'color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                if match_color:
-                    hex_color = match_color.group(1)
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.font.color.rgb = RGBColor.from_string(hex_color)
-
-                # Text alignment
-                align = re.search(r'text-align\s*:\s*(\w+)', style)
-                if align:
-                    if align.group(1).lower() == 'center':
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    elif align.group(1).lower() == 'right':
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    else:
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-
-                # Vertical alignment
-                valign = td_elem.attrs.get("valign", "").lower()
-                if valign == "middle":
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                elif valign == "bottom":
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.BOTTOM
-                else:
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-
-                # ----------------- Table cell border -----------------
-                border_color = re.search(r'border-color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                border_width = re.search(r'border\s*:\s*(\d+)px', style)  # simple px parsing
-                if border_color or border_width:
-                    tc_pr = cell._tc.get_or_add_tcPr()
-                    sz = int(border_width.group(1))*4 if border_width else 4
-                    color = border_color.group(1) if border_color else "000000"
-
-                    borders_xml = f'''
-                    <w:tcBorders {nsdecls('w')}>
-                    <w:top w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:left w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:bottom w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:right w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    </w:tcBorders>
-                    '''
-                    tc_pr.append(parse_xml(borders_xml))
-                    
-            # ----------------- Helper: Recursive inline rendering -----------------
-            def render_inline(parent_para, elem, bold=False, italic=False, underline=False, color=None):
-                if isinstance(elem, NavigableString):
-                    run = parent_para.add_run(str(elem))
-                    run.bold = bold
-                    run.italic = italic
-                    run.underline = underline
-                    run.font.size = Pt(10)
-                    run.font.name = "Times New Roman"
-                    rFonts = run._element.rPr.rFonts
-                    rFonts.set(qn('w:eastAsia'), 'Times New Roman')
-                    if color:
-                        run.font.color.rgb = RGBColor.from_string(color)
-                elif hasattr(elem, "name"):
-                    # Update formatting based on current tag
-                    new_bold = bold or elem.name in ["b", "strong"]
-                    new_italic = italic or elem.name in ["i", "em"]
-                    new_underline = underline or elem.name == "u"
-
-                    # Check inline style
-                    style = elem.attrs.get("style", "").lower()
-                    inline_color = None
-                    match_color = re.search(r'color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                    if match_color:
-                        inline_color = match_color.group(1)
-                        
-                    if "font-weight: bold" in style:
-                        new_bold = True
-                    if "font-style: italic" in style:
-                        new_italic = True
-                    if "text-decoration: underline" in style:
-                        new_underline = True
-
-                    if elem.name == "br":
-                        parent_para.add_run().add_break()
-
-                    for child in elem.children:
-                        render_inline(parent_para, child, new_bold, new_italic, new_underline, inline_color or color)
-
-            # ----------------- Helper: Process lists recursively -----------------
-            def process_list(list_elem, level=0):
-                items = list_elem.find_all("li", recursive=False)
-                for idx, li in enumerate(items, start=1):
-                    p = subdoc.add_paragraph()
-                    # Indentation for nesting
-                    p.paragraph_format.left_indent = Inches(get_padding_left_in_inches(li))
-                    p.paragraph_format.first_line_indent = Inches(-0.2)
-                    p.paragraph_format.space_after = Pt(0)
-
-                    # Bullet or number prefix
-                    prefix = "• " if list_elem.name == "ul" else f"{idx}. "
-                    run = p.add_run(prefix)
-                    run.font.size = Pt(10)
-
-                    # Render li text + inline formatting recursively
-                    for child in li.contents:
-                        render_inline(p, child)
-
-                    # Handle nested lists inside this li
-                    for child_list in li.find_all(["ul", "ol"], recursive=False):
-                        process_list(child_list, level + 1)
-
-            # ----------------- Helper: Render table -----------------
-            def render_table(table_elem):
-                rows = table_elem.find_all("tr", recursive=True)
-                if not rows:
-                    return None
-
-                # Calculate max columns considering colspan
-                n_cols = 0
-                for r in rows:
-                    col_count = 0
-                    for td in r.find_all(["td", "th"], recursive=False):
-                        col_count += int(td.get("colspan", 1))
-                    n_cols = max(n_cols, col_count)
-
-                table = subdoc.add_table(rows=len(rows), cols=n_cols)
-                table.style = "Table Grid"
-                # Remove table border if specified
-                table_style = table_elem.get("style", "").lower()
-                if "border:none" in table_style or "border-width:0" in table_style:
-                    tbl = table._tbl
-                    tblPr = tbl.tblPr
-                    tblBorders = tblPr.tblBorders
-                    if tblBorders is not None:
-                        tblPr.remove(tblBorders)
-
-                # Track merged cells positions
-                merge_map = [[None for _ in range(n_cols)] for _ in range(len(rows))]
-
-                for r_idx, row in enumerate(rows):
-                    c_idx = 0
-                    for td in row.find_all(["td", "th"], recursive=False):
-                        # Find next available column (skip merged cells)
-                        while c_idx < n_cols and merge_map[r_idx][c_idx]:
-                            c_idx += 1
-
-                        colspan = int(td.get("colspan", 1))
-                        rowspan = int(td.get("rowspan", 1))
-                        start_cell = table.cell(r_idx, c_idx)
-                        start_cell.text = ""
-
-                        apply_cell_style(start_cell, td)
-                        para = start_cell.paragraphs[0]
-
-                        # Render inline content inside cell
-                        for child in td.children:
-                            if getattr(child, "name", None) == "table":
-                                render_table(child)  # nested table
-                            else:
-                                render_inline(para, child)
-
-                        # Merge cells if colspan or rowspan > 1
-                        if colspan > 1 or rowspan > 1:
-                            end_row = r_idx + rowspan - 1
-                            end_col = c_idx + colspan - 1
-                            end_cell = table.cell(end_row, end_col)
-                            start_cell.merge(end_cell)
-
-                            # Mark merged cells in the map
-                            for mr in range(r_idx, r_idx + rowspan):
-                                for mc in range(c_idx, c_idx + colspan):
-                                    merge_map[mr][mc] = True # type: ignore
-
-                        c_idx += colspan
-                return table 
-
-            # ----------------- Main loop over top-level elements -----------------
-            for elem in soup.children:
-                if isinstance(elem, NavigableString):
-                    if str(elem).strip():
-                        p = subdoc.add_paragraph(str(elem).strip())
-                elif getattr(elem, "name", None) == "p":
-                    p = subdoc.add_paragraph()
-                    indent = Inches(get_padding_left_in_inches(elem))
-                    p.paragraph_format.left_indent = indent
-                    p.paragraph_format.first_line_indent = Inches(-0.2 if str(elem).strip().startswith("●") else 0)
-                    p.paragraph_format.space_after = Pt(0)
-
-                    # Add bullet prefix if the paragraph starts with "●"
-                    text_content = "".join(str(c) for c in getattr(elem, "contents", []))
-                    if text_content.strip().startswith("●"):
-                        run = p.add_run("• ")
-                        run.font.size = Pt(10)
-                        # remove bullet character from text
-                        elem.contents[0].replace_with(str(elem.contents[0]).replace("●", "", 1)) # type: ignore
-
-                    for child in getattr(elem, "contents", []):
-                        render_inline(p, child)
-                elif getattr(elem, "name", None) in ["ul", "ol"]:
-                    process_list(elem)
-                elif getattr(elem, "name", None) == "table":
-                    render_table(elem)
-
-            return subdoc
-
-        try:
-            syllabus = self.get_object() 
-
-            # 1. Load your DOCX template
-            template_path = os.path.join(settings.BASE_DIR, "syllabi", "templates", "SyllabusTemp.docx")
-            doc = DocxTemplate(template_path)
-            
-            # ---------- Build CO–PO Table as HTML ----------  
-            copo_subdoc = build_copo_table(doc, syllabus)
-
-            # ---------- Build Course Outline Data ----------
-            outline_rows_mid = []
-            outline_rows_final = []     
-            
-            for outline in syllabus.course_outlines.all():
-                # Collect all CO codes linked to this outline
-                co_codes = ", ".join(
-                    cotco.course_outcome.co_code
-                    for cotco in outline.cotcos.select_related("course_outcome").all()
-                )
-                row = {
-                    "allotted_time": f"{outline.allotted_hour or ''} hours, {outline.allotted_time or ''}".strip(),
-                    "co_code": co_codes or "",
-                    "ilo": outline.intended_learning or "",
-                    "topics": outline.topics or "",
-                    "readings": outline.suggested_readings or "",
-                    "activities": outline.learning_activities or "",
-                    "assessment": outline.assessment_tools or "",
-                    "grading": outline.grading_criteria or "",
-                    "remarks": outline.remarks or "",
-                }
-
-                if outline.syllabus_term == "MIDTERM":
-                    outline_rows_mid.append(row)
-                elif outline.syllabus_term == "FINALS":
-                    outline_rows_final.append(row)   
-    
-            # ---------- Build Course Requirements Data ----------
-            req_html = syllabus.course_requirements or ""
-            course_requirements_subdoc = html_to_subdoc(doc, req_html)  
-            
-            # --- Bayanihan Leaders ----   
-            leaders = [
-                m for m in syllabus.bayanihan_group.bayanihan_members.all()
-                if m.role == "LEADER"
-            ]
-            leaders_context = []
-            for m in leaders:
-                sig_url = getattr(m.user, "signature", None) 
-                clean_url = get_public_url(sig_url.url) if sig_url else None
-                
-                local_sig_path = url_to_local_file(clean_url) if clean_url else None
-                    
-                # sig_path = sig_url.url if sig_url else None
-                leaders_context.append({
-                    "fname": m.user.first_name,
-                    "lname": m.user.last_name,
-                    "signature": InlineImage(doc, local_sig_path , width=Mm(20)) if local_sig_path  else "",
-                })   
-
-            # --- Chairperson ---
-            chair_name = syllabus.chair.get("name") if syllabus.chair else ""
-            chair_sig_url = syllabus.chair.get("signature") if syllabus.chair else None
-            chair_sig_path = url_to_local_file(chair_sig_url) if chair_sig_url else None
-            chair_signature = InlineImage(doc, chair_sig_path, width=Mm(20)) if chair_sig_path else ""
-
-            # --- Dean ---
-            dean_name = syllabus.dean.get("name") if syllabus.dean else ""
-            dean_sig_url = syllabus.dean.get("signature") if syllabus.dean else None
-            dean_sig_path = url_to_local_file(dean_sig_url) if dean_sig_url else None
-            dean_signature = InlineImage(doc, dean_sig_path, width=Mm(20)) if dean_sig_path else ""
-
-            # 2. Prepare context with syllabus fields
-            context = {
-                "version": (
-                    f"{int(syllabus.syllabus_template.revision_no):02d}"
-                    if syllabus.syllabus_template and syllabus.syllabus_template.revision_no is not None
-                    else ""
-                ),
-                "effective_date": syllabus.effective_date.strftime("%m.%d.%y") if syllabus.effective_date else "",
-                "college_description": syllabus.college.college_description if syllabus.college else "",
-                "department_name": syllabus.program.department.department_name if syllabus.program.department else "",
-                "peos": syllabus.peos.all(),
-                "pos": syllabus.program_outcomes.all(),
-                "course_title": syllabus.course.course_title,
-                "course_code": syllabus.course.course_code,
-                "course_semester": syllabus.course.course_semester.lower(),
-                "school_year": syllabus.bayanihan_group.school_year,  
-                "course_description": syllabus.course_description,
-                "class_schedules": syllabus.class_schedules,
-                "building_room": syllabus.building_room,
-                "course_pre_req": syllabus.course.course_pre_req,
-                "course_co_req": syllabus.course.course_co_req,
-                "consultation_hours": syllabus.consultation_hours,
-                "consultation_room": syllabus.consultation_room,
-                "consultation_contact": syllabus.consultation_contact,
-                "instructor_names": ", ".join(i.user.get_full_name() for i in syllabus.instructors.all()),
-                "instructor_emails": ", ".join(i.user.email for i in syllabus.instructors.all()), 
-                "class_contact": syllabus.class_contact,
-                "course_credit_unit": syllabus.course.course_credit_unit,
-                "course_unit_lec": syllabus.course.course_unit_lec,
-                "course_unit_lab": syllabus.course.course_unit_lab,
-                "course_semester": syllabus.course.course_semester,
-
-                # Special placeholders
-                "copo": copo_subdoc,
-                "course_outlines_mid": outline_rows_mid, 
-                "course_outlines_final": outline_rows_final, 
-                "course_requirements": course_requirements_subdoc,
-                
-                # Signatories
-                "leaders": leaders_context, 
-                "chair": chair_name,
-                "chair_signature": chair_signature,
-                "dept": syllabus.program.department.department_code if syllabus.program.department else "",
-                "dean": dean_name,
-                "dean_signature": dean_signature,
-                "college": syllabus.college.college_code if syllabus.college else "",
-            }
-
-            # 3. Render the DOCX with data
-            doc.render(context)
-            
-            timestamp = syllabus.dean_approved_at.strftime("%Y-%m-%d") if syllabus.dean_approved_at else "NA"
-            filename_docx = f"Syllabus-{syllabus.course.course_code}-{syllabus.course.course_semester.lower()} Semester-{syllabus.bayanihan_group.school_year}-{syllabus.status}-{timestamp}.docx"
-            
-            file_bytes = io.BytesIO()
-            doc.save(file_bytes)
-            file_bytes.seek(0)
-
-            docx_path = default_storage.save(
-                f"syllabi/{filename_docx}",
-                ContentFile(file_bytes.read())
-            )
-
-            docx_url = default_storage.url(docx_path)
-
-            return JsonResponse({"docx_url": docx_url})
-        
-            # filename_pdf = filename_docx.replace(".docx", ".pdf")  
-
-            # # Use a temp directory so we can run LibreOffice/win32com conversion
-            # with tempfile.TemporaryDirectory() as tmpdir:
-            #     temp_docx = os.path.join(tmpdir, filename_docx)
-            #     temp_pdf = os.path.join(tmpdir, filename_pdf)
-
-            #     # Save generated .docx locally for conversion
-            #     doc.save(temp_docx)
-
-            #     # Convert DOCX -> PDF
-            #     convert_docx_to_pdf(temp_docx, temp_pdf)
-
-            #     # Read PDF file
-            #     with open(temp_pdf, "rb") as f:
-            #         pdf_bytes = f.read()
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def export_docx(self, request, pk=None):
+        syllabus = self.get_object()
+        return export_response(request, "syllabus", syllabus, "docx")
 
-            #     # Upload to DigitalOcean Spaces
-            #     pdf_path = default_storage.save(
-            #         f"syllabi/{filename_pdf}",  # folder inside bucket
-            #         ContentFile(pdf_bytes)
-            #     )
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def export_pdf(self, request, pk=None):
+        syllabus = self.get_object()
+        return export_response(request, "syllabus", syllabus, "pdf")
 
-            # # Get the public URL for the browser to download
-            # pdf_url = default_storage.url(pdf_path)
- 
-            # # 9️⃣ Return PDF as HTTP response
-            # return JsonResponse({"pdf_url": pdf_url}) 
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf") 
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def export_packet_docx(self, request, pk=None):
+        # Syllabus + approved TOS (Prelim to Finals) + review form in one document
+        syllabus = self.get_object()
+        return export_response(request, "packet", syllabus, "docx")
 
-            # # 4. Convert DOCX → PDF
-            # convert_docx_to_pdf(output_docx, output_pdf)  # works on Windows
-            # # Alternative (Linux/macOS): os.system(f"libreoffice --headless --convert-to pdf {output_docx} --outdir {settings.MEDIA_ROOT}")
-            
-            # # 5. Return the PDF file as HTTP response
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf") 
-            
-        finally:
-            if is_windows and pythoncom is not None:
-                pythoncom.CoUninitialize()
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def export_packet_pdf(self, request, pk=None):
+        syllabus = self.get_object()
+        return export_response(request, "packet", syllabus, "pdf")
 
     @action(detail=True, methods=["get"])
-    def export_pdf(self, request, pk=None): 
-        is_windows = platform.system().lower() == "windows" 
-        if is_windows and pythoncom is not None:
-            pythoncom.CoInitialize() 
-           
-        # Converts signature to absolute urls (https:127.0.0.1:8000/media/signatures/signature_name.png)
-        def url_to_local_file(url):
-            """Convert absolute URL to local MEDIA_ROOT path."""
-            if not url:
-                return None
-
-            response = requests.get(url)
-            if response.status_code != 200:
-                return None
-
-            # Create a temporary file
-            suffix = os.path.splitext(url)[1] or ".png"
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            tmp_file.write(response.content)
-            tmp_file.flush()
-            tmp_file.close()
-            return tmp_file.name
-         
-        # Creates Course Outcomes Table in the Syllabus
-        def build_copo_table(doc, syllabus):
-            subdoc = Subdoc(doc)
-
-            po_list = list(syllabus.program_outcomes.all())
-            co_list = list(syllabus.course_outcomes.all())
-
-            # Create header row
-            table = subdoc.add_table(rows=2, cols=1 + len(po_list))
-            table.style = 'Table Grid'
-
-            # -----------------------------
-            # PAGE WIDTH
-            # -----------------------------
-            MAX_TABLE_WIDTH_INCH = 4    # usable page width
-            MAX_TABLE_WIDTH = Inches(MAX_TABLE_WIDTH_INCH)
-
-            # Desired widths (in inches)
-            DESIRED_CO_INCH = 1.5 
-            DESIRED_CODE_INCH = 0.1
-
-            # Total desired width in inches
-            desired_total_width_inch = DESIRED_CO_INCH + len(po_list) * DESIRED_CODE_INCH
-
-            # -----------------------------
-            # SCALE IF NEEDED
-            # -----------------------------
-            if desired_total_width_inch > MAX_TABLE_WIDTH_INCH:
-                scale_factor = MAX_TABLE_WIDTH_INCH / desired_total_width_inch
-            else:
-                scale_factor = 1.0
-
-            # Final widths (convert to EMUs & int)
-            CO_WIDTH = int(Inches(DESIRED_CO_INCH * scale_factor)) 
-            CODE_WIDTH = int(Inches(DESIRED_CODE_INCH * scale_factor))
-
-            # -----------------------------
-            # APPLY COLUMN WIDTHS
-            # -----------------------------
-            # 1st column: CO (big)
-            table.columns[0].width = CO_WIDTH
-
-            # Following columns:
-            # Row 1 = PO letter (medium)
-            # Row 2+ = CO-PO codes (tiny)
-            for idx in range(1, len(table.columns)):
-                table.columns[idx].width = CODE_WIDTH   # use code width for all body rows
-
-            # Helper for cell formatting
-            def set_cell_text(cell, text, bold=False, size=9, align_center=True, valign_center=True):
-                cell.text = text
-                for paragraph in cell.paragraphs:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER if align_center else WD_ALIGN_PARAGRAPH.LEFT
-                    run = paragraph.runs[0]
-                    run.font.name = 'Times New Roman'
-                    run.font.size = Pt(size)
-                    run.bold = bold
-                    rFonts = run._element.rPr.rFonts
-                    rFonts.set(qn('w:eastAsia'), 'Times New Roman')
-
-                # Vertical alignment
-                tc_pr = cell._tc.get_or_add_tcPr()
-                from docx.oxml import OxmlElement
-                vAlign = OxmlElement('w:vAlign')
-                vAlign.set(qn('w:val'), 'center')
-                tc_pr.append(vAlign)
-
-            # ----- HEADER ROWS -----
-            # CO header
-            co_cell = table.cell(0, 0)
-            co_cell.merge(table.cell(1, 0))
-            set_cell_text(co_cell, "Course Outcomes (CO)", bold=True)
-
-            # PO header merged
-            if po_list:
-                po_cell = table.cell(0, 1)
-                for idx in range(1, len(po_list)):
-                    po_cell.merge(table.cell(0, idx + 1))
-                set_cell_text(po_cell, "Program Outcomes (PO)", bold=True)
-
-            # PO code letters
-            for idx, po in enumerate(po_list):
-                cell = table.cell(1, idx + 1)
-                set_cell_text(cell, po.po_letter)
-
-            # ----- BODY ROWS -----
-            for co in co_list:
-                row_cells = table.add_row().cells
-
-                # CO description (left aligned)
-                set_cell_text(
-                    row_cells[0],
-                    f"{co.co_code}: {co.co_description}",
-                    align_center=False
-                )
-
-                # CO-PO codes
-                for idx, po in enumerate(po_list):
-                    codes = syllabus.syllcopos.filter(
-                        program_outcome=po,
-                        course_outcome=co
-                    ).values_list("syllabus_co_po_code", flat=True)
-
-                    cell_text = ", ".join(codes) if codes else ""
-                    set_cell_text(row_cells[idx + 1], cell_text)
-
-            return subdoc
-
-        # Preprocesses Course Requirement HTML data
-        def preprocess_html(raw_html: str) -> str:
-            """Clean up quirks in HTML exported from Word/TinyMCE."""
-            if not raw_html:
-                return ""
-
-            # Decode entities using html module
-            cleaned = ihtml.unescape(raw_html)
-
-            # Apply PHP-like replacements
-            replacements = [
-                ("andbull;", "•"),   # fix bullet entity
-                ("&bull;", "•"),     # also normal bull
-                ("&nbsp;", ""),      # strip non-breaking spaces
-                ("&", "and"),        # replace stray ampersands
-                ("/n", "<br/>"),     # normalize line breaks
-                ("andrsquo;", "'"),  # right single quote
-                ("andndash;", "-"),  # dash
-            ]
-            for old, new in replacements:
-                cleaned = cleaned.replace(old, new)
-
-            return cleaned
-        
-        # Iterates Course Requirements HTML data and converts it to Docx elements 
-        def html_to_subdoc(doc, raw_html):
-            """
-            Convert TinyMCE / Word HTML into a python-docx Subdoc,
-            preserving bold, italic, underline, lists, and tables.
-            """
-            subdoc = Subdoc(doc)
-            if not raw_html:
-                return subdoc
-
-            soup = BeautifulSoup(raw_html, "html.parser")
-            
-            def get_padding_left_in_inches(elem):
-                style = elem.get("style", "")
-                match = re.search(r"padding-left\s*:\s*(\d+)px", style)
-                if match:
-                    px = int(match.group(1))
-                    # Approx conversion: 96 px = 1 inch
-                    return px / 96
-                return 0
-
-            def apply_cell_style(cell, td_elem):
-                # Background color
-                style = td_elem.attrs.get("style", "")
-                match_bg = re.search(r'background-color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                if match_bg:
-                    color = match_bg.group(1)
-                    shading_elm = parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), color))
-                    cell._tc.get_or_add_tcPr().append(shading_elm)
-                    
-                # Text color
-                match_color = re.search(r'color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                if match_color:
-                    hex_color = match_color.group(1)
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.font.color.rgb = RGBColor.from_string(hex_color)
-
-                # Text alignment
-                align = re.search(r'text-align\s*:\s*(\w+)', style)
-                if align:
-                    if align.group(1).lower() == 'center':
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    elif align.group(1).lower() == 'right':
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    else:
-                        for p in cell.paragraphs:
-                            p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-
-                # Vertical alignment
-                valign = td_elem.attrs.get("valign", "").lower()
-                if valign == "middle":
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                elif valign == "bottom":
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.BOTTOM
-                else:
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-
-                # ----------------- Table cell border -----------------
-                border_color = re.search(r'border-color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                border_width = re.search(r'border\s*:\s*(\d+)px', style)  # simple px parsing
-                if border_color or border_width:
-                    tc_pr = cell._tc.get_or_add_tcPr()
-                    sz = int(border_width.group(1))*4 if border_width else 4
-                    color = border_color.group(1) if border_color else "000000"
-
-                    borders_xml = f'''
-                    <w:tcBorders {nsdecls('w')}>
-                    <w:top w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:left w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:bottom w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    <w:right w:val="single" w:sz="{sz}" w:color="{color}"/>
-                    </w:tcBorders>
-                    '''
-                    tc_pr.append(parse_xml(borders_xml))
-                    
-            # ----------------- Helper: Recursive inline rendering -----------------
-            def render_inline(parent_para, elem, bold=False, italic=False, underline=False, color=None):
-                if isinstance(elem, NavigableString):
-                    run = parent_para.add_run(str(elem))
-                    run.bold = bold
-                    run.italic = italic
-                    run.underline = underline
-                    run.font.size = Pt(10)
-                    run.font.name = "Times New Roman"
-                    rFonts = run._element.rPr.rFonts
-                    rFonts.set(qn('w:eastAsia'), 'Times New Roman')
-                    if color:
-                        run.font.color.rgb = RGBColor.from_string(color)
-                elif hasattr(elem, "name"):
-                    # Update formatting based on current tag
-                    new_bold = bold or elem.name in ["b", "strong"]
-                    new_italic = italic or elem.name in ["i", "em"]
-                    new_underline = underline or elem.name == "u"
-
-                    # Check inline style
-                    style = elem.attrs.get("style", "").lower()
-                    inline_color = None
-                    match_color = re.search(r'color\s*:\s*#?([0-9a-fA-F]{6})', style)
-                    if match_color:
-                        inline_color = match_color.group(1)
-                        
-                    if "font-weight: bold" in style:
-                        new_bold = True
-                    if "font-style: italic" in style:
-                        new_italic = True
-                    if "text-decoration: underline" in style:
-                        new_underline = True
-
-                    if elem.name == "br":
-                        parent_para.add_run().add_break()
-
-                    for child in elem.children:
-                        render_inline(parent_para, child, new_bold, new_italic, new_underline, inline_color or color)
-
-            # ----------------- Helper: Process lists recursively -----------------
-            def process_list(list_elem, level=0):
-                items = list_elem.find_all("li", recursive=False)
-                for idx, li in enumerate(items, start=1):
-                    p = subdoc.add_paragraph()
-                    # Indentation for nesting
-                    p.paragraph_format.left_indent = Inches(get_padding_left_in_inches(li))
-                    p.paragraph_format.first_line_indent = Inches(-0.2)
-                    p.paragraph_format.space_after = Pt(0)
-
-                    # Bullet or number prefix
-                    prefix = "• " if list_elem.name == "ul" else f"{idx}. "
-                    run = p.add_run(prefix)
-                    run.font.size = Pt(10)
-
-                    # Render li text + inline formatting recursively
-                    for child in li.contents:
-                        render_inline(p, child)
-
-                    # Handle nested lists inside this li
-                    for child_list in li.find_all(["ul", "ol"], recursive=False):
-                        process_list(child_list, level + 1)
-
-            # ----------------- Helper: Render table -----------------
-            def render_table(table_elem):
-                rows = table_elem.find_all("tr", recursive=True)
-                if not rows:
-                    return None
-
-                # Calculate max columns considering colspan
-                n_cols = 0
-                for r in rows:
-                    col_count = 0
-                    for td in r.find_all(["td", "th"], recursive=False):
-                        col_count += int(td.get("colspan", 1))
-                    n_cols = max(n_cols, col_count)
-
-                table = subdoc.add_table(rows=len(rows), cols=n_cols)
-                table.style = "Table Grid"
-                # Remove table border if specified
-                table_style = table_elem.get("style", "").lower()
-                if "border:none" in table_style or "border-width:0" in table_style:
-                    tbl = table._tbl
-                    tblPr = tbl.tblPr
-                    tblBorders = tblPr.tblBorders
-                    if tblBorders is not None:
-                        tblPr.remove(tblBorders)
-
-                # Track merged cells positions
-                merge_map = [[None for _ in range(n_cols)] for _ in range(len(rows))]
-
-                for r_idx, row in enumerate(rows):
-                    c_idx = 0
-                    for td in row.find_all(["td", "th"], recursive=False):
-                        # Find next available column (skip merged cells)
-                        while c_idx < n_cols and merge_map[r_idx][c_idx]:
-                            c_idx += 1
-
-                        colspan = int(td.get("colspan", 1))
-                        rowspan = int(td.get("rowspan", 1))
-                        start_cell = table.cell(r_idx, c_idx)
-                        start_cell.text = ""
-
-                        apply_cell_style(start_cell, td)
-                        para = start_cell.paragraphs[0]
-
-                        # Render inline content inside cell
-                        for child in td.children:
-                            if getattr(child, "name", None) == "table":
-                                render_table(child)  # nested table
-                            else:
-                                render_inline(para, child)
-
-                        # Merge cells if colspan or rowspan > 1
-                        if colspan > 1 or rowspan > 1:
-                            end_row = r_idx + rowspan - 1
-                            end_col = c_idx + colspan - 1
-                            end_cell = table.cell(end_row, end_col)
-                            start_cell.merge(end_cell)
-
-                            # Mark merged cells in the map
-                            for mr in range(r_idx, r_idx + rowspan):
-                                for mc in range(c_idx, c_idx + colspan):
-                                    merge_map[mr][mc] = True # type: ignore
-
-                        c_idx += colspan
-                return table 
-
-            # ----------------- Main loop over top-level elements -----------------
-            for elem in soup.children:
-                if isinstance(elem, NavigableString):
-                    if str(elem).strip():
-                        p = subdoc.add_paragraph(str(elem).strip())
-                elif getattr(elem, "name", None) == "p":
-                    p = subdoc.add_paragraph()
-                    indent = Inches(get_padding_left_in_inches(elem))
-                    p.paragraph_format.left_indent = indent
-                    p.paragraph_format.first_line_indent = Inches(-0.2 if str(elem).strip().startswith("●") else 0)
-                    p.paragraph_format.space_after = Pt(0)
-
-                    # Add bullet prefix if the paragraph starts with "●"
-                    text_content = "".join(str(c) for c in getattr(elem, "contents", []))
-                    if text_content.strip().startswith("●"):
-                        run = p.add_run("• ")
-                        run.font.size = Pt(10)
-                        # remove bullet character from text
-                        elem.contents[0].replace_with(str(elem.contents[0]).replace("●", "", 1)) # type: ignore
-
-                    for child in getattr(elem, "contents", []):
-                        render_inline(p, child)
-                elif getattr(elem, "name", None) in ["ul", "ol"]:
-                    process_list(elem)
-                elif getattr(elem, "name", None) == "table":
-                    render_table(elem)
-
-            return subdoc
-
-        try:
-            syllabus = self.get_object() 
-
-            # 1. Load your DOCX template
-            template_path = os.path.join(settings.BASE_DIR, "syllabi", "templates", "SyllabusTemp.docx")
-            doc = DocxTemplate(template_path)
-            
-            # ---------- Build CO–PO Table as HTML ----------  
-            copo_subdoc = build_copo_table(doc, syllabus)
-
-            # ---------- Build Course Outline Data ----------
-            outline_rows_mid = []
-            outline_rows_final = []     
-            
-            for outline in syllabus.course_outlines.all():
-                # Collect all CO codes linked to this outline
-                co_codes = ", ".join(
-                    cotco.course_outcome.co_code
-                    for cotco in outline.cotcos.select_related("course_outcome").all()
-                )
-                row = {
-                    "allotted_time": f"{outline.allotted_hour or ''} hours, {outline.allotted_time or ''}".strip(),
-                    "co_code": co_codes or "",
-                    "ilo": outline.intended_learning or "",
-                    "topics": outline.topics or "",
-                    "readings": outline.suggested_readings or "",
-                    "activities": outline.learning_activities or "",
-                    "assessment": outline.assessment_tools or "",
-                    "grading": outline.grading_criteria or "",
-                    "remarks": outline.remarks or "",
-                }
-
-                if outline.syllabus_term == "MIDTERM":
-                    outline_rows_mid.append(row)
-                elif outline.syllabus_term == "FINALS":
-                    outline_rows_final.append(row)   
-    
-            # ---------- Build Course Requirements Data ----------
-            req_html = syllabus.course_requirements or ""
-            course_requirements_subdoc = html_to_subdoc(doc, req_html)  
-            
-            # --- Bayanihan Leaders ----   
-            leaders = [
-                m for m in syllabus.bayanihan_group.bayanihan_members.all()
-                if m.role == "LEADER"
-            ]
-            leaders_context = []
-            for m in leaders:
-                sig_url = getattr(m.user, "signature", None) 
-                clean_url = get_public_url(sig_url.url) if sig_url else None
-                
-                local_sig_path = url_to_local_file(clean_url) if clean_url else None
-                    
-                # sig_path = sig_url.url if sig_url else None
-                leaders_context.append({
-                    "fname": m.user.first_name,
-                    "lname": m.user.last_name,
-                    "signature": InlineImage(doc, local_sig_path , width=Mm(20)) if local_sig_path  else "",
-                })   
-
-            # --- Chairperson ---
-            chair_name = syllabus.chair.get("name") if syllabus.chair else ""
-            chair_sig_url = syllabus.chair.get("signature") if syllabus.chair else None
-            chair_sig_path = url_to_local_file(chair_sig_url) if chair_sig_url else None
-            chair_signature = InlineImage(doc, chair_sig_path, width=Mm(20)) if chair_sig_path else ""
-
-            # --- Dean ---
-            dean_name = syllabus.dean.get("name") if syllabus.dean else ""
-            dean_sig_url = syllabus.dean.get("signature") if syllabus.dean else None
-            dean_sig_path = url_to_local_file(dean_sig_url) if dean_sig_url else None
-            dean_signature = InlineImage(doc, dean_sig_path, width=Mm(20)) if dean_sig_path else ""
-
-            # 2. Prepare context with syllabus fields
-            context = {
-                "version": (
-                    f"{int(syllabus.syllabus_template.revision_no):02d}"
-                    if syllabus.syllabus_template and syllabus.syllabus_template.revision_no is not None
-                    else ""
-                ),
-                "effective_date": syllabus.effective_date.strftime("%m.%d.%y") if syllabus.effective_date else "",
-                "college_description": syllabus.college.college_description if syllabus.college else "",
-                "department_name": syllabus.program.department.department_name if syllabus.program.department else "",
-                "peos": syllabus.peos.all(),
-                "pos": syllabus.program_outcomes.all(),
-                "course_title": syllabus.course.course_title,
-                "course_code": syllabus.course.course_code,
-                "course_semester": syllabus.course.course_semester.lower(),
-                "school_year": syllabus.bayanihan_group.school_year,  
-                "course_description": syllabus.course_description,
-                "class_schedules": syllabus.class_schedules,
-                "building_room": syllabus.building_room,
-                "course_pre_req": syllabus.course.course_pre_req,
-                "course_co_req": syllabus.course.course_co_req,
-                "consultation_hours": syllabus.consultation_hours,
-                "consultation_room": syllabus.consultation_room,
-                "consultation_contact": syllabus.consultation_contact,
-                "instructor_names": ", ".join(i.user.get_full_name() for i in syllabus.instructors.all()),
-                "instructor_emails": ", ".join(i.user.email for i in syllabus.instructors.all()), 
-                "class_contact": syllabus.class_contact,
-                "course_credit_unit": syllabus.course.course_credit_unit,
-                "course_unit_lec": syllabus.course.course_unit_lec,
-                "course_unit_lab": syllabus.course.course_unit_lab,
-                "course_semester": syllabus.course.course_semester,
-
-                # Special placeholders
-                "copo": copo_subdoc,
-                "course_outlines_mid": outline_rows_mid, 
-                "course_outlines_final": outline_rows_final, 
-                "course_requirements": course_requirements_subdoc,
-                
-                # Signatories
-                "leaders": leaders_context, 
-                "chair": chair_name,
-                "chair_signature": chair_signature,
-                "dept": syllabus.program.department.department_code if syllabus.program.department else "",
-                "dean": dean_name,
-                "dean_signature": dean_signature,
-                "college": syllabus.college.college_code if syllabus.college else "",
-            }
-
-            # 3. Render the DOCX with data
-            doc.render(context)
-            
-            timestamp = syllabus.dean_approved_at.strftime("%Y-%m-%d") if syllabus.dean_approved_at else "NA"
-            filename_docx = f"Syllabus-{syllabus.course.course_code}-{syllabus.course.course_semester.lower()} Semester-{syllabus.bayanihan_group.school_year}-{syllabus.status}-{timestamp}.docx"
-        
-            filename_pdf = filename_docx.replace(".docx", ".pdf")  
-
-            # Use a temp directory so we can run LibreOffice/win32com conversion
-            with tempfile.TemporaryDirectory() as tmpdir:
-                temp_docx = os.path.join(tmpdir, filename_docx)
-                temp_pdf = os.path.join(tmpdir, filename_pdf)
-
-                # Save generated .docx locally for conversion
-                doc.save(temp_docx)
-
-                # Convert DOCX -> PDF
-                convert_docx_to_pdf(temp_docx, temp_pdf)
-
-                # Read PDF file
-                with open(temp_pdf, "rb") as f:
-                    pdf_bytes = f.read()
-
-                # Upload to DigitalOcean Spaces
-                pdf_path = default_storage.save(
-                    f"syllabi/{filename_pdf}",  # folder inside bucket
-                    ContentFile(pdf_bytes)
-                )
-
-            # Get the public URL for the browser to download
-            pdf_url = default_storage.url(pdf_path)
- 
-            # 9️⃣ Return PDF as HTTP response
-            return JsonResponse({"pdf_url": pdf_url}) 
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf") 
+    def preview(self, request, pk=None):
+        # Printable HTML of the export, rendered in milliseconds and cached until the syllabus changes
+        syllabus = self.get_object()
+        return preview_response(request, "syllabus", syllabus)
 
-            # # 4. Convert DOCX → PDF
-            # convert_docx_to_pdf(output_docx, output_pdf)  # works on Windows
-            # # Alternative (Linux/macOS): os.system(f"libreoffice --headless --convert-to pdf {output_docx} --outdir {settings.MEDIA_ROOT}")
-            
-            # # 5. Return the PDF file as HTTP response
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf") 
-            
-        finally:
-            if is_windows and pythoncom is not None:
-                pythoncom.CoUninitialize()
 
 class SyllabusCourseOutcomeViewSet(viewsets.ModelViewSet):
     serializer_class = SyllabusCourseOutcomeSerializer
@@ -2465,75 +1242,8 @@ class SRFFormViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(srf_form)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
     def export_docx(self, request, pk=None):
-        # Windows-only COM initialization
-        is_windows = platform.system().lower() == "windows"
-
-        if is_windows and pythoncom is not None:
-            pythoncom.CoInitialize()  
-        
-        try:
-            review_form = self.get_object() 
-            
-            # 1️⃣ Load DOCX template
-            template_path = os.path.join(
-                settings.BASE_DIR, "syllabi", "templates", "ReviewFormHeaderTemp.docx"
-            )
-            doc = DocxTemplate(template_path)
-
-            # 2️⃣ Fill in context in DOCX (simple replacement for placeholders)
-            revision_no = (
-                f"{int(review_form.form_template.revision_no):02d}"
-                if review_form.form_template and review_form.form_template.revision_no is not None
-                else ""
-            )
-            effective_date = (
-                review_form.form_template.effective_date.strftime("%m.%d.%y")
-                if review_form.form_template and review_form.form_template.effective_date
-                else ""
-            )  
-            
-            # Fill in your context 
-            context = {
-                "revision_no": revision_no,
-                "effective_date": effective_date,
-            } 
-            doc.render(context) 
-            
-            # 7️⃣ Save to temp DOCX/PDF
-            timestamp = review_form.review_date.strftime("%Y-%m-%d") if review_form.review_date else "NA"
-            action_str = "APPROVED" if review_form.action == SRFForm.Action.APPROVED else "REJECTED"
-            filename_docx = f"ReviewForm-{review_form.syllabus.course.course_code}-{action_str}-{timestamp}.docx"
-            filename_pdf = filename_docx.replace(".docx", ".pdf") 
-
-            # Use a temp directory so we can run LibreOffice/win32com conversion
-            with tempfile.TemporaryDirectory() as tmpdir:
-                temp_docx = os.path.join(tmpdir, filename_docx)
-                temp_pdf = os.path.join(tmpdir, filename_pdf)
-
-                # Save generated .docx locally for conversion
-                doc.save(temp_docx)
-
-                # Convert DOCX -> PDF
-                convert_docx_to_pdf(temp_docx, temp_pdf)
-
-                # Read PDF file
-                with open(temp_pdf, "rb") as f:
-                    pdf_bytes = f.read()
-
-                # Upload to DigitalOcean Spaces
-                pdf_path = default_storage.save(
-                    f"review_forms/{filename_pdf}",  # folder inside bucket
-                    ContentFile(pdf_bytes)
-                )
-
-            # Get the public URL for the browser to download
-            pdf_url = default_storage.url(pdf_path)
- 
-            # 9️⃣ Return PDF as HTTP response
-            return JsonResponse({"pdf_url": pdf_url})
-            
-        finally:
-            if is_windows and pythoncom is not None:
-                pythoncom.CoUninitialize()
+        # The review form is delivered as PDF (kept under the original action name)
+        review_form = self.get_object()
+        return export_response(request, "review_form", review_form, "pdf")
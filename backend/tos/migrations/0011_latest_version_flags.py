@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:18
+
+from django.db import migrations, models
+
+from shared.versioning import TOS_LATEST_FLAGS, refresh_latest_flags
+
+
+def backfill_latest_flags(apps, schema_editor):
+    TOS = apps.get_model("tos", "TOS")
+    for group_id, term in TOS.objects.values_list("bayanihan_group_id", "term").order_by().distinct():
+        refresh_latest_flags(TOS, TOS_LATEST_FLAGS, bayanihan_group_id=group_id, term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tos', '0010_alter_tostemplate_revision_no'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tos',
+            name='is_latest',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tos',
+            name='is_latest_approved',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tos',
+            name='is_latest_chair',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_latest_flags, migrations.RunPython.noop),
+    ]
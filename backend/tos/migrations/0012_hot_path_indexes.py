@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:29
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_hot_path_indexes'),
+        ('bayanihan', '0004_hot_path_indexes'),
+        ('syllabi', '0037_hot_path_indexes'),
+        ('tos', '0011_latest_version_flags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tos',
+            index=models.Index(fields=['bayanihan_group', 'term', 'version'], name='tos_group_term_version_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tos',
+            index=models.Index(django.db.models.functions.text.Lower('status'), name='tos_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tos',
+            index=models.Index(fields=['created_at', 'id'], name='tos_created_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from bdb import effective
 from django.utils import timezone 
 from django.db import models
+from django.db.models.functions import Lower
 from academics.models import Course, Program
 from bayanihan.models import BayanihanGroup
 from syllabi.models import Syllabus
@@ -100,9 +101,24 @@ class TOS(models.Model):
     status = models.CharField(max_length=30, blank=True, null=True)
     version = models.PositiveIntegerField(default=1)
 
+    # Latest version of the group and term overall / submitted to chair / approved,
+    # maintained by shared.signals
+    is_latest = models.BooleanField(default=False, editable=False, db_index=True)
+    is_latest_chair = models.BooleanField(default=False, editable=False, db_index=True)
+    is_latest_approved = models.BooleanField(default=False, editable=False, db_index=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["bayanihan_group", "term", "version"], name="tos_group_term_version_idx"),
+            # status filters compare LOWER(status), see TOSViewSet
+            models.Index(Lower("status"), name="tos_status_idx"),
+            # keyset pagination order
+            models.Index(fields=["created_at", "id"], name="tos_created_idx"),
+        ]
+
     def __str__(self):
         return f"TOS v{self.version} - {self.course.course_code} ({self.term}, {self.bayanihan_group.school_year})"
 
@@ -612,25 +612,12 @@ class TOSDetailSerializer(serializers.ModelSerializer):
     program = ProgramReadSerializer(read_only=True)
     
     tos_rows = TOSRowReadSerializers(read_only=True, many=True)
-    
-    is_latest = serializers.SerializerMethodField()
 
     class Meta:
         model = TOS
         fields = "__all__" 
 
-    def get_is_latest(self, obj):
-        latest_version = (
-            TOS.objects.filter(
-                bayanihan_group_id=obj.bayanihan_group_id, 
-                term=obj.term
-            ).order_by("-version")
-            .values_list("version", flat=True)
-            .first()
-        )
-        return obj.version == latest_version
-        
-        
+
 class TOSRowSerializer(serializers.ModelSerializer):
     class Meta:
         model = TOSRow
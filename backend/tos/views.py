@@ -2,12 +2,9 @@ from rest_framework import viewsets, status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.response import Response  
-from django.http import FileResponse, JsonResponse
-from django.conf import settings
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import F, OuterRef, Subquery, Q
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
@@ -16,8 +13,8 @@ from shared.models import TOSReport
 
 from .models import TOS, TOSComment, TOSRow, TOSTemplate
 from auditlog.models import LogEntry
-from bayanihan.models import BayanihanGroupUser 
-from users.models import UserRole 
+from users.access import get_access
+from search.indexing import matching_ids
 
 from .serializers import (
   TOSCommentSerializer,
@@ -33,30 +30,9 @@ from .pagination import TOSPagination
 
 from users.permissions import RolePermission
 
-import os
-from docxtpl import DocxTemplate, RichText, InlineImage, Subdoc 
-from docx.shared import Pt, Mm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from bs4 import BeautifulSoup 
-from urllib.parse import urlsplit, urlunsplit
-import sys
-import io
-import requests
-import tempfile
-
-if sys.platform == "win32":
-    import pythoncom
-    from docx2pdf import convert
-else:
-    pythoncom = None
-    convert = None
-
-import platform
-import subprocess
-    
-from urllib.parse import urlparse
+from exports.jobs import schedule_prerender
+from exports.throttles import ExportRateThrottle
+from exports.views import export_response, preview_response
 
 # Create your views here.
 class TOSTemplateViewSet(viewsets.ModelViewSet):
@@ -84,49 +60,6 @@ class TOSTemplateViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-def convert_docx_to_pdf(input_path, output_path):
-    """
-    Cross-platform DOCX → PDF converter.
-    - Windows  → docx2pdf (Microsoft Word COM)
-    - Linux/Mac → LibreOffice (headless)
-    """
-
-    system = platform.system().lower()
-
-    # --- WINDOWS: Use docx2pdf ---
-    if system == "windows":
-        try:
-            convert(input_path, output_path)
-        except Exception as e:
-            raise RuntimeError(f"docx2pdf conversion failed: {e}")
-        return output_path
-
-    # --- Linux / macOS: Use LibreOffice ---
-    try:
-        result = subprocess.run(
-            [
-                "libreoffice",
-                "--headless",
-                "--convert-to", "pdf",
-                input_path,
-                "--outdir", os.path.dirname(output_path),
-            ],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(
-                f"LibreOffice failed with code {result.returncode}: {result.stderr}"
-            )
-
-        return output_path
-
-    except FileNotFoundError:
-        raise RuntimeError(
-            "LibreOffice is not installed. Install via: sudo apt install libreoffice"
-        )
-    
 class TOSViewSet(viewsets.ModelViewSet):
     permission_classes = [RolePermission("ADMIN", "BAYANIHAN_LEADER", "BAYANIHAN_TEACHER", "CHAIRPERSON", "AUDITOR")] 
     pagination_class = TOSPagination
@@ -144,115 +77,52 @@ class TOSViewSet(viewsets.ModelViewSet):
         if self.action in ["list"]:
             # --- ADMIN ---
             if role == "ADMIN":
-                if not UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+                if not user.has_role("ADMIN"):
                     raise PermissionDenied("You are not an admin.")
 
-                latest_sub = (
-                    TOS.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        term=OuterRef("term"),
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
-                    version=F("latest_version")
-                )
+                qs = qs.filter(is_latest=True)
 
             # --- BAYANIHAN LEADER ---
             elif role == "BAYANIHAN_LEADER":
-                leader_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="LEADER"
-                ).values_list("group_id", flat=True)
+                leader_groups = get_access(user).group_ids("LEADER")
 
                 if not leader_groups:
                     raise PermissionDenied("You are not a leader in any Bayanihan group.")
 
-                latest_sub = (
-                    TOS.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        term=OuterRef("term"),
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
+                qs = qs.filter(
                     bayanihan_group_id__in=leader_groups,
-                    version=F("latest_version")
+                    is_latest=True,
                 )
 
             # --- BAYANIHAN TEACHER ---
             elif role == "BAYANIHAN_TEACHER":
-                teacher_groups = BayanihanGroupUser.objects.filter(
-                    user=user, role="TEACHER"
-                ).values_list("group_id", flat=True)
+                teacher_groups = get_access(user).group_ids("TEACHER")
 
                 if not teacher_groups:
                     raise PermissionDenied("You are not a teacher in any Bayanihan group.")
 
-                latest_sub = (
-                    TOS.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        term=OuterRef("term"),
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
+                qs = qs.filter(
                     bayanihan_group_id__in=teacher_groups,
-                    version=F("latest_version")
+                    is_latest=True,
                 )
 
             # --- CHAIRPERSON ---
             elif role == "CHAIRPERSON":
-                try:
-                    chair_role = UserRole.objects.get(
-                        user=user,
-                        entity_type="Department",
-                        role__name="CHAIRPERSON",
-                        entity_id__isnull=False,
-                    )
-                except UserRole.DoesNotExist:
+                chair_department_id = get_access(user).entity_id("CHAIRPERSON", "Department")
+                if chair_department_id is None:
                     raise PermissionDenied("You are not a Chairperson.")
-                except UserRole.MultipleObjectsReturned:
-                    raise PermissionDenied("Multiple Chairperson roles found. Contact admin.")
-
-                latest_sub = (
-                    TOS.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        chair_submitted_at__isnull=False,
-                        term=OuterRef("term"),
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
 
-                qs = qs.annotate(latest_chair_version=Subquery(latest_sub)).filter(
-                    program__department_id=chair_role.entity_id,
-                    version=F("latest_chair_version")
+                qs = qs.filter(
+                    program__department_id=chair_department_id,
+                    is_latest_chair=True,
                 )
 
             # --- AUDITOR ---
             elif role == "AUDITOR":
-                if not UserRole.objects.filter(user=user, role__name="AUDITOR").exists():
+                if not user.has_role("AUDITOR"):
                     raise PermissionDenied("You are not an Auditor.")
 
-                latest_sub = (
-                    TOS.objects.filter(
-                        bayanihan_group_id=OuterRef("bayanihan_group_id"),
-                        chair_approved_at__isnull=False,
-                        term=OuterRef("term"),
-                    )
-                    .order_by("-version")
-                    .values("version")[:1]
-                )
-
-                qs = qs.annotate(latest_version=Subquery(latest_sub)).filter(
-                    version=F("latest_version")
-                )
+                qs = qs.filter(is_latest_approved=True)
 
             else:
                 raise PermissionDenied("Invalid role parameter.")
@@ -266,20 +136,17 @@ class TOSViewSet(viewsets.ModelViewSet):
         search = self.request.GET.get("search")
 
         if year_level:
-            qs = qs.filter(course__course_year_level__iexact=year_level)
+            qs = qs.filter(course__course_year_level=year_level.upper())
         if program:
             qs = qs.filter(program_id=program)
         if semester:
-            qs = qs.filter(course__course_semester__iexact=semester)
+            qs = qs.filter(course__course_semester=semester.upper())
         if school_year:
-            qs = qs.filter(bayanihan_group__school_year__iexact=school_year)
+            qs = qs.filter(bayanihan_group__school_year=school_year.strip())
         if status:
-            qs = qs.filter(status__iexact=status)
+            qs = qs.alias(status_lower=Lower("status")).filter(status_lower=status.lower())
         if search:
-            qs = qs.filter(
-                Q(course__course_code__icontains=search)
-                | Q(course__course_title__icontains=search)
-            )
+            qs = qs.filter(course_id__in=matching_ids("course", search))
 
         # === Optional: return all if ?all=true (for dropdowns) ===
         if self.request.GET.get("all") == "true":
@@ -327,13 +194,11 @@ class TOSViewSet(viewsets.ModelViewSet):
         role = role.upper()  
         allowed = False 
         # ADMIN can always submit
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True 
         # BAYANIHAN_LEADER can submit only for their groups
-        elif role == "BAYANIHAN_LEADER" and UserRole.objects.filter(user=user, role__name="BAYANIHAN_LEADER").exists():
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+        elif role == "BAYANIHAN_LEADER" and user.has_role("BAYANIHAN_LEADER"):
+            leader_group_ids = get_access(user).group_ids("LEADER")
             if tos.bayanihan_group.id in leader_group_ids:
                 allowed = True 
         if not allowed:
@@ -381,14 +246,10 @@ class TOSViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Role parameter is required.")
         role = role.upper() 
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         elif role == "CHAIRPERSON":
-            chair_dept_ids = UserRole.objects.filter(
-                user=user,
-                entity_type="Department",
-                role__name="CHAIRPERSON",
-            ).values_list("entity_id", flat=True)
+            chair_dept_ids = get_access(user).entity_ids("CHAIRPERSON", "Department")
             if tos.program.department_id in chair_dept_ids:
                 allowed = True
         if not allowed:
@@ -405,6 +266,9 @@ class TOSViewSet(viewsets.ModelViewSet):
             tos.status = "Approved by Chair"
             tos.chair_approved_at = timezone.now()
             tos.save()
+
+            # Render the final DOCX/PDF in the background so downloads hit the cache
+            schedule_prerender("tos", tos.pk)
         else:  
             tos.status = "Returned by Chair"
             tos.chair_returned_at = timezone.now()
@@ -471,12 +335,10 @@ class TOSViewSet(viewsets.ModelViewSet):
         # ✅ Only Bayanihan Leader of that group (or Admin) can replicate
         role = request.query_params.get("role", "").upper()
         allowed = False
-        if role == "ADMIN" and UserRole.objects.filter(user=user, role__name="ADMIN").exists():
+        if role == "ADMIN" and user.has_role("ADMIN"):
             allowed = True
         elif role == "BAYANIHAN_LEADER":
-            leader_group_ids = BayanihanGroupUser.objects.filter(
-                user=user, role="LEADER"
-            ).values_list("group_id", flat=True)
+            leader_group_ids = get_access(user).group_ids("LEADER")
             if tos.bayanihan_group_id in leader_group_ids:
                 allowed = True
 
@@ -575,418 +437,21 @@ class TOSViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
     def export_docx(self, request, pk=None):
-        # Windows-only COM initialization
-        is_windows = platform.system().lower() == "windows"
-
-        if is_windows and pythoncom is not None:
-            pythoncom.CoInitialize() 
-           
-        def url_to_local_file(url):
-            """Convert absolute URL to local MEDIA_ROOT path."""
-            if not url:
-                return None
-
-            response = requests.get(url)
-            if response.status_code != 200:
-                return None
-
-            # Create a temporary file
-            suffix = os.path.splitext(url)[1] or ".png"
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            tmp_file.write(response.content)
-            tmp_file.flush()
-            tmp_file.close()
-            return tmp_file.name
-
-        def get_public_url(url: str):
-            parts = urlsplit(url)
-            # Remove querystring (signed params)
-            clean = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
-            return clean
-         
-        try:
-            tos = self.get_object()  
-            template_path = os.path.join(settings.BASE_DIR, "tos", "templates", "TOSTemplate.docx")
-            doc = DocxTemplate(template_path) 
-
-            # ---------- Get Course Outcomes of Syllabus Associated with TOS ----------
-            course_outcomes = []
-            if tos.syllabus:
-                for co in tos.syllabus.course_outcomes.all():
-                    course_outcomes.append({
-                        "co_code": co.co_code,
-                        "co_description": co.co_description,
-                    }) 
-            
-             # ---------- Build Course Outline ---------- 
-            tos_rows = []
-            
-            # Initialize totals
-            totals = {
-                "total_hours": 0,
-                "total_percent": 0,
-                "total_items": 0,
-                "total_col1": 0,
-                "total_col2": 0,
-                "total_col3": 0,
-                "total_col4": 0,
-            }
-            
-            for row in tos.tos_rows.all():
-                # Convert to float/int safely
-                no_hours = int(row.no_hours or 0)
-                percent = int(row.percent or 0)
-                no_items = int(row.no_items or 0)
-                col1_value = int(row.col1_value or 0)
-                col2_value = int(row.col2_value or 0)
-                col3_value = int(row.col3_value or 0)
-                col4_value = int(row.col4_value or 0)
-
-                # Append row
-                tos_rows.append({
-                    "topic": row.topic or "",
-                    "no_hours": no_hours,
-                    "percent": percent,
-                    "no_items": no_items,
-                    "col1_value": col1_value,
-                    "col2_value": col2_value,
-                    "col3_value": col3_value,
-                    "col4_value": col4_value,
-                })
-
-                # Add to totals
-                totals["total_hours"] += no_hours
-                totals["total_percent"] += percent
-                totals["total_items"] += no_items
-                totals["total_col1"] += col1_value
-                totals["total_col2"] += col2_value
-                totals["total_col3"] += col3_value
-                totals["total_col4"] += col4_value
-            
-            def safe_percentage(value):
-                try:
-                    return int(value)
-                except (TypeError, ValueError):
-                    return 0    
-            
-            # --- Leaders ---
-            leaders = [
-                m for m in tos.bayanihan_group.bayanihan_members.all()
-                if m.role == "LEADER"
-            ]
-            leaders_context = []
-            for m in leaders:
-                sig_url = getattr(m.user, "signature", None)
-                clean_url = get_public_url(sig_url.url) if sig_url else None
-                
-                local_sig_path = url_to_local_file(clean_url) if clean_url else None 
-                leaders_context.append({
-                    "fname": m.user.first_name,
-                    "lname": m.user.last_name,
-                    "signature": InlineImage(doc, local_sig_path, width=Mm(20)) if local_sig_path else "",
-                })   
-
-            # --- Chairperson ---
-            chair_name = tos.chair.get("name") if tos.chair else ""
-            chair_sig_url = tos.chair.get("signature") if tos.chair else None
-            chair_sig_path = url_to_local_file(chair_sig_url) if chair_sig_url else None
-            chair_signature = InlineImage(doc, chair_sig_path, width=Mm(20)) if chair_sig_path else ""
-            
-            def checkbox(term_name, current_term):
-                return "✓" if current_term and current_term.lower() == term_name.lower() else ""
-
-            # 2. Prepare context with TOS fields
-            context = {
-                "version": (
-                    f"{int(tos.tos_template.revision_no):02d}"
-                    if tos.tos_template and tos.tos_template.revision_no is not None
-                    else ""
-                ),
-                "effective_date": tos.effective_date.strftime("%m.%d.%y") if tos.effective_date else "",
-                "course_code": getattr(tos.course, "course_code", ""),
-                "course_title": getattr(tos.course, "course_title", ""),
-                "school_year": getattr(tos.bayanihan_group, "school_year", ""),
-                "course_semester": getattr(tos.course, "course_semester", "").lower(),
-                "tos_cpys": tos.tos_cpys or "",
-                "chair_submitted_at": tos.chair_submitted_at.strftime("%B %d, %Y") if tos.chair_submitted_at else "",
-                "course_outcomes": course_outcomes,
-                "col1_percentage": safe_percentage(tos.col1_percentage),
-                "col2_percentage": safe_percentage(tos.col2_percentage),
-                "col3_percentage": safe_percentage(tos.col3_percentage),
-                "col4_percentage": safe_percentage(tos.col4_percentage),
-                "tos_rows": tos_rows,
-                "totals": totals, 
-                
-                "prelim_box": checkbox("Prelim", tos.term),
-                "midterm_box": checkbox("Midterm", tos.term),
-                "semifinal_box": checkbox("Semi-Finals", tos.term),
-                "final_box": checkbox("Finals", tos.term),
-                
-                # Signatories 
-                "leaders": leaders_context,
-                "chair": chair_name,
-                "chair_signature": chair_signature,
-            }
-
-            # 3. Render the DOCX with data
-            doc.render(context)
-
-            # ---------- Save DOCX directly to Spaces ----------
-            timestamp = tos.chair_approved_at.strftime("%Y-%m-%d") if tos.chair_approved_at else "NA"
-            filename_docx = (
-                f"TOS-{tos.term}-{tos.course.course_code}-"
-                f"{tos.course.course_semester.lower()} Semester-"
-                f"{tos.bayanihan_group.school_year}-{tos.status}-{timestamp}.docx"
-            )
-
-            file_bytes = io.BytesIO()
-            doc.save(file_bytes)
-            file_bytes.seek(0)
-
-            docx_path = default_storage.save(
-                f"tos/{filename_docx}",
-                ContentFile(file_bytes.read())
-            )
-
-            docx_url = default_storage.url(docx_path)
-
-            return JsonResponse({"docx_url": docx_url})
-            
-            # filename_pdf = filename_docx.replace(".docx", ".pdf")  
-
-            # # Use a temp directory so we can run LibreOffice/win32com conversion
-            # with tempfile.TemporaryDirectory() as tmpdir:
-            #     temp_docx = os.path.join(tmpdir, filename_docx)
-            #     temp_pdf = os.path.join(tmpdir, filename_pdf)
-
-            #     # Save generated .docx locally for conversion
-            #     doc.save(temp_docx)
-
-            #     # Convert DOCX -> PDF
-            #     convert_docx_to_pdf(temp_docx, temp_pdf)
-
-            #     # Read PDF file
-            #     with open(temp_pdf, "rb") as f:
-            #         pdf_bytes = f.read()
-
-            #     # Upload to DigitalOcean Spaces
-            #     pdf_path = default_storage.save(
-            #         f"tos/{filename_pdf}",  # folder inside bucket
-            #         ContentFile(pdf_bytes)
-            #     )
-
-            # # Get the public URL for the browser to download
-            # pdf_url = default_storage.url(pdf_path)
- 
-            # # 9️⃣ Return PDF as HTTP response
-            # return JsonResponse({"pdf_url": pdf_url})
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf")  
-            
-        finally:
-            if is_windows and pythoncom is not None:
-                pythoncom.CoUninitialize() 
+        tos = self.get_object()
+        return export_response(request, "tos", tos, "docx")
 
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], throttle_classes=[ExportRateThrottle])
     def export_pdf(self, request, pk=None):
-        # Windows-only COM initialization
-        is_windows = platform.system().lower() == "windows"
-
-        if is_windows and pythoncom is not None:
-            pythoncom.CoInitialize() 
-           
-        def url_to_local_file(url):
-            """Convert absolute URL to local MEDIA_ROOT path."""
-            if not url:
-                return None
-
-            response = requests.get(url)
-            if response.status_code != 200:
-                return None
-
-            # Create a temporary file
-            suffix = os.path.splitext(url)[1] or ".png"
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            tmp_file.write(response.content)
-            tmp_file.flush()
-            tmp_file.close()
-            return tmp_file.name
-
-        def get_public_url(url: str):
-            parts = urlsplit(url)
-            # Remove querystring (signed params)
-            clean = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
-            return clean
-         
-        try:
-            tos = self.get_object()  
-            template_path = os.path.join(settings.BASE_DIR, "tos", "templates", "TOSTemplate.docx")
-            doc = DocxTemplate(template_path) 
-
-            # ---------- Get Course Outcomes of Syllabus Associated with TOS ----------
-            course_outcomes = []
-            if tos.syllabus:
-                for co in tos.syllabus.course_outcomes.all():
-                    course_outcomes.append({
-                        "co_code": co.co_code,
-                        "co_description": co.co_description,
-                    }) 
-            
-             # ---------- Build Course Outline ---------- 
-            tos_rows = []
-            
-            # Initialize totals
-            totals = {
-                "total_hours": 0,
-                "total_percent": 0,
-                "total_items": 0,
-                "total_col1": 0,
-                "total_col2": 0,
-                "total_col3": 0,
-                "total_col4": 0,
-            }
-            
-            for row in tos.tos_rows.all():
-                # Convert to float/int safely
-                no_hours = int(row.no_hours or 0)
-                percent = int(row.percent or 0)
-                no_items = int(row.no_items or 0)
-                col1_value = int(row.col1_value or 0)
-                col2_value = int(row.col2_value or 0)
-                col3_value = int(row.col3_value or 0)
-                col4_value = int(row.col4_value or 0)
-
-                # Append row
-                tos_rows.append({
-                    "topic": row.topic or "",
-                    "no_hours": no_hours,
-                    "percent": percent,
-                    "no_items": no_items,
-                    "col1_value": col1_value,
-                    "col2_value": col2_value,
-                    "col3_value": col3_value,
-                    "col4_value": col4_value,
-                })
-
-                # Add to totals
-                totals["total_hours"] += no_hours
-                totals["total_percent"] += percent
-                totals["total_items"] += no_items
-                totals["total_col1"] += col1_value
-                totals["total_col2"] += col2_value
-                totals["total_col3"] += col3_value
-                totals["total_col4"] += col4_value
-            
-            def safe_percentage(value):
-                try:
-                    return int(value)
-                except (TypeError, ValueError):
-                    return 0    
-            
-            # --- Leaders ---
-            leaders = [
-                m for m in tos.bayanihan_group.bayanihan_members.all()
-                if m.role == "LEADER"
-            ]
-            leaders_context = []
-            for m in leaders:
-                sig_url = getattr(m.user, "signature", None)
-                clean_url = get_public_url(sig_url.url) if sig_url else None
-                
-                local_sig_path = url_to_local_file(clean_url) if clean_url else None 
-                leaders_context.append({
-                    "fname": m.user.first_name,
-                    "lname": m.user.last_name,
-                    "signature": InlineImage(doc, local_sig_path, width=Mm(20)) if local_sig_path else "",
-                })   
-
-            # --- Chairperson ---
-            chair_name = tos.chair.get("name") if tos.chair else ""
-            chair_sig_url = tos.chair.get("signature") if tos.chair else None
-            chair_sig_path = url_to_local_file(chair_sig_url) if chair_sig_url else None
-            chair_signature = InlineImage(doc, chair_sig_path, width=Mm(20)) if chair_sig_path else ""
-            
-            def checkbox(term_name, current_term):
-                return "✓" if current_term and current_term.lower() == term_name.lower() else ""
-
-            # 2. Prepare context with TOS fields
-            context = {
-                "version": (
-                    f"{int(tos.tos_template.revision_no):02d}"
-                    if tos.tos_template and tos.tos_template.revision_no is not None
-                    else ""
-                ),
-                "effective_date": tos.effective_date.strftime("%m.%d.%y") if tos.effective_date else "",
-                "course_code": getattr(tos.course, "course_code", ""),
-                "course_title": getattr(tos.course, "course_title", ""),
-                "school_year": getattr(tos.bayanihan_group, "school_year", ""),
-                "course_semester": getattr(tos.course, "course_semester", "").lower(),
-                "tos_cpys": tos.tos_cpys or "",
-                "chair_submitted_at": tos.chair_submitted_at.strftime("%B %d, %Y") if tos.chair_submitted_at else "",
-                "course_outcomes": course_outcomes,
-                "col1_percentage": safe_percentage(tos.col1_percentage),
-                "col2_percentage": safe_percentage(tos.col2_percentage),
-                "col3_percentage": safe_percentage(tos.col3_percentage),
-                "col4_percentage": safe_percentage(tos.col4_percentage),
-                "tos_rows": tos_rows,
-                "totals": totals, 
-                
-                "prelim_box": checkbox("Prelim", tos.term),
-                "midterm_box": checkbox("Midterm", tos.term),
-                "semifinal_box": checkbox("Semi-Finals", tos.term),
-                "final_box": checkbox("Finals", tos.term),
-                
-                # Signatories 
-                "leaders": leaders_context,
-                "chair": chair_name,
-                "chair_signature": chair_signature,
-            }
-
-            # 3. Render the DOCX with data
-            doc.render(context)
-
-            # ---------- Save DOCX directly to Spaces ----------
-            timestamp = tos.chair_approved_at.strftime("%Y-%m-%d") if tos.chair_approved_at else "NA"
-            filename_docx = (
-                f"TOS-{tos.term}-{tos.course.course_code}-"
-                f"{tos.course.course_semester.lower()} Semester-"
-                f"{tos.bayanihan_group.school_year}-{tos.status}-{timestamp}.docx"
-            ) 
-            
-            filename_pdf = filename_docx.replace(".docx", ".pdf")  
-
-            # Use a temp directory so we can run LibreOffice/win32com conversion
-            with tempfile.TemporaryDirectory() as tmpdir:
-                temp_docx = os.path.join(tmpdir, filename_docx)
-                temp_pdf = os.path.join(tmpdir, filename_pdf)
-
-                # Save generated .docx locally for conversion
-                doc.save(temp_docx)
-
-                # Convert DOCX -> PDF
-                convert_docx_to_pdf(temp_docx, temp_pdf)
-
-                # Read PDF file
-                with open(temp_pdf, "rb") as f:
-                    pdf_bytes = f.read()
-
-                # Upload to DigitalOcean Spaces
-                pdf_path = default_storage.save(
-                    f"tos/{filename_pdf}",  # folder inside bucket
-                    ContentFile(pdf_bytes)
-                )
+        tos = self.get_object()
+        return export_response(request, "tos", tos, "pdf")
 
-            # Get the public URL for the browser to download
-            pdf_url = default_storage.url(pdf_path)
- 
-            # 9️⃣ Return PDF as HTTP response
-            return JsonResponse({"pdf_url": pdf_url})
-            # return FileResponse(open(output_pdf, "rb"), content_type="application/pdf")  
-            
-        finally:
-            if is_windows and pythoncom is not None:
-                pythoncom.CoUninitialize() 
+    @action(detail=True, methods=["get"])
+    def preview(self, request, pk=None):
+        # Printable HTML of the export, rendered in milliseconds and cached until the tos changes
+        tos = self.get_object()
+        return preview_response(request, "tos", tos)
 
 
 class TOSCommentViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,74 @@
+"""
+What a user may see: their roles with the entity each is scoped to
+(a chairperson's department, a dean's college) and their Bayanihan group
+memberships.
+
+``get_access(user)`` loads all of it in two queries and keeps it on the
+user object, so it is resolved once per request and never outlives it: a
+revoked role stops working on the next request, in every worker. Code
+that changes a user's roles or groups and keeps using the same user object
+(``bulk_create`` skips the signals) calls ``invalidate_access`` on it.
+"""
+
+
+class UserAccess:
+    def __init__(self, roles, groups):
+        # {role name: [(entity_type, entity_id), ...]}
+        self.roles = roles
+        # {"LEADER" | "TEACHER": [group id, ...]}
+        self.groups = groups
+
+    def has_role(self, *role_names):
+        return any(name in self.roles for name in role_names)
+
+    def entity_id(self, role_name, entity_type):
+        """Id of the ``entity_type`` the user holds ``role_name`` for, or None."""
+        ids = self.entity_ids(role_name, entity_type)
+        return ids[0] if ids else None
+
+    def entity_ids(self, role_name, entity_type):
+        """Ids of every ``entity_type`` the user holds ``role_name`` for."""
+        return [
+            scoped_id for scoped_type, scoped_id in self.roles.get(role_name, ())
+            if scoped_type == entity_type and scoped_id is not None
+        ]
+
+    def group_ids(self, group_role):
+        """Ids of the Bayanihan groups the user is a ``LEADER``/``TEACHER`` of."""
+        return self.groups.get(group_role, [])
+
+    def in_group(self, group_id, group_role):
+        """Whether the user is a ``group_role`` of the group (``group_id`` may come from the URL)."""
+        return str(group_id) in {str(member_of) for member_of in self.group_ids(group_role)}
+
+
+def load_access(user_id):
+    from bayanihan.models import BayanihanGroupUser
+    from .models import UserRole
+
+    roles = {}
+    for name, entity_type, entity_id in UserRole.objects.filter(user_id=user_id).values_list(
+        "role__name", "entity_type", "entity_id"
+    ):
+        roles.setdefault(name, []).append((entity_type, entity_id))
+
+    groups = {}
+    for group_role, group_id in BayanihanGroupUser.objects.filter(user_id=user_id).values_list(
+        "role", "group_id"
+    ):
+        groups.setdefault(group_role, []).append(group_id)
+
+    return UserAccess(roles, groups)
+
+
+def get_access(user):
+    access = getattr(user, "_access", None)
+    if access is None:
+        access = user._access = load_access(user.pk)
+    return access
+
+
+def invalidate_access(*users):
+    """Forget the access loaded on each of ``users``; the next ``get_access`` reloads it."""
+    for user in users:
+        user.__dict__.pop("_access", None)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_remove_user_signature_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userrole',
+            index=models.Index(fields=['role', 'entity_type', 'entity_id'], name='userrole_role_entity_idx'),
+        ),
+    ]
@@ -24,7 +24,8 @@ class User(AbstractUser):
         return f"{self.faculty_id or self.username} ({self.email})"
     
     def has_role(self, role_name):
-        return self.user_roles.filter(role__name=role_name).exists()
+        from .access import get_access
+        return get_access(self).has_role(role_name)
     
     def get_full_name(self) -> str:
         """
@@ -79,6 +80,10 @@ class UserRole(models.Model):
 
     class Meta:
         unique_together = ("user", "role")  # prevents duplicate roles
+        indexes = [
+            # holders of a role for a college/department
+            models.Index(fields=["role", "entity_type", "entity_id"], name="userrole_role_entity_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.first_name} → {self.role.name}"
\ No newline at end of file
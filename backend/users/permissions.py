@@ -1,12 +1,14 @@
 from rest_framework import permissions
 
+from .access import get_access
+
 # ✅ Flexible role-based permission
 def RolePermission(*roles):
     class RolePermissionClass(permissions.BasePermission):
         def has_permission(self, request, view):
             return (
                 request.user.is_authenticated and 
-                request.user.user_roles.filter(role__name__in=roles).exists()
+                get_access(request.user).has_role(*roles)
             )
     return RolePermissionClass
      
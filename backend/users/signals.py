@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .access import invalidate_access
+from .models import UserRole
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def user_role_changed(sender, instance, **kwargs):
+    # Only a user already loaded on the row can hold its access
+    if UserRole.user.is_cached(instance):
+        invalidate_access(instance.user)
@@ -1,3 +1,41 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .access import get_access, invalidate_access
+from .models import Role, User, UserRole
+
+
+class UserAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dean = Role.objects.create(name="DEAN")
+        cls.user = User.objects.create_user(username="dean", email="dean@example.com", password="x")
+        UserRole.objects.create(user=cls.user, role=cls.dean, entity_type="College", entity_id=7)
+
+    def test_access_is_loaded_once_per_user_object(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(get_access(user).entity_id("DEAN", "College"), 7)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_role("DEAN"))
+
+    def test_revoked_role_is_gone_on_the_next_request(self):
+        self.assertTrue(get_access(User.objects.get(pk=self.user.pk)).has_role("DEAN"))
+        UserRole.objects.filter(user=self.user).delete()
+
+        # Each request authenticates a fresh user object
+        self.assertFalse(get_access(User.objects.get(pk=self.user.pk)).has_role("DEAN"))
+
+    def test_invalidate_access_clears_the_instance(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(get_access(user).has_role("DEAN"))
+        UserRole.objects.filter(user=user).update(entity_id=8)
+
+        invalidate_access(user)
+        self.assertEqual(get_access(user).entity_id("DEAN", "College"), 8)
+
+    def test_role_change_clears_the_user_it_was_made_on(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertFalse(get_access(user).has_role("CHAIRPERSON"))
+
+        UserRole.objects.create(user=user, role=Role.objects.create(name="CHAIRPERSON"))
+        self.assertTrue(get_access(user).has_role("CHAIRPERSON"))
@@ -9,6 +9,7 @@ from .pagination import UserPagination
 from .models import User, Role, UserRole
 from .serializers import UserSerializer, RoleSerializer, ProfileSerializer, RegisterSerializer, FacultyIDTokenObtainPairSerializer, AssignRoleGenericSerializer, AssignedRoleSerializer
 from users.permissions import RolePermission
+from search.indexing import matching_ids
 from rest_framework.decorators import action
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -17,7 +18,6 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.hashers import make_password
 from django.core.mail import EmailMessage
-from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from django.conf import settings
 
@@ -39,18 +39,10 @@ class UserViewSet(viewsets.ModelViewSet):
         sort_order = request.GET.get("order", "asc")  # new, default ascending
         
         if search:
-            qs = qs.filter(
-                Q(faculty_id__icontains=search)
-                | Q(email__icontains=search)
-                | Q(first_name__icontains=search)
-                | Q(last_name__icontains=search)
-                | Q(prefix__icontains=search)
-                | Q(suffix__icontains=search)
-                | Q(phone__icontains=search)
-            )
+            qs = qs.filter(pk__in=matching_ids("user", search))
 
         if role:
-          qs = qs.filter(user_roles__role__name__iexact=role).distinct()
+          qs = qs.filter(user_roles__role__name=role.upper()).distinct()
             
         if active == "true":
             qs = qs.filter(is_active=True)